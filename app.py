@@ -15,12 +15,17 @@ except ImportError:
 
 from utils.api import get_open_positions, track_0x8dxd, get_profile_name, get_trader_pnl, get_closed_trades_pnl
 from utils.config import EST, TRADER
+from utils.http_client import connection_stats
+from utils.catalog import ensure_catalog_sync
 
 # ✅ Explicit page imports — avoids shadowing utils.websocket
 from pages.trades import show_trades
 from pages.positions import show_positions
 from pages.simulator import show_simulator
 from pages.websocket import show_websocket_status
+from pages.diagnostics import show_diagnostics
+
+ensure_catalog_sync()
 
 if 'refresh_count' not in st.session_state:
     st.session_state.refresh_count = 0
@@ -63,6 +68,7 @@ with col5:
 # Sidebar
 st.sidebar.title("⚙️ Settings")
 show_websocket_status()
+show_diagnostics()
 st.sidebar.markdown("---")
 
 if 'include_5m' not in st.session_state:
@@ -91,6 +97,14 @@ st.sidebar.caption(
 if st.sidebar.button("🔄 Force Refresh", type="primary"):
     st.rerun()
 
+# ✅ Keep-alive check — reused should climb every rerun while connections stay flat
+http_stats = connection_stats()
+if http_stats:
+    st.sidebar.caption(" | ".join(
+        f"🔗 {host.split('.')[0]}: {s['connections']} conn / {s['reused']} reused"
+        for host, s in http_stats.items()
+    ))
+
 st.sidebar.markdown("---")
 
 # Main content
@@ -0,0 +1,80 @@
+"""
+Micro-benchmark: crypto title classification at 100k titles.
+
+    python benchmarks/bench_crypto_classifier.py [--n 100000]
+
+Compares the old `any(t in title for t in TICKERS + FULL_NAMES)` scan with the
+compiled, memoized `is_crypto_title`, cold (unique titles) and warm (repeats).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('DISABLE_WS_LIVE', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config import TICKERS, FULL_NAMES  # noqa: E402
+from utils.filters import is_crypto_title  # noqa: E402
+
+_TEMPLATES = [
+    "Bitcoin Up or Down - March {d}, {h}:{m:02d}PM-{h}:{m5:02d}PM ET",
+    "Will ETH close above ${p} on March {d}?",
+    "Solana Up or Down - March {d}, {h}PM ET",
+    "Will the Fed cut rates in meeting #{p}?",
+    "Which method wins the {p} award?",
+    "Will Trump say 'solution' {p} times?",
+]
+
+
+def make_titles(n: int, distinct: int) -> list:
+    rnd = random.Random(42)
+    pool = [
+        rnd.choice(_TEMPLATES).format(
+            d=rnd.randint(1, 28), h=rnd.randint(1, 12), m=rnd.randrange(0, 55, 5),
+            m5=rnd.randrange(5, 60, 5), p=i,
+        )
+        for i in range(distinct)
+    ]
+    return [pool[rnd.randrange(distinct)] for _ in range(n)]
+
+
+def legacy_is_crypto(title: str) -> bool:
+    t = title.lower()
+    return any(ticker in t for ticker in TICKERS + FULL_NAMES)
+
+
+def _time(fn, titles) -> float:
+    start = time.perf_counter()
+    for title in titles:
+        fn(title)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=100_000)
+    parser.add_argument('--distinct', type=int, default=2_000)
+    args = parser.parse_args()
+
+    titles = make_titles(args.n, args.distinct)
+    unique = list(dict.fromkeys(titles))
+
+    legacy = _time(legacy_is_crypto, titles)
+    is_crypto_title.cache_clear()
+    cold = _time(is_crypto_title.__wrapped__, titles)
+    is_crypto_title.cache_clear()
+    warm = _time(is_crypto_title, titles)
+    cache_info = is_crypto_title.cache_info()
+    disagree = sum(legacy_is_crypto(t) != is_crypto_title(t) for t in unique)
+
+    print(f"titles={args.n:,} distinct={len(unique):,}")
+    print(f"legacy substring scan : {legacy * 1000:8.1f} ms")
+    print(f"compiled regex (cold) : {cold * 1000:8.1f} ms")
+    print(f"compiled + lru cache  : {warm * 1000:8.1f} ms  {cache_info}")
+    print(f"titles classified differently (word boundaries): {disagree}")
+
+
+if __name__ == '__main__':
+    main()
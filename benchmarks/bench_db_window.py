@@ -0,0 +1,92 @@
+"""
+Benchmark: dashboard time-window query against a large trades table.
+
+    python benchmarks/bench_db_window.py [--n 10000000] [--traders 20]
+
+Builds a throwaway SQLite DB with utils.db's schema, bulk-loads N synthetic
+trades spread over 30 days, then times get_trades_since() for the
+minutes_back slider range (15–120 min). Target: < 10 ms per query at 10M rows.
+
+Measured at 10M rows, 20 traders, ~810 rows per window (3.8 GB file):
+  - rowid table + (trader, ts) index: p50 10.3 ms, p99 40 ms — every row was a
+    separate page fetch scattered across the table.
+  - clustered WITHOUT ROWID on (trader, ts, tx): p50 4.8 ms, p99 10.3 ms, max
+    11.5 ms. The read is index-only (count(*) over the window: 0.15 ms); what
+    is left is building ~1,600 dicts for the 2-hour windows, which keeps p99
+    just above the 10 ms target. Windows up to an hour are well under it.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('DISABLE_WS_LIVE', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import db  # noqa: E402
+
+CHUNK = 200_000
+
+
+def load(path: str, n: int, traders: list, now: int) -> float:
+    rnd = random.Random(7)
+    conn = db.get_conn(path)
+    start = time.perf_counter()
+    span = 30 * 86400
+    for base in range(0, n, CHUNK):
+        rows = [
+            (rnd.choice(traders), f"0x{i:064x}", now - rnd.randrange(span), 'TRADE', 'BUY',
+             '0xcond', '123', 'slug', 'Bitcoin Up or Down - March 12, 10:30PM-10:35PM ET',
+             'Up', 10.0, 0.5, 5.0)
+            for i in range(base, min(base + CHUNK, n))
+        ]
+        with conn:
+            conn.executemany(
+                "INSERT INTO trades (trader_address, tx_hash, timestamp, type, side, condition_id, "
+                "asset, slug, title, outcome, size, price, usdc_size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING",
+                rows,
+            )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=1_000_000)
+    parser.add_argument('--traders', type=int, default=20)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix='tracker-bench-'), 'bench.db')
+    traders = [f"0x{t:040x}" for t in range(args.traders)]
+    now = int(time.time())
+
+    load_sec = load(path, args.n, traders, now)
+    print(f"loaded {args.n:,} trades in {load_sec:.1f}s ({args.n / load_sec:,.0f} rows/s)")
+
+    rnd = random.Random(1)
+    timings = []
+    returned = 0
+    for _ in range(args.queries):
+        minutes = rnd.randrange(15, 125, 5)
+        start = time.perf_counter()
+        rows = db.get_trades_since(rnd.choice(traders), now - minutes * 60, path=path)
+        timings.append((time.perf_counter() - start) * 1000)
+        returned += len(rows)
+
+    timings.sort()
+    print(f"window query ({args.queries} runs, avg {returned / args.queries:.0f} rows): "
+          f"p50={statistics.median(timings):.2f} ms  "
+          f"p99={timings[int(len(timings) * 0.99) - 1]:.2f} ms  max={timings[-1]:.2f} ms")
+    plan = db.get_conn(path).execute(
+        f"EXPLAIN QUERY PLAN SELECT {db._TRADE_COLUMNS} FROM trades WHERE trader_address = ? AND timestamp >= ? "
+        "ORDER BY timestamp DESC", (traders[0], now)
+    ).fetchall()
+    print("plan:", ' | '.join(row['detail'] for row in plan))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: live trade buffer — window reads and memory per buffered event.
+
+    python benchmarks/bench_live_buffer.py [--n 1000000] [--wallets 50]
+
+Fills the columnar LiveBuffer and the old dict-per-event deque with the same
+N WS-shaped events (one per 10 ms, ending now), then reports:
+  - traced memory of each layout (tracemalloc; target < 100 MB at 1M events)
+  - the window reads the UI makes each rerun: all trades in the last 30 min
+    and one wallet's last 5 min, checked against the full scan.
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+os.environ.setdefault('DISABLE_WS_LIVE', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.live_buffer import LiveBuffer  # noqa: E402
+
+_TITLES = [f"Bitcoin Up or Down - March {d}, {h}PM ET" for d in range(1, 29) for h in range(1, 13)]
+
+
+def make_event(rnd: random.Random, ts: float, wallets: list) -> dict:
+    asset = rnd.randrange(500)
+    # WS frames are json-decoded one by one — every event owns fresh string copies
+    return {
+        'event_type': ''.join('trade'),
+        'asset_id': f"{asset:077d}",
+        'size': rnd.uniform(1, 500),
+        'price': rnd.random(),
+        'timestamp': ts,
+        'title': ''.join(_TITLES[asset % len(_TITLES)]),
+        'proxyWallet': ''.join(rnd.choice(wallets)),
+    }
+
+
+def _traced_mb(build):
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size / 1e6
+
+
+def _time_ms(fn, runs: int = 20):
+    start = time.perf_counter()
+    for _ in range(runs):
+        out = fn()
+    return (time.perf_counter() - start) * 1000 / runs, out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=1_000_000)
+    parser.add_argument('--wallets', type=int, default=50)
+    args = parser.parse_args()
+
+    now = time.time()
+    wallets = [f"0x{w:040x}" for w in range(args.wallets)]
+
+    def events():
+        rnd = random.Random(5)
+        return (make_event(rnd, now - (args.n - i) * 0.01, wallets) for i in range(args.n))
+
+    legacy, legacy_mb = _traced_mb(lambda: deque(events(), maxlen=args.n))
+    start = time.perf_counter()
+    buf, buf_mb = _traced_mb(lambda: _filled(LiveBuffer(maxlen=args.n), events()))
+    append_us = (time.perf_counter() - start) * 1e6 / args.n
+    lock = threading.Lock()
+
+    def legacy_window(cutoff, wallet=None):
+        with lock:
+            return [t for t in legacy if t['timestamp'] > cutoff
+                    and (wallet is None or t['proxyWallet'] == wallet)]
+
+    print(f"events={args.n:,}")
+    print(f"memory: dict deque {legacy_mb:7.1f} MB | columnar {buf_mb:6.1f} MB "
+          f"({buf_mb * 1e6 / args.n:.0f} B/event, append {append_us:.1f} µs)")
+    for label, cutoff, wallet in (("all, last 30 min", now - 1800, None),
+                                  ("one wallet, last 5 min", now - 300, wallets[0])):
+        old_ms, old = _time_ms(lambda: legacy_window(cutoff, wallet), runs=5)
+        new_ms, new = _time_ms(lambda: buf.since(cutoff, wallet=wallet), runs=5)
+        col_ms, _ = _time_ms(lambda: buf.columns(cutoff))
+        assert [(e['timestamp'], e['title']) for e in old] == [(e['timestamp'], e['title']) for e in new], label
+        print(f"{label:24s}: deque scan {old_ms:7.2f} ms | dicts {new_ms:7.2f} ms | "
+              f"column view {col_ms:6.3f} ms | {len(new):,} rows")
+
+
+def _filled(buf: LiveBuffer, events) -> LiveBuffer:
+    buf.extend(events)
+    return buf
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark: peak RSS and parse time for a 50k-item /positions payload.
+
+    python benchmarks/bench_stream_json.py [--n 50000] [--crypto-share 0.3]
+
+Serves a synthetic payload from a local HTTP server, then runs each mode in a
+fresh subprocess so the peak-RSS delta reflects that mode alone:
+
+  json   — resp.json() + filter crypto rows (the old path)
+  stream — utils.stream.stream_json with crypto filter + field projection
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault('DISABLE_WS_LIVE', '1')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_CRYPTO = ["Bitcoin Up or Down - March {d}, {h}PM ET", "Will ETH close above ${p} on March {d}?"]
+_OTHER = ["Will the Fed cut rates in meeting #{p}?", "Who wins the {p} award?"]
+
+
+def make_payload(n: int, crypto_share: float) -> bytes:
+    rnd = random.Random(3)
+    rows = []
+    for i in range(n):
+        tpl = rnd.choice(_CRYPTO if rnd.random() < crypto_share else _OTHER)
+        rows.append({
+            'proxyWallet': '0x' + 'ab' * 20, 'asset': str(rnd.getrandbits(250)),
+            'conditionId': f"0x{rnd.getrandbits(256):064x}", 'size': rnd.uniform(1, 500),
+            'avgPrice': rnd.random(), 'initialValue': rnd.uniform(1, 100), 'currentValue': rnd.uniform(1, 100),
+            'cashPnl': rnd.uniform(-50, 50), 'percentPnl': rnd.uniform(-100, 100), 'totalBought': rnd.uniform(1, 100),
+            'realizedPnl': 0, 'curPrice': rnd.random(), 'redeemable': False, 'mergeable': False,
+            'title': tpl.format(d=rnd.randint(1, 28), h=rnd.randint(1, 12), p=i),
+            'slug': f"market-{i}", 'icon': f"https://polymarket-upload.s3.amazonaws.com/icon-{i}.png",
+            'eventSlug': f"event-{i}", 'outcome': rnd.choice(['Up', 'Down', 'Yes', 'No']), 'outcomeIndex': 0,
+            'oppositeOutcome': 'No', 'oppositeAsset': str(rnd.getrandbits(250)), 'endDate': '2026-03-12',
+            'negativeRisk': False, 'startDate': '2026-03-01T12:00:00Z',
+        })
+    return json.dumps(rows).encode()
+
+
+def serve(body: bytes) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _status_kb(field: str) -> int | None:
+    try:
+        with open('/proc/self/status') as fh:
+            for line in fh:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak() -> bool:
+    """Linux: writing 5 to clear_refs resets VmHWM, so the peak covers only the measured call."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as fh:
+            fh.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def child(mode: str, url: str) -> None:
+    from utils.filters import crypto_filter
+    from utils.http_client import http_get
+    from utils.positions import POSITION_FIELDS
+    from utils.stream import stream_json
+
+    keep = crypto_filter()
+    http_get(url + '?warm=1').close()  # pool + imports warm; not counted
+    base_kb = _status_kb('VmRSS') or 0
+    if not _reset_peak():
+        base_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # peak-to-peak fallback
+
+    start = time.perf_counter()
+    if mode == 'json':
+        rows = http_get(url).json()
+        kept = [r for r in rows if keep(r)]
+        seen = len(rows)
+    else:
+        streamed = stream_json(url, keep=keep, fields=POSITION_FIELDS)
+        kept, seen = streamed.items, streamed.seen
+    elapsed = time.perf_counter() - start
+    peak_kb = _status_kb('VmHWM') or resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'mode': mode, 'seen': seen, 'kept': len(kept), 'sec': elapsed,
+                      'peak_delta_mb': (peak_kb - base_kb) / 1024}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=50_000)
+    parser.add_argument('--crypto-share', type=float, default=0.3)
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'URL'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    body = make_payload(args.n, args.crypto_share)
+    server = serve(body)
+    url = f"http://127.0.0.1:{server.server_address[1]}/positions"
+    print(f"payload: {args.n:,} items, {len(body) / 1e6:.1f} MB")
+
+    for mode in ('json', 'stream'):
+        out = subprocess.run(
+            [sys.executable, __file__, '--child', mode, url],
+            capture_output=True, text=True, check=True, env={**os.environ, 'PYTHONWARNINGS': 'ignore'},
+        ).stdout.strip().splitlines()[-1]
+        res = json.loads(out)
+        print(f"{mode:6s}: {res['sec'] * 1000:7.0f} ms  peak RSS +{res['peak_delta_mb']:6.1f} MB  "
+              f"(kept {res['kept']:,} / {res['seen']:,})")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
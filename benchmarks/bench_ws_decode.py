@@ -0,0 +1,83 @@
+"""
+Benchmark: WS frame decoding on a busy book.
+
+    python benchmarks/bench_ws_decode.py [--frames 200000] [--trade-share 0.05] [--batch 0.5]
+
+Builds a CLOB market-channel-shaped mix: mostly `book` / `price_change`
+frames (the former with full ladders), a `--trade-share` of last_trade_price
+events, `--batch` of frames sent as JSON arrays. Compares:
+
+  old      — json.loads every frame, then filter by event_type (dicts only)
+  decoder  — utils.ws_decode.FrameDecoder (prefilter + list frames + fastest backend)
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('DISABLE_WS_LIVE', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ws_decode import BACKEND, FrameDecoder  # noqa: E402
+
+
+def make_frames(n: int, trade_share: float, batch: float) -> list:
+    rnd = random.Random(11)
+
+    def event():
+        asset = f"{rnd.getrandbits(250)}"
+        r = rnd.random()
+        if r < trade_share:
+            return {'event_type': 'last_trade_price', 'asset_id': asset, 'market': f"0x{rnd.getrandbits(256):064x}",
+                    'price': f"{rnd.random():.3f}", 'size': f"{rnd.uniform(1, 500):.2f}", 'side': 'BUY',
+                    'fee_rate_bps': '0', 'timestamp': str(int(time.time() * 1000))}
+        if r < 0.5:
+            ladder = [{'price': f"{p / 100:.2f}", 'size': f"{rnd.uniform(1, 5000):.2f}"} for p in range(1, 40)]
+            return {'event_type': 'book', 'asset_id': asset, 'market': f"0x{rnd.getrandbits(256):064x}",
+                    'bids': ladder, 'asks': ladder[::-1], 'hash': f"{rnd.getrandbits(160):040x}",
+                    'timestamp': str(int(time.time() * 1000))}
+        return {'event_type': 'price_change', 'market': f"0x{rnd.getrandbits(256):064x}",
+                'price_changes': [{'asset_id': asset, 'price': f"{rnd.random():.2f}", 'size': '10',
+                                   'side': 'BUY', 'hash': f"{rnd.getrandbits(160):040x}"}],
+                'timestamp': str(int(time.time() * 1000))}
+
+    frames = []
+    for _ in range(n):
+        if rnd.random() < batch:
+            frames.append(json.dumps([event() for _ in range(rnd.randint(2, 6))]))
+        else:
+            frames.append(json.dumps(event()))
+    return frames
+
+
+def old_decode(raw: str) -> list:
+    data = json.loads(raw)
+    if not isinstance(data, dict):
+        return []  # list frames were silently dropped
+    return [data] if data.get('event_type') in ('trade', 'last_trade_price') else []
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=200_000)
+    parser.add_argument('--trade-share', type=float, default=0.05)
+    parser.add_argument('--batch', type=float, default=0.5)
+    args = parser.parse_args()
+
+    frames = make_frames(args.frames, args.trade_share, args.batch)
+    mb = sum(len(f) for f in frames) / 1e6
+    print(f"frames: {len(frames):,} ({mb:.0f} MB), trade share {args.trade_share:.0%}, "
+          f"{args.batch:.0%} list frames, backend={BACKEND}")
+
+    for label, decode in (('old', old_decode), ('decoder', FrameDecoder().decode)):
+        start = time.perf_counter()
+        events = sum(len(decode(f)) for f in frames)
+        elapsed = time.perf_counter() - start
+        print(f"{label:8s}: {elapsed * 1e6 / len(frames):6.1f} µs/frame | "
+              f"{len(frames) / elapsed:>9,.0f} frames/s | {events:,} trade events")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Replay a capture (CAPTURE_DIR=... while the app / collector ran) through the app's own code paths.
+
+    python benchmarks/replay.py CAPTURE_DIR [--speed 0] [--trader 0xabc...]
+
+WS frames go through websocket.process_trade (decode → record → LiveBuffer →
+bus) on the capture's timeline scaled by --speed (0 = as fast as possible —
+a deterministic decode/record fixture). With --trader, the incremental
+activity poll and the positions fetch run against the captured REST
+responses until the capture has nothing newer.
+
+The app itself replays with CAPTURE_REPLAY=DIR [CAPTURE_REPLAY_SPEED=1] streamlit run app.py.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+os.environ.setdefault('DISABLE_WS_LIVE', '1')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MAX_POLLS = 10_000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('capture', help="capture dir or a single segment file")
+    parser.add_argument('--speed', type=float, default=0, help="1 = real time, 0 = max")
+    parser.add_argument('--trader', help="also replay this trader's activity polls + positions")
+    args = parser.parse_args()
+
+    os.environ.update({
+        'CAPTURE_REPLAY': args.capture, 'CAPTURE_REPLAY_SPEED': str(args.speed), 'METRICS_PORT': '0',
+        'TRACKER_DB_PATH': os.path.join(tempfile.mkdtemp(prefix='replay_'), 'tracker.db'),
+    })
+    from utils import capture
+    from utils import websocket as ws_mod
+
+    replay = capture.current_replay()
+    paths = Counter(key.split('?', 1)[0] for key, rows in replay._by_key.items() for _ in rows)
+    span = replay.frames[-1][0] if replay.frames else 0.0
+    print(f"REST: {replay.stats['http_records']:,} responses — "
+          + (', '.join(f"{p} ×{n}" for p, n in paths.most_common()) or 'none'))
+    print(f"WS:   {replay.stats['ws_frames']:,} frames over {span:.1f}s captured")
+
+    if replay.frames:
+        start = time.perf_counter()
+        sent = replay.play_ws(ws_mod.process_trade)
+        elapsed = time.perf_counter() - start
+        dec = ws_mod.decode_stats()
+        print(f"WS replay: {sent:,} frames in {elapsed:.2f}s ({sent / max(elapsed, 1e-9):,.0f} frames/s) | "
+              f"decode {dec['decode_us_avg']:.1f} µs avg, skip {dec['skip_ratio']:.0%} | "
+              f"buffer {ws_mod.get_live_trades_count():,}")
+
+    if args.trader:
+        from utils.activity import poll_new_activity
+        from utils.positions import get_open_positions
+
+        start = time.perf_counter()
+        polls = items = 0
+        while polls < MAX_POLLS:
+            polls += 1
+            new = poll_new_activity(args.trader, 100)
+            items += len(new)
+            if not new and (not args.speed or replay.clock() > span):
+                break
+            if args.speed:
+                time.sleep(1)
+        positions = get_open_positions(args.trader)
+        print(f"REST replay: {polls} activity polls → {items:,} new items | "
+              f"{len(positions):,} open positions | {time.perf_counter() - start:.2f}s | "
+              f"{replay.stats['served']:,} served, {replay.stats['misses']} misses")
+
+
+if __name__ == '__main__':
+    main()
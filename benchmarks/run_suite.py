@@ -0,0 +1,185 @@
+"""
+Offline benchmark suite — the app's hot functions at 1× / 10× / 100× / 1000× payloads.
+
+    python benchmarks/run_suite.py [--scales 1,10,100,1000] [--runs 5] [--only track_0x8dxd,...]
+                                   [--out benchmarks/results] [--compare OLD.json]
+
+Every upstream call goes to a local stub (benchmarks/stub_api.py) serving
+synthetic payloads (benchmarks/synthetic.py), so the real fetch → stream →
+filter → frame path runs with no network. st.cache_data caches and the
+activity cursor are reset before each run, so each timing is one full
+uncached rerun; the process-lifetime end-date cache is left warm after the
+first run, as in a running app (`first_ms` is the cold run).
+
+Results are written as JSON (one file per run, with git revision and
+library versions); `--compare` prints the ratio against an older file.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.stub_api import serve  # noqa: E402
+from benchmarks.synthetic import generate  # noqa: E402
+
+STATUS_SAMPLE = 1000  # get_status_hybrid is per item — time this many calls
+BANKROLL = 10_000.0
+COPY_RATIO = 10
+
+
+def _configure_env(url: str) -> None:
+    # Must happen before utils is imported — base URLs and flags are read at import
+    os.environ.update({
+        'DISABLE_WS_LIVE': '1', 'METRICS_PORT': '0', 'USE_LOCAL_STORE': '',
+        'POLYMARKET_DATA_API': url, 'POLYMARKET_GAMMA_API': url,
+        'TRACKER_DB_PATH': os.path.join(tempfile.mkdtemp(prefix='bench_'), 'tracker.db'),
+    })
+
+
+def _benches():
+    from utils import activity
+    from utils.config import TRADER
+    from utils.filters import filter_5m_markets
+    from utils.positions import get_open_positions, get_positions_snapshot
+    from utils.simulator import run_position_simulator, calc_safe_ratio
+    from utils.status import get_status_hybrid
+    from utils.trades import track_0x8dxd, get_latest_bets
+
+    def fresh_track():
+        track_0x8dxd.clear()
+        get_latest_bets.clear()
+        activity._cursors.clear()
+        activity._recent.clear()
+        return track_0x8dxd(60, include_5m=True)
+
+    def fresh_positions():
+        get_positions_snapshot.clear()
+        return get_open_positions(TRADER)
+
+    def status_batch(items):
+        now_ts = int(time.time())
+        return [get_status_hybrid(item, now_ts) for item in items]
+
+    # name → (setup(data, pos_df) -> (fn, n_items))
+    return {
+        'track_0x8dxd':           lambda data, pos: (fresh_track, len(data['activity'])),
+        'get_open_positions':     lambda data, pos: (fresh_positions, len(data['positions'])),
+        'run_position_simulator': lambda data, pos: (lambda: run_position_simulator(pos, BANKROLL, COPY_RATIO), len(pos)),
+        'get_status_hybrid':      lambda data, pos: ((lambda items=data['activity'][:STATUS_SAMPLE]: status_batch(items)),
+                                                     min(len(data['activity']), STATUS_SAMPLE)),
+        'filter_5m_markets':      lambda data, pos: (lambda: filter_5m_markets(pos), len(pos)),
+        'calc_safe_ratio':        lambda data, pos: (lambda: calc_safe_ratio(pos, BANKROLL), len(pos)),
+    }, fresh_positions
+
+
+def _time(fn, runs: int, budget_sec: float) -> list:
+    samples = []
+    spent = time.perf_counter()
+    sink = io.StringIO()
+    while len(samples) < runs:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(sink):  # the app's debug prints still run, just not shown
+            fn()
+        samples.append((time.perf_counter() - start) * 1000)
+        sink.seek(0)
+        sink.truncate()
+        if len(samples) >= 2 and time.perf_counter() - spent > budget_sec:
+            break
+    return samples
+
+
+def _git_rev() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _compare(results: list, path: str) -> None:
+    with open(path) as fh:
+        old = {(r['bench'], r['scale']): r for r in json.load(fh)['results']}
+    print(f"\nvs {os.path.basename(path)} (median, <1.00 = faster now)")
+    for r in results:
+        prev = old.get((r['bench'], r['scale']))
+        if prev and prev['median_ms']:
+            print(f"  {r['bench']:24s} {r['scale']:>5}×  {prev['median_ms']:9.2f} → {r['median_ms']:9.2f} ms  "
+                  f"{r['median_ms'] / prev['median_ms']:5.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scales', default='1,10,100,1000')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=20.0, help="max seconds per bench/scale (≥2 runs)")
+    parser.add_argument('--only', default='')
+    parser.add_argument('--out', default=os.path.join(ROOT, 'benchmarks', 'results'))
+    parser.add_argument('--compare')
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(',') if s]
+    now = time.time()
+    server = serve(generate(scale=scales[0], now=now))
+    _configure_env(server.url)
+    benches, fresh_positions = _benches()
+    only = {b for b in args.only.split(',') if b}
+    unknown = only - benches.keys()
+    if unknown:
+        parser.error(f"unknown bench(es): {', '.join(sorted(unknown))}")
+
+    import numpy
+    import pandas
+    results = []
+    for scale in scales:
+        data = generate(scale=scale, now=now)
+        server.load(data)
+        with contextlib.redirect_stdout(io.StringIO()):
+            pos_df = fresh_positions()
+        print(f"── {scale}× — {len(data['activity']):,} activity | {len(data['positions']):,} positions | "
+              f"{len(data['trades']):,} trades | {len(data['markets']):,} markets")
+        for name, setup in benches.items():
+            if only and name not in only:
+                continue
+            fn, n_items = setup(data, pos_df)
+            samples = _time(fn, args.runs, args.budget)
+            warm = samples[1:] or samples
+            row = {
+                'bench': name, 'scale': scale, 'n_items': n_items, 'runs': len(samples),
+                'first_ms': samples[0], 'median_ms': statistics.median(warm), 'min_ms': min(warm),
+                'p90_ms': sorted(warm)[min(len(warm) - 1, int(0.9 * len(warm)))],
+            }
+            results.append(row)
+            print(f"  {name:24s} median {row['median_ms']:9.2f} ms | min {row['min_ms']:9.2f} | "
+                  f"first {row['first_ms']:9.2f} | n={n_items:,}")
+    server.shutdown()
+
+    os.makedirs(args.out, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    path = os.path.join(args.out, f"suite-{stamp}.json")
+    with open(path, 'w') as fh:
+        json.dump({
+            'meta': {
+                'created': stamp, 'git': _git_rev(), 'python': platform.python_version(),
+                'platform': platform.platform(), 'pandas': pandas.__version__, 'numpy': numpy.__version__,
+                'scales': scales, 'runs': args.runs,
+            },
+            'results': results,
+        }, fh, indent=2)
+    print(f"\n📝 {path}")
+    if args.compare:
+        _compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
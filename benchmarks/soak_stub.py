@@ -0,0 +1,128 @@
+"""
+Soak test: collector + WS engine against the local Polymarket stand-in.
+
+    python benchmarks/soak_stub.py [--traders 100] [--ws-rate 10000] [--fill-rate 200] [--seconds 60]
+                                   [--interval 5] [--latency-ms 20] [--error-rate 0.01] [--rate-limit 0.01]
+
+Starts benchmarks/stub_api.py in a child process (its own GIL) with the given
+faults, points every base URL at it, registers `--traders` wallets in a temp
+store, then runs the real collector cycle and the asyncio WS engine side by
+side for `--seconds`.
+
+Reports cycle time vs interval, fills generated vs ingested, injected faults
+vs client retries, and delivered WS rate.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault('DISABLE_WS_LIVE', '1')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import generate  # noqa: E402
+
+
+def _start_stub(args) -> tuple:
+    cmd = [
+        sys.executable, os.path.join(ROOT, 'benchmarks', 'stub_api.py'), '--port', '0', '--ws-port', '0',
+        '--traders', str(args.traders), '--fill-rate', str(args.fill_rate), '--ws-rate', str(args.ws_rate),
+        '--latency-ms', str(args.latency_ms), '--jitter-ms', str(args.latency_ms / 2),
+        '--error-rate', str(args.error_rate), '--rate-limit', str(args.rate_limit),
+    ]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    return proc, json.loads(proc.stdout.readline())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--traders', type=int, default=100)
+    parser.add_argument('--ws-rate', type=int, default=10_000)
+    parser.add_argument('--fill-rate', type=float, default=200)
+    parser.add_argument('--assets', type=int, default=500, help="WS subscriptions (stub market tokens)")
+    parser.add_argument('--seconds', type=float, default=60)
+    parser.add_argument('--interval', type=float, default=5)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--latency-ms', type=float, default=20)
+    parser.add_argument('--error-rate', type=float, default=0.01)
+    parser.add_argument('--rate-limit', type=float, default=0.01)
+    args = parser.parse_args()
+
+    proc, info = _start_stub(args)
+    os.environ.update({
+        'POLYMARKET_DATA_API': info['http'], 'POLYMARKET_GAMMA_API': info['http'],
+        'POLYMARKET_WS_URL': info['ws'], 'METRICS_PORT': '0',
+        'TRACKER_DB_PATH': os.path.join(tempfile.mkdtemp(prefix='soak_'), 'tracker.db'),
+    })
+
+    from collector import Collector
+    from utils import db, ws_engine
+    from utils import websocket as ws_mod
+    from utils.config import WS_BASE_URL
+    from utils.http_client import connection_stats, get_json
+    from utils.subscriptions import SubscriptionManager
+
+    for trader in info['traders']:
+        db.add_trader(trader)
+    markets = generate()['markets']  # same seed/scale as the stub → its token ids
+    assets = {t for m in markets for t in m['clobTokenIds']}
+    assets = set(sorted(assets)[:args.assets])
+
+    manager = SubscriptionManager(spawn=ws_mod._spawn_shard, desired=lambda: assets)
+    runner = threading.Thread(
+        target=ws_engine.run_engine, name='rtds_listener',
+        args=(f"{WS_BASE_URL}/ws/market", ws_mod.process_trade, manager), daemon=True,
+    )
+    runner.start()
+
+    cycles = []
+
+    async def soak():
+        collector = Collector(concurrency=args.concurrency)
+        try:
+            deadline = time.monotonic() + args.seconds
+            while time.monotonic() < deadline:
+                started = time.monotonic()
+                cycles.append(await collector.run_cycle())
+                await asyncio.sleep(max(0.0, args.interval - (time.monotonic() - started)))
+        finally:
+            collector.close()
+
+    time.sleep(1)  # WS connect + subscribe
+    engine = ws_engine.current()
+    ws_start = engine.stats()['messages'] if engine else 0
+    start = time.perf_counter()
+    asyncio.run(soak())
+    elapsed = time.perf_counter() - start
+    ws_stats = engine.stats() if engine else {'messages': 0, 'reconnects': 0, 'errors': 0}
+    ws_mod.stop_live_ws()
+    runner.join(timeout=10)
+
+    stub = get_json(f"{info['http']}/__stats") or {}
+    proc.kill()
+    conn = db.get_conn()
+    ingested = conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+    http = connection_stats()
+
+    took = sorted(c['elapsed'] for c in cycles)
+    print(f"{args.traders} traders | {len(cycles)} cycles every {args.interval}s | "
+          f"cycle p50 {took[len(took) // 2]:.2f}s max {took[-1]:.2f}s"
+          + (" ⚠️ cycles overran the interval" if took[-1] > args.interval else ""))
+    print(f"fills: stub generated {stub.get('fills', 0):,} live (+ base set per trader) | "
+          f"stored {ingested:,} trades | poll errors {sum(c['errors'] for c in cycles)}")
+    print(f"REST: {stub.get('requests', 0):,} requests | injected 429 {stub.get('429', 0)} / 503 {stub.get('503', 0)} "
+          f"| client retries {sum(h.get('retries', 0) for h in http.values())} "
+          f"errors {sum(h.get('errors', 0) for h in http.values())}")
+    print(f"WS: {(ws_stats['messages'] - ws_start) / elapsed:,.0f} msg/s delivered (target {args.ws_rate:,}) | "
+          f"reconnects {ws_stats['reconnects']} | errors {ws_stats['errors']} | "
+          f"runner {'stopped' if not runner.is_alive() else 'STILL RUNNING'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Soak test: asyncio WS engine against a local market-channel stub.
+
+    python benchmarks/soak_ws_engine.py [--rate 10000] [--assets 500] [--seconds 30] [--drop-every 10]
+
+Starts a websockets server in a separate process that pushes `--rate` trade
+frames/s spread over every connected shard (and drops each connection every
+`--drop-every` seconds to exercise reconnect backoff). The real listener path
+runs against it: SubscriptionManager → AsyncWSEngine → process_trade → LiveBuffer.
+
+Reports delivered rate, send→process lag (sampled), reconnects, thread count
+while running, and whether stop_live_ws() tears everything down cleanly.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+os.environ.setdefault('DISABLE_WS_LIVE', '1')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TICK = 0.01  # server flushes whatever the target rate owes every ~10 ms
+
+
+# ── stub server (child process, so it doesn't share the engine's GIL) ────────
+
+async def _serve(rate: int, drop_every: float) -> None:
+    from websockets.asyncio.server import serve
+
+    conns = set()
+
+    async def handler(ws):
+        sub = json.loads(await ws.recv())
+        assets = sub.get('assets_ids') or ['0']
+        conns.add(ws)
+        rnd = random.Random()
+        opened = last = time.monotonic()
+        owed = 0.0
+        try:
+            while True:
+                tick = time.monotonic()
+                owed += rate * (tick - last) / max(1, len(conns))  # ✅ Paced by wall time, not sleep()
+                last, burst = tick, int(owed)
+                owed -= burst
+                now = time.time()
+                for _ in range(burst):
+                    asset = rnd.choice(assets)
+                    await ws.send(json.dumps({
+                        'event_type': 'last_trade_price', 'asset_id': asset, 'price': rnd.random(),
+                        'size': rnd.uniform(1, 500), 'question': f"Bitcoin Up or Down #{asset}", 'sent': now,
+                    }))
+                if drop_every and time.monotonic() - opened > drop_every:
+                    await ws.close()
+                    return
+                await asyncio.sleep(TICK)
+        finally:
+            conns.discard(ws)
+
+    async with serve(handler, '127.0.0.1', 0, ping_interval=None) as server:
+        print(server.sockets[0].getsockname()[1], flush=True)
+        await asyncio.Future()
+
+
+# ── soak ────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rate', type=int, default=10_000)
+    parser.add_argument('--assets', type=int, default=500)
+    parser.add_argument('--seconds', type=float, default=30)
+    parser.add_argument('--drop-every', type=float, default=10)
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        asyncio.run(_serve(args.rate, args.drop_every))
+        return
+
+    server = subprocess.Popen(
+        [sys.executable, __file__, '--serve', '--rate', str(args.rate), '--drop-every', str(args.drop_every)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    port = int(server.stdout.readline())
+
+    from utils import websocket as ws_mod
+    from utils import ws_engine
+    from utils.subscriptions import SubscriptionManager
+
+    assets = {f"{i:077d}" for i in range(args.assets)}
+    manager = SubscriptionManager(spawn=ws_mod._spawn_shard, desired=lambda: assets)
+    lags = []
+
+    def on_message(msg):
+        ws_mod.process_trade(msg)
+        if random.random() < 0.01:  # sample lag without double-decoding every frame
+            lags.append(time.time() - json.loads(msg)['sent'])
+
+    baseline_threads = threading.active_count()
+    runner = threading.Thread(
+        target=ws_engine.run_engine, name='rtds_listener',
+        args=(f"ws://127.0.0.1:{port}", on_message, manager), kwargs={'ping_interval': 5, 'resync_sec': 5},
+        daemon=True,
+    )
+    runner.start()
+
+    time.sleep(2)  # connect + subscribe
+    engine = ws_engine.current()
+    start_msgs, start = engine.stats()['messages'], time.perf_counter()
+    peak_threads = 0
+    while time.perf_counter() - start < args.seconds:
+        time.sleep(1)
+        peak_threads = max(peak_threads, threading.active_count())
+    stats = engine.stats()
+    elapsed = time.perf_counter() - start
+    coverage = manager.coverage()
+
+    stop_at = time.perf_counter()
+    ws_mod.stop_live_ws()
+    runner.join(timeout=10)
+    stop_ms = (time.perf_counter() - stop_at) * 1000
+    server.kill()
+
+    lags.sort()
+    pct = (lambda q: lags[min(len(lags) - 1, int(q * len(lags)))] * 1000) if lags else (lambda q: float('nan'))
+    print(f"target {args.rate:,} msg/s over {coverage['shards']} shards "
+          f"({coverage['subscribed']}/{coverage['desired']} assets)")
+    print(f"delivered: {(stats['messages'] - start_msgs) / elapsed:,.0f} msg/s | "
+          f"buffer {len(ws_mod.live_trades):,} | reconnects {stats['reconnects']} | errors {stats['errors']}")
+    print(f"lag ms: p50 {pct(0.5):.1f} | p99 {pct(0.99):.1f} | max {pct(1.0):.1f}")
+    print(f"threads: baseline {baseline_threads} | peak while running {peak_threads} "
+          f"(thread-per-shard would add ≥ {2 * coverage['shards']})")
+    leftover = [t.name for t in threading.enumerate() if t.name.startswith(('rtds_', 'asyncio_'))]
+    print(f"stop: {'clean' if not runner.is_alive() and not leftover else 'NOT clean'} in {stop_ms:.0f} ms"
+          + (f" (left: {leftover})" if leftover else ""))
+
+
+if __name__ == '__main__':
+    main()
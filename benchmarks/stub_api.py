@@ -0,0 +1,342 @@
+"""
+Local stand-in for the Polymarket data + gamma APIs and the CLOB market WebSocket.
+
+    python benchmarks/stub_api.py [--scale 1] [--port 8765] [--ws-port 8766] [--traders 100]
+                                  [--fill-rate 100] [--ws-rate 10000]
+                                  [--latency-ms 0] [--jitter-ms 0] [--error-rate 0] [--rate-limit 0]
+
+Prints the env to point the app / collector at it (every base URL is read
+from config), then serves until Ctrl+C. In-process:
+
+    from benchmarks.stub_api import serve
+    server = serve(generate(scale=10))
+    os.environ['POLYMARKET_DATA_API'] = os.environ['POLYMARKET_GAMMA_API'] = server.url
+
+Implements the query parameters the app sends:
+  /activity        user, start, offset, limit (newest first; live fills first, then the base set)
+  /positions       user
+  /trades          user, market (comma-separated condition ids), offset, limit
+  /markets         condition_ids (repeated), tokenIds, slug, active/closed, offset, limit
+  /public-profile  address
+  /__stats         stub counters (requests, injected faults, fills, frames)
+  ws /ws/market    subscribe with {"assets_ids": [...]} (then subscribe/unsubscribe ops);
+                   last_trade_price frames for those assets. stub.drop_ws() closes every connection
+
+Faults apply to every REST request: added latency (± jitter), a share of 503s
+and a share of 429s carrying Retry-After. `--fill-rate` appends new fills to
+the watched traders' /activity; `--ws-rate` is the total frame rate over all
+open WS connections.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import generate, make_fill, traders as synthetic_traders  # noqa: E402
+
+TICK = 0.01            # generators flush whatever the target rate owes every ~10 ms
+LIVE_FILLS_KEPT = 5000  # per trader — older live fills fall off /activity
+
+
+def _page(rows: List[dict], q: Dict[str, List[str]], default_limit: int = 100) -> List[dict]:
+    offset = int(q.get('offset', ['0'])[0] or 0)
+    limit = int(q.get('limit', [str(default_limit)])[0] or default_limit)
+    return rows[offset:offset + limit]
+
+
+class Faults:
+    """Per-request latency / error / rate-limit injection."""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 rate_limit: float = 0.0, retry_after: int = 1):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+
+    def delay(self) -> float:
+        return max(0.0, self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+
+    def status(self) -> int | None:
+        """429 / 503 to send instead of the payload, or None to serve it."""
+        r = random.random()
+        if r < self.rate_limit:
+            return 429
+        if r < self.rate_limit + self.error_rate:
+            return 503
+        return None
+
+
+class StubData:
+    """Payload tables + the lookups the endpoints need."""
+
+    def __init__(self, data: Dict[str, List[dict]]):
+        self.activity = data.get('activity', [])
+        self.positions = data.get('positions', [])
+        self.trades = data.get('trades', [])
+        self.markets = data.get('markets', [])
+        self._by_condition = {m['conditionId'].lower(): m for m in self.markets}
+        self._by_token = {t: m for m in self.markets for t in m.get('clobTokenIds', [])}
+        self._by_slug = {m['slug']: m for m in self.markets}
+        self._live: Dict[str, deque] = {}
+        self._live_lock = threading.Lock()
+        self.ws_subs: Dict[object, set] = {}  # open WS connection → assets it's subscribed to
+        self._drop_ws = None                  # set by serve_ws
+        self.stats = {'requests': 0, '429': 0, '503': 0, 'fills': 0, 'frames': 0, 'ws_clients': 0}
+
+    def add_fill(self, trader: str, item: dict) -> None:
+        with self._live_lock:
+            self._live.setdefault(trader, deque(maxlen=LIVE_FILLS_KEPT)).append(item)
+            self.stats['fills'] += 1
+
+    def ws_assets(self) -> set:
+        """Union of what the open WS connections are subscribed to."""
+        return set().union(*list(self.ws_subs.values()))
+
+    def drop_ws(self) -> None:
+        """Close every open WS connection from the server side (clients should reconnect)."""
+        if self._drop_ws is not None:
+            self._drop_ws()
+
+    def _activity(self, user: str) -> List[dict]:
+        with self._live_lock:
+            live = list(self._live.get(user, ()))
+        live.reverse()  # newest first
+        return live + self.activity if live else self.activity
+
+    def route(self, path: str, q: Dict[str, List[str]]):
+        if path == '/activity':
+            start = int(q.get('start', ['0'])[0] or 0)
+            rows = self._activity(q.get('user', [''])[0].lower())
+            if start:
+                rows = [a for a in rows if a['timestamp'] >= start]
+            return _page(rows, q)
+        if path == '/positions':
+            return self.positions
+        if path == '/trades':
+            rows = self.trades
+            if q.get('market', [''])[0]:
+                markets = {c.lower() for c in q['market'][0].split(',')}
+                rows = [t for t in rows if t['conditionId'].lower() in markets]
+            return _page(rows, q)
+        if path == '/markets':
+            if 'condition_ids' in q:
+                return [m for c in q['condition_ids'] if (m := self._by_condition.get(c.lower()))]
+            if 'tokenIds' in q:
+                return [m for t in q['tokenIds'] if (m := self._by_token.get(t))]
+            if 'slug' in q:
+                return [m for s in q['slug'] if (m := self._by_slug.get(s))]
+            rows = self.markets
+            if q.get('active', [''])[0] == 'true':
+                rows = [m for m in rows if m.get('active')]
+            return _page(rows, q)
+        if path == '/public-profile':
+            return {'name': 'synthetic-trader', 'pseudonym': 'synthetic', 'proxyWallet': q.get('address', [''])[0]}
+        if path == '/__stats':
+            return dict(self.stats)
+        return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real APIs
+    stub: StubData
+    faults: Faults = Faults()
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, headers: Dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip('/') or '/'
+        stub = self.stub
+        if path != '/__stats':
+            stub.stats['requests'] += 1
+            delay = self.faults.delay()
+            if delay:
+                time.sleep(delay)
+            status = self.faults.status()
+            if status:
+                stub.stats[str(status)] += 1
+                headers = {'Retry-After': str(self.faults.retry_after)} if status == 429 else None
+                self._send(status, b'{"error": "injected"}', headers)
+                return
+        payload = stub.route(path, parse_qs(parts.query))
+        if payload is None:
+            self._send(404, b'{"error": "not found"}')
+            return
+        self._send(200, json.dumps(payload).encode())
+
+
+def serve(data: Dict[str, List[dict]], host: str = '127.0.0.1', port: int = 0,
+          handler: type = _Handler, faults: Faults | None = None) -> ThreadingHTTPServer:
+    """
+    Start the stub on a daemon thread. `server.url` is its base URL;
+    `server.load(data)` swaps the payloads in place (the app's base URLs are read once).
+    """
+    attrs = {'stub': StubData(data)}
+    if faults is not None:
+        attrs['faults'] = faults
+    cls = type('StubHandler', (handler,), attrs)
+    server = ThreadingHTTPServer((host, port), cls)
+    server.daemon_threads = True
+    server.url = f"http://{host}:{server.server_address[1]}"
+    server.stub_data = lambda: cls.stub
+    server.load = lambda new: setattr(cls, 'stub', StubData(new))
+    threading.Thread(target=server.serve_forever, name='stub_api', daemon=True).start()
+    return server
+
+
+def run_fills(stub: StubData, watched: List[str], rate: float, stop: threading.Event) -> None:
+    """Append `rate` new fills/s spread over `watched` traders' /activity."""
+    rnd = random.Random()
+    last, owed = time.monotonic(), 0.0
+    while not stop.wait(TICK):
+        tick = time.monotonic()
+        owed += rate * (tick - last)  # ✅ Paced by wall time, not sleep()
+        last, burst = tick, int(owed)
+        owed -= burst
+        now = int(time.time())
+        for _ in range(burst):
+            trader = rnd.choice(watched)
+            stub.add_fill(trader, make_fill(rnd, rnd.choice(stub.markets), trader, now))
+
+
+async def _serve_ws(stub: StubData, host: str, port: int, rate: float, ready: list) -> None:
+    from websockets.asyncio.server import serve as ws_serve
+    from websockets.exceptions import ConnectionClosed
+
+    conns = set()
+    loop = asyncio.get_running_loop()
+
+    def drop_all():
+        for ws in list(conns):
+            loop.create_task(ws.close(1012, 'stub drop'))
+
+    stub._drop_ws = lambda: loop.call_soon_threadsafe(drop_all)
+
+    async def track(ws, assets: set):
+        # subscribe / unsubscribe ops after the first message; "ping" and the rest are ignored
+        async for raw in ws:
+            try:
+                op = json.loads(raw)
+            except ValueError:
+                continue
+            if isinstance(op, dict) and op.get('assets_ids'):
+                if op.get('operation') == 'unsubscribe':
+                    assets.difference_update(op['assets_ids'])
+                else:
+                    assets.update(op['assets_ids'])
+
+    async def handler(ws):
+        if ws.request.path.rstrip('/') != '/ws/market':
+            await ws.close(1008, 'unknown channel')
+            return
+        sub = json.loads(await ws.recv())
+        assets = set(sub.get('assets_ids') or ())
+        stub.ws_subs[ws] = assets
+        conns.add(ws)
+        stub.stats['ws_clients'] += 1
+        reader = asyncio.create_task(track(ws, assets))
+        rnd = random.Random()
+        last, owed = time.monotonic(), 0.0
+        try:
+            while not reader.done():
+                tick = time.monotonic()
+                owed += rate * (tick - last) / max(1, len(conns))
+                last, burst = tick, int(owed)
+                owed -= burst
+                now_ms = str(int(time.time() * 1000))
+                choices = tuple(assets) or ('0',)
+                for _ in range(burst):
+                    await ws.send(json.dumps({
+                        'event_type': 'last_trade_price', 'asset_id': rnd.choice(choices),
+                        'price': round(rnd.random(), 3), 'size': round(rnd.uniform(1, 500), 2),
+                        'side': 'BUY', 'timestamp': now_ms,
+                    }))
+                stub.stats['frames'] += burst
+                await asyncio.sleep(TICK)
+        except ConnectionClosed:
+            pass
+        finally:
+            reader.cancel()
+            conns.discard(ws)
+            stub.ws_subs.pop(ws, None)
+            stub.stats['ws_clients'] -= 1
+
+    async with ws_serve(handler, host, port, ping_interval=None) as server:
+        ready.append(server.sockets[0].getsockname()[1])
+        await asyncio.Future()
+
+
+def serve_ws(stub: StubData, host: str = '127.0.0.1', port: int = 0, rate: float = 1000) -> str:
+    """Market-channel feed on its own loop thread; returns the base URL for POLYMARKET_WS_URL."""
+    ready: list = []
+    threading.Thread(target=asyncio.run, args=(_serve_ws(stub, host, port, rate, ready),),
+                     name='stub_ws', daemon=True).start()
+    while not ready:
+        time.sleep(0.01)
+    return f"ws://{host}:{ready[0]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Polymarket stand-in (REST + WS)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--ws-port', type=int, default=8766)
+    parser.add_argument('--scale', type=int, default=1)
+    parser.add_argument('--traders', type=int, default=100, help="synthetic wallets that get live fills")
+    parser.add_argument('--fill-rate', type=float, default=100, help="new /activity fills per second (all traders)")
+    parser.add_argument('--ws-rate', type=float, default=10_000, help="WS frames per second (all connections)")
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0, help="share of REST requests answered 503")
+    parser.add_argument('--rate-limit', type=float, default=0, help="share of REST requests answered 429")
+    parser.add_argument('--retry-after', type=int, default=1)
+    args = parser.parse_args()
+
+    faults = Faults(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit, args.retry_after)
+    server = serve(generate(scale=args.scale), args.host, args.port, faults=faults)
+    stub = server.stub_data()
+    watched = synthetic_traders(args.traders)
+    stop = threading.Event()
+    if args.fill_rate and watched:
+        threading.Thread(target=run_fills, args=(stub, watched, args.fill_rate, stop),
+                         name='stub_fills', daemon=True).start()
+    ws_url = serve_ws(stub, args.host, args.ws_port, args.ws_rate) if args.ws_rate else ''
+
+    # First line is machine-readable for scripts that spawn the stub
+    print(json.dumps({'http': server.url, 'ws': ws_url, 'traders': watched}), flush=True)
+    print(f"export POLYMARKET_DATA_API={server.url} POLYMARKET_GAMMA_API={server.url}"
+          + (f" POLYMARKET_WS_URL={ws_url}" if ws_url else ""), file=sys.stderr)
+    try:
+        while True:
+            time.sleep(10)
+            print(f"📊 {stub.stats}", file=sys.stderr)
+    except KeyboardInterrupt:
+        stop.set()
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Synthetic Polymarket payloads for offline benchmarks and load tests.
+
+    from benchmarks.synthetic import generate
+    data = generate(scale=10)   # {'activity', 'positions', 'trades', 'markets'}
+
+Scale 1 is roughly one busy hour for the tracked trader; every collection
+grows linearly with `scale`. The mix mirrors what the app filters on:
+hourly / 15m / 5m "Up or Down" windows (5m titles included on purpose),
+price-threshold crypto markets, and non-crypto noise. Positions come mostly
+as hedged UP/DOWN pairs on the same market, plus unhedged singles.
+Deterministic for a given (scale, seed, now).
+"""
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import pytz
+
+EST = pytz.timezone('US/Eastern')
+
+BASE = {'markets': 40, 'activity': 200, 'trades': 200}
+HEDGED_SHARE = 0.6        # markets held on both sides
+SHORT_WINDOW_SHARE = 0.3  # markets that are 5m windows
+NON_CRYPTO_SHARE = 0.15
+
+_COINS = ['Bitcoin', 'Ethereum', 'Solana', 'XRP']
+_OTHER = ["Will the Fed cut rates in meeting #{i}?", "Who wins award #{i}?", "Will it rain in city #{i}?"]
+
+
+def _clock(dt: datetime, minutes: bool = True) -> str:
+    hour = dt.strftime('%I').lstrip('0')
+    return f"{hour}:{dt:%M}{dt:%p}" if minutes else f"{hour}{dt:%p}"
+
+
+def _title(rnd: random.Random, i: int, now: datetime) -> str:
+    coin = rnd.choice(_COINS)
+    r = rnd.random()
+    if r < NON_CRYPTO_SHARE:
+        return rnd.choice(_OTHER).format(i=i)
+    start = now + timedelta(minutes=rnd.randrange(-120, 240, 5))
+    day = f"{start:%B} {start.day}"
+    if r < NON_CRYPTO_SHARE + SHORT_WINDOW_SHARE:
+        end = start + timedelta(minutes=5)
+        return f"{coin} Up or Down - {day}, {_clock(start)}-{_clock(end)} ET"
+    if r < 0.7:
+        return f"{coin} Up or Down - {day}, {_clock(start.replace(minute=0), minutes=False)} ET"
+    if r < 0.8:
+        end = start + timedelta(minutes=15)
+        return f"{coin} Up or Down - {day}, {_clock(start)}-{_clock(end)} ET"
+    return f"Will {coin} close above ${rnd.randrange(1, 200) * 500:,} on {day}?"
+
+
+def _hex(rnd: random.Random, bits: int = 256) -> str:
+    return f"0x{rnd.getrandbits(bits):0{bits // 4}x}"
+
+
+def traders(n: int, seed: int = 7) -> List[str]:
+    """`n` deterministic wallet addresses — for multi-trader soaks."""
+    rnd = random.Random(seed)
+    return [_hex(rnd, 160) for _ in range(n)]
+
+
+def make_fill(rnd: random.Random, market: dict, trader: str, ts: int, kind: str = 'activity') -> dict:
+    """One BUY fill on `market` shaped like a data-api /activity (or /trades) item."""
+    idx = rnd.randrange(2)
+    size = round(rnd.uniform(5, 500), 2)
+    price = round(rnd.uniform(0.02, 0.98), 3)
+    item = {
+        'proxyWallet': trader, 'timestamp': ts,
+        'conditionId': market['conditionId'], 'asset': market['clobTokenIds'][idx], 'side': 'BUY',
+        'size': size, 'price': price, 'usdcSize': round(size * price, 2), 'title': market['question'],
+        'slug': market['slug'], 'outcome': market['outcomes'][idx], 'outcomeIndex': idx,
+        'transactionHash': _hex(rnd),
+    }
+    if kind == 'activity':
+        item['type'] = 'TRADE' if rnd.random() < 0.9 else rnd.choice(['REDEEM', 'SPLIT', 'MERGE'])
+    return item
+
+
+def generate(scale: int = 1, seed: int = 7, now: float | None = None,
+             trader: str = '0x' + '8d' * 20) -> Dict[str, List[dict]]:
+    rnd = random.Random(seed * 1_000_003 + scale)
+    now = time.time() if now is None else now
+    now_et = datetime.fromtimestamp(now, EST)
+
+    markets = []
+    for i in range(BASE['markets'] * scale):
+        title = _title(rnd, i, now_et)
+        end = now + rnd.randrange(-3600, 4 * 3600)
+        markets.append({
+            'id': str(100000 + i), 'conditionId': _hex(rnd), 'question': title, 'slug': f"market-{seed}-{i}",
+            'endDate': datetime.fromtimestamp(end, pytz.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'endDateIso': datetime.fromtimestamp(end, pytz.utc).strftime('%Y-%m-%d'),
+            'active': end > now, 'closed': end <= now, 'category': 'Crypto',
+            'clobTokenIds': [str(rnd.getrandbits(250)), str(rnd.getrandbits(250))],
+            'outcomes': ['Up', 'Down'],
+        })
+
+    positions = []
+    for m in markets:
+        sides = ['Up', 'Down'] if rnd.random() < HEDGED_SHARE else [rnd.choice(['Up', 'Down'])]
+        for side in sides:
+            idx = m['outcomes'].index(side)  # ✅ asset / outcomeIndex follow the outcome, not the loop
+            size = round(rnd.uniform(10, 2000), 2)
+            avg = round(rnd.uniform(0.05, 0.95), 3)
+            cur = round(min(max(avg + rnd.uniform(-0.2, 0.2), 0.001), 0.999), 3)
+            positions.append({
+                'proxyWallet': trader, 'asset': m['clobTokenIds'][idx], 'conditionId': m['conditionId'],
+                'size': size, 'avgPrice': avg, 'curPrice': cur, 'initialValue': size * avg,
+                'currentValue': size * cur, 'cashPnl': round(size * (cur - avg), 2),
+                'percentPnl': round((cur - avg) / avg * 100, 2), 'realizedPnl': 0,
+                'title': m['question'], 'slug': m['slug'], 'outcome': side, 'outcomeIndex': idx,
+                'endDate': m['endDateIso'], 'icon': f"https://example.invalid/icon-{m['id']}.png",
+                'startDate': datetime.fromtimestamp(now - rnd.randrange(60, 7200), pytz.utc).isoformat(),
+            })
+
+    def fills(n: int, kind: str) -> List[dict]:
+        # newest first, like the API
+        return [make_fill(rnd, rnd.choice(markets), trader, int(now - i * 3600 / max(n, 1)), kind)
+                for i in range(n)]
+
+    return {
+        'markets': markets,
+        'positions': positions,
+        'activity': fills(BASE['activity'] * scale, 'activity'),
+        'trades': fills(BASE['trades'] * scale, 'trades'),
+    }
@@ -0,0 +1,154 @@
+"""
+Background collector — polls every active trader and persists to the local store.
+
+    python collector.py                      # run forever, one cycle every COLLECTOR_INTERVAL_SEC
+    python collector.py --once               # single cycle (cron / smoke test)
+    python collector.py --add 0xabc... --alias whale
+
+Runs outside Streamlit, so data keeps flowing with no dashboard open. Set
+USE_LOCAL_STORE=1 for the app to read the store instead of the API.
+"""
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+os.environ.setdefault('DISABLE_WS_LIVE', '1')  # ✅ Collector never opens the UI's WS listener
+
+from utils import db  # noqa: E402
+from utils.activity import poll_new_activity  # noqa: E402
+from utils.closed_trades import sync_closed_trades  # noqa: E402
+from utils.config import DATA_API, COLLECTOR_INTERVAL_SEC, COLLECTOR_CLOSED_EVERY  # noqa: E402
+from utils.http_client import set_host_concurrency  # noqa: E402
+from utils.positions import POSITION_FIELDS  # noqa: E402
+from utils.stream import stream_json  # noqa: E402
+
+ACTIVITY_LIMIT = 100
+
+
+class Collector:
+    def __init__(self, concurrency: int = 16, db_path: str = db.DB_PATH):
+        self.db_path = db_path
+        self.concurrency = concurrency
+        self.host = urlsplit(DATA_API).hostname or ''
+        self.cycle = 0
+        # ✅ Per-host cap enforced on the loop AND in the shared client's pool
+        set_host_concurrency(self.host, concurrency)
+        self._sem = asyncio.Semaphore(concurrency)
+        self._pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='collector')
+
+    async def _run(self, fn, *args):
+        async with self._sem:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, fn, *args)
+
+    async def poll_trader(self, trader: str, with_closed: bool) -> dict:
+        calls = [
+            # ✅ Only items past the persisted high-water mark; pages back on bursts
+            self._run(lambda: poll_new_activity(trader, ACTIVITY_LIMIT, persist=True, path=self.db_path)),
+            self._run(lambda: stream_json(f"{DATA_API}/positions", params={'user': trader, 'sizeThreshold': 0},
+                                          fields=POSITION_FIELDS)),
+        ]
+        if with_closed:
+            # ✅ Checkpointed backfill, then head-only pages — never the same 1000 rows again
+            calls.append(self._run(lambda: sync_closed_trades(trader, path=self.db_path)))
+        results = await asyncio.gather(*calls)
+
+        activity, positions = results[0], results[1]
+        closed = results[2] if with_closed else None
+        counts = {'trades': 0, 'positions': 0, 'settled': 0}
+        if activity:
+            counts['trades'] = db.insert_trades(trader, activity, path=self.db_path)
+        if positions is not None:
+            counts['positions'] = db.insert_position_snapshot(
+                trader, positions.items, int(time.time()), path=self.db_path
+            )
+        if closed:
+            counts['settled'] = closed['added']
+        return counts
+
+    async def run_cycle(self) -> dict:
+        traders = db.get_active_traders(path=self.db_path)
+        with_closed = self.cycle % COLLECTOR_CLOSED_EVERY == 0
+        self.cycle += 1
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(self.poll_trader(t, with_closed) for t in traders), return_exceptions=True
+        )
+        elapsed = time.perf_counter() - start
+
+        totals = {'trades': 0, 'positions': 0, 'settled': 0, 'errors': 0}
+        for res in results:
+            if isinstance(res, Exception):
+                totals['errors'] += 1
+                print(f"⚠️ collector poll error: {res}")
+                continue
+            for key, val in res.items():
+                totals[key] += val
+        db.set_meta('collector_heartbeat', time.time(), path=self.db_path)
+        print(
+            f"📥 cycle {self.cycle}: {len(traders)} traders in {elapsed:.2f}s | "
+            f"+{totals['trades']} trades | {totals['positions']} positions | "
+            f"+{totals['settled']} settled | {totals['errors']} errors"
+        )
+        return {**totals, 'traders': len(traders), 'elapsed': elapsed}
+
+    async def run_forever(self, interval: float = COLLECTOR_INTERVAL_SEC):
+        while True:
+            started = time.monotonic()
+            try:
+                await self.run_cycle()
+            except Exception as e:
+                print(f"❌ collector cycle error: {e}")
+            # ✅ Fixed cadence — a slow cycle eats into the sleep, not the next cycle
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _main(args):
+    collector = Collector(concurrency=args.concurrency)
+    try:
+        if args.once:
+            await collector.run_cycle()
+        else:
+            await collector.run_forever(args.interval)
+    finally:
+        collector.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Polymarket multi-trader collector")
+    parser.add_argument('--interval', type=float, default=COLLECTOR_INTERVAL_SEC)
+    parser.add_argument('--concurrency', type=int, default=16, help="max in-flight requests per host")
+    parser.add_argument('--once', action='store_true', help="run a single cycle and exit")
+    parser.add_argument('--add', metavar='ADDRESS', help="add/reactivate a watched trader and exit")
+    parser.add_argument('--alias', help="alias for --add")
+    parser.add_argument('--backfill', action='store_true',
+                        help="page every trader's full closed-trade history (resumable) and exit")
+    args = parser.parse_args()
+
+    if args.backfill:
+        for trader in db.get_active_traders():
+            res = sync_closed_trades(trader, max_pages=None)
+            print(f"📚 {trader[:10]}… {res['pages']} pages, +{res['added']} settled, done={res['done']}")
+        return
+
+    if args.add:
+        db.add_trader(args.add, args.alias)
+        print(f"👤 Watching {args.add.lower()} ({len(db.get_active_traders())} active traders)")
+        return
+
+    print(f"🚀 Collector starting — {len(db.get_active_traders())} traders, every {args.interval}s")
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        print("👋 Collector stopped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+import streamlit as st
+import pandas as pd
+from utils.capture import capture_stats
+from utils.metrics import snapshot, start_metrics_server
+
+
+def show_diagnostics():
+    """Sidebar panel — where a slow rerun spends its time (upstream calls vs cache misses)."""
+    port = start_metrics_server()
+    rows = snapshot()
+    with st.sidebar.expander("🩺 Diagnostics", expanded=False):
+        if not rows:
+            st.caption("No calls recorded yet")
+        else:
+            df = pd.DataFrame(rows)
+            df['hit_ratio'] = df['hit_ratio'].map(lambda r: '-' if pd.isna(r) else f"{r:.0%}")
+            df['kb'] = df.pop('bytes') / 1024
+            st.dataframe(
+                df[['name', 'calls', 'hit_ratio', 'p50', 'p90', 'p99', 'errors', 'kb']],
+                hide_index=True,
+                column_config={
+                    'name':      st.column_config.TextColumn(width="medium"),
+                    'hit_ratio': st.column_config.TextColumn("hit %"),
+                    'p50':       st.column_config.NumberColumn("p50 ms", format="%.1f"),
+                    'p90':       st.column_config.NumberColumn("p90 ms", format="%.1f"),
+                    'p99':       st.column_config.NumberColumn("p99 ms", format="%.1f"),
+                    'kb':        st.column_config.NumberColumn("KB", format="%.0f"),
+                },
+            )
+        if port:
+            st.caption(f"📈 Prometheus: `http://127.0.0.1:{port}/metrics`")
+        cap = capture_stats()
+        if cap['mode'] == 'capture':
+            st.caption(f"⏺️ Capturing to `{cap['dir']}` — {cap['records']:,} records, "
+                       f"{cap['segments']} segments, {cap['dropped']} dropped")
+        elif cap['mode'] == 'replay':
+            speed = f"{cap['speed']:g}x" if cap['speed'] else 'max'
+            st.caption(f"⏯️ Replay at {speed} — t+{cap['clock']:.0f}s | "
+                       f"{cap['served']:,} served, {cap['misses']} misses")
@@ -1,13 +1,17 @@
 import streamlit as st
 import time
 import pandas as pd
-from utils.config import TRADER
+from utils.config import TRADER, UI_PUSH_REFRESH_SEC
 from utils.api import get_open_positions, get_closed_trades_pnl
 from utils.simulator import run_position_simulator, track_simulation_pnl, \
     calculate_simulated_realized, tag_realized_rows, check_drawdown, \
     filter_baseline_positions, calc_safe_ratio
 from utils.websocket import get_recent_trader_trades
-from utils.copy_trader import get_latest_trader_activity, detect_new_trades, build_copy_signal
+from utils.copy_trader import detect_new_trades, build_copy_signal
+from utils.activity import ensure_activity_pump
+from utils.events import bus, TOPIC_TRADER
+from utils import latency
+from utils.latency import latency_report
 from utils.filters import filter_5m_markets
 
 recent_trades = get_recent_trader_trades(300)
@@ -35,10 +39,14 @@ def estimate_required_capital(pos_df: pd.DataFrame, copy_ratio: float) -> dict:
         'valid':           True
     }
 
+@st.fragment(run_every=UI_PUSH_REFRESH_SEC)
 def show_copy_signals(copy_ratio: float, bankroll: float, include_5m: bool = False):
-    """Live copy signal feed — shows new trader buys as actionable cards"""
-    raw_trades = get_latest_trader_activity(TRADER, limit=10)
-    new_trades = detect_new_trades(raw_trades)
+    """Live copy signal feed — new trader buys arrive over the event bus as actionable cards"""
+    ensure_activity_pump(TRADER)
+    if 'signal_feed' not in st.session_state:
+        st.session_state.signal_feed = bus.subscribe(TOPIC_TRADER)
+    pushed = [e for e in st.session_state.signal_feed.drain() if e.get('side') == 'BUY']
+    new_trades = detect_new_trades(pushed)
 
     if 'copy_queue' not in st.session_state:
         st.session_state.copy_queue = []
@@ -49,6 +57,7 @@ def show_copy_signals(copy_ratio: float, bankroll: float, include_5m: bool = Fal
             st.session_state.copy_queue.insert(0, signal)
 
     st.session_state.copy_queue = st.session_state.copy_queue[:20]
+    show_signal_latency()
 
     if not st.session_state.copy_queue:
         st.info("👂 Listening for new trades...")
@@ -70,6 +79,9 @@ def show_copy_signals(copy_ratio: float, bankroll: float, include_5m: bool = Fal
                 freshness = "🔴 NEW" if is_fresh else f"⏱️ {age_sec}s ago"
                 label = "~~" if is_copied else ""
                 st.markdown(f"**{freshness}** {sig['updown']} {label}`{sig['market'][:60]}`{label}")
+                if sig.get('filled_at'):
+                    st.caption(f"⏱️ {sig['detected_at'] - sig['filled_at']:.1f}s behind the trader's fill "
+                               f"({sig.get('source', 'rest')})")
             with col2:
                 st.metric("Your Shares", sig['your_shares'])
             with col3:
@@ -79,7 +91,11 @@ def show_copy_signals(copy_ratio: float, bankroll: float, include_5m: bool = Fal
                     st.success("✅ Done")
                 elif st.button("✅ Copied", key=f"copied_{sig['tx_hash']}"):
                     st.session_state.copy_queue[full_i]['status'] = 'COPIED'
-                    st.rerun()
+                    st.rerun(scope="fragment")
+
+        if sig.get('rendered_at') is None:  # ✅ First time on screen closes the fill → render span
+            sig['rendered_at'] = time.time()
+            latency.record(sig.get('source', 'rest'), 'rendered', sig.get('filled_at'), sig['rendered_at'])
 
     with st.expander(f"⚡ Signals ({len(st.session_state.copy_queue)})", expanded=True):
         if fresh:
@@ -95,6 +111,22 @@ def show_copy_signals(copy_ratio: float, bankroll: float, include_5m: bool = Fal
                     render_signal_card(sig)
 
 
+def show_signal_latency():
+    """Fill → received / signal / rendered percentiles per source, beside the signal feed"""
+    rows = latency_report()
+    with st.expander("⏱️ Signal latency (from trader fill)", expanded=False):
+        if not rows:
+            st.caption("No fills observed yet")
+            return
+        st.dataframe(
+            pd.DataFrame(rows)[['source', 'stage', 'p50', 'p90', 'p99', 'max', 'count']],
+            hide_index=True,
+            column_config={q: st.column_config.NumberColumn(f"{q} ms", format="%.0f")
+                           for q in ('p50', 'p90', 'p99', 'max')},
+        )
+        st.caption("REST fill times have 1 s resolution; 'rendered' is when the card is sent to the browser.")
+
+
 # SLIPPAGE NOT WORKING FLESHED OUT YET, YOU ONLY SEE A THEORETICAL SLIPPAGE NUMBER.
 def render_real_bankroll_simulator(initial_bankroll: float, copy_ratio: float, slippage_pct: float = 1.0, include_5m: bool = False):
     pos_df = get_open_positions(TRADER)
@@ -158,7 +190,10 @@ def render_real_bankroll_simulator(initial_bankroll: float, copy_ratio: float, s
     sim_df = tag_realized_rows(sim_df)
     sim_df['Avg Price'] = pd.to_numeric(sim_df['AvgPrice'], errors='coerce').round(4)
     sim_df['Cur Price'] = pd.to_numeric(sim_df['CurPrice'], errors='coerce').round(4)
-    expired_mask = sim_df['Status'].str.contains('expired', case=False, na=False)
+    if 'active' in sim_df.columns:
+        expired_mask = ~sim_df['active'].astype(bool)
+    else:
+        expired_mask = sim_df['Status'].str.contains('expired', case=False, na=False)
     sim_df['Slip %'] = sim_df.apply(
         lambda row: round(((row['Cur Price'] - row['Avg Price']) / row['Avg Price']) * 100, 2),
         axis=1
@@ -212,7 +247,7 @@ def render_real_bankroll_simulator(initial_bankroll: float, copy_ratio: float, s
                 )
                 for key in ['sim_start_time', 'sim_pnl_history', 'overexposure_decision',
                             'initial_bankroll', 'allocation_pct', 'drawdown_decision',
-                            'seen_tx_hashes', 'baseline_position_keys']:
+                            'tx_watermark', 'baseline_position_keys']:
                     st.session_state.pop(key, None)
                 st.rerun()
             return
@@ -304,7 +339,7 @@ def render_real_bankroll_simulator(initial_bankroll: float, copy_ratio: float, s
                 )
                 for key in ['sim_start_time', 'sim_pnl_history', 'drawdown_decision',
                             'overexposure_decision', 'initial_bankroll', 'allocation_pct',
-                            'seen_tx_hashes', 'baseline_position_keys']:
+                            'tx_watermark', 'baseline_position_keys']:
                     st.session_state.pop(key, None)
                 st.rerun()
             return
@@ -609,7 +644,7 @@ def show_simulator():
                 )
                 for key in ['sim_start_time', 'sim_pnl_history', 'drawdown_decision',
                             'overexposure_decision', 'initial_bankroll', 'allocation_pct',
-                            'seen_tx_hashes', 'baseline_position_keys']:  # ✅ pnl_baseline & realized_baseline removed from this list
+                            'tx_watermark', 'baseline_position_keys']:  # ✅ pnl_baseline & realized_baseline removed from this list
                     st.session_state.pop(key, None)
                 st.rerun()
 
@@ -1,8 +1,20 @@
 import streamlit as st
 from utils.api import track_0x8dxd
+from utils.activity import ensure_activity_pump
+from utils.config import TRADER, UI_PUSH_REFRESH_SEC
+from utils.events import bus, TOPIC_TRADER, TOPIC_LIVE
+from utils.trades import merge_pushed_trades
+
+
+def _feed(key: str, topic: str):
+    """This session's bus subscription (dropped with the session)."""
+    if key not in st.session_state:
+        st.session_state[key] = bus.subscribe(topic)
+    return st.session_state[key]
 
 
 def show_trades(minutes_back: int, include_5m: bool = False):
+    ensure_activity_pump(TRADER)
     df = track_0x8dxd(minutes_back, include_5m=include_5m)
 
     rest_count = len(df)
@@ -13,6 +25,29 @@ def show_trades(minutes_back: int, include_5m: bool = False):
     except Exception:
         st.sidebar.info(f"📊 {rest_count} tracked trades")
 
+    show_trades_table(minutes_back, include_5m)
+
+
+@st.fragment(run_every=UI_PUSH_REFRESH_SEC)
+def show_trades_table(minutes_back: int, include_5m: bool = False):
+    """
+    Re-renders on its own when the bus delivers a new fill — no full-script rerun.
+    A REST fill arrives within ACTIVITY_PUMP_SEC (the poll interval), a store fill
+    within the collector's cycle; the fragment adds at most UI_PUSH_REFRESH_SEC.
+    """
+    pushed = st.session_state.get('pushed_fills', []) + _feed('trades_feed', TOPIC_TRADER).drain()
+    df = track_0x8dxd(minutes_back, include_5m=include_5m)
+    # ✅ Pushed fills merge into this session's view — the shared caches stay warm for everyone
+    df, st.session_state.pushed_fills = merge_pushed_trades(df, pushed, minutes_back, include_5m)
+
+    live = _feed('live_tape_feed', TOPIC_LIVE).drain()
+    if live:
+        st.session_state.last_live_trade = live[-1]
+    last = st.session_state.get('last_live_trade')
+    if last:
+        st.caption(f"⚡ Last live WS trade: `{str(last.get('title') or last.get('asset'))[:60]}` "
+                   f"@ {float(last.get('price') or 0):.2f}")
+
     if df.empty:
         st.info("No crypto trades found")
         return
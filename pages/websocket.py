@@ -2,7 +2,10 @@ import streamlit as st
 import threading
 import time
 import utils.config as config  # ✅ Module reference, not value import
-from utils.websocket import rtds_listener, get_live_trades_count, get_recent_trader_trades, live_trades
+from utils.websocket import (
+    rtds_listener, get_live_trades_count, get_recent_trader_trades, live_trades, resolver_stats,
+    subscription_coverage, stop_live_ws, decode_stats,
+)
 
 
 @st.cache_resource
@@ -45,6 +48,7 @@ def show_websocket_status():
             if st.button("⛔ Stop", key="disable_ws_global"):
                 # ✅ Mutate the module attribute — affects all importers
                 config.DISABLE_WS_LIVE = True
+                stop_live_ws()  # ✅ Cancels every connection on the engine loop
                 live_trades.clear()
                 st.success("⛔ WS disabled")
                 st.rerun()
@@ -55,6 +59,22 @@ def show_websocket_status():
                 st.metric("Buffer", count)
             with c2:
                 st.metric("5m trades", recent)
+            cov = subscription_coverage()
+            st.caption(
+                f"📡 {cov['subscribed']}/{cov['desired']} assets on {cov['connected']}/{cov['shards']} conns"
+                + (f" | ⚠️ {cov['uncovered']} uncovered" if cov['uncovered'] else "")
+            )
+            rs = resolver_stats()
+            st.caption(
+                f"🏷️ titles: {rs['queue_depth']} queued | {rs['in_flight']} in flight | "
+                f"{rs['coalesced']} shared | {rs['dropped']} dropped | "
+                f"avg {rs['latency_ms_avg']:.0f} ms (max {rs['latency_ms_max']:.0f})"
+            )
+            ds = decode_stats()
+            st.caption(
+                f"⚡ {ds['frames_per_sec']:.0f} frames/s | {ds['decode_us_avg']:.1f} µs/frame | "
+                f"{ds['skip_ratio']:.0%} skipped unparsed ({ds['backend']})"
+            )
             if has_streaming:
                 st.success("✅ Streaming!")
             else:
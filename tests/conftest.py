@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Headless: no live WS listener, no metrics port; set before utils is imported
+os.environ.setdefault('DISABLE_WS_LIVE', '1')
+os.environ.setdefault('METRICS_PORT', '0')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
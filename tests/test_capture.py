@@ -0,0 +1,21 @@
+import gzip
+import json
+
+from utils import capture
+
+
+def segment(path, times, torn=False):
+    data = ''.join(json.dumps({'t': t, 'kind': 'ws', 'frame': str(t)}) + '\n' for t in times)
+    if torn:
+        data += '{"t": 99, "kind'
+    with gzip.open(path, 'wt', encoding='utf-8') as fh:
+        fh.write(data)
+
+
+def test_segments_from_several_writers_merge_in_time_order(tmp_path):
+    segment(tmp_path / 'seg-20260101T000000Z-1-0001.jsonl.gz', [1, 4, 7])
+    segment(tmp_path / 'seg-20260101T000000Z-2-0001.jsonl.gz', [2, 3, 8], torn=True)
+    segment(tmp_path / 'seg-20260101T000001Z-1-0002.jsonl.gz', [9, 10])
+
+    rows = capture.read_segments(str(tmp_path))
+    assert [r['t'] for r in rows] == [1, 2, 3, 4, 7, 8, 9, 10]
@@ -0,0 +1,85 @@
+import pytest
+
+from utils import closed_trades, db
+from utils.stream import Streamed, project
+
+TRADER = '0x' + 'ab' * 20
+
+
+class FakeTrades:
+    """/trades for one trader, newest first, paged by offset/limit like the data API."""
+
+    def __init__(self):
+        self.rows = []
+        self.calls = 0
+
+    def add(self, n, start_ts, step=1, status='settled', pnl=1.0, market='0xc1'):
+        new = [{
+            'transactionHash': f"0x{start_ts + i * step:064x}", 'timestamp': start_ts + i * step,
+            'conditionId': market,
+            'title': 'Bitcoin Up or Down - March 3, 6PM ET', 'outcome': 'Up', 'asset': 'a1',
+            'size': 10.0, 'price': 0.5, 'pnl': pnl, 'status': status,
+        } for i in range(n)]
+        self.rows = sorted(self.rows + new, key=lambda r: -r['timestamp'])
+
+    def __call__(self, url, params=None, keep=None, fields=None, **kwargs):
+        self.calls += 1
+        rows = self.rows
+        if params.get('market'):
+            rows = [r for r in rows if r['conditionId'] in params['market'].split(',')]
+        rows = rows[params['offset']:params['offset'] + params['limit']]
+        items = [project(r, fields) if fields else r for r in rows if keep is None or keep(r)]
+        return Streamed(items, len(rows))
+
+
+@pytest.fixture
+def api(monkeypatch, tmp_path):
+    fake = FakeTrades()
+    monkeypatch.setattr(closed_trades, 'stream_json', fake)
+    monkeypatch.setattr(closed_trades, 'CLOSED_PAGE_SIZE', 10)
+    monkeypatch.setattr(closed_trades, 'CLOSED_RECHECK_SEC', 0)
+    fake.path = str(tmp_path / 'tracker.db')
+    return fake
+
+
+def settled_count(path):
+    return db.get_conn(path).execute("SELECT COUNT(*) FROM settled_trades").fetchone()[0]
+
+
+def test_incremental_cut_short_resumes_without_moving_floor(api):
+    api.add(25, start_ts=1_000_000, step=3600)
+    closed_trades.sync_closed_trades(TRADER, max_pages=None, path=api.path)
+    head = db.get_meta(f"closed_sync:{TRADER}", path=api.path)['head_ts']
+    assert settled_count(api.path) == 25
+
+    # 35 new trades — 4 pages of 10 to reach synced history
+    api.add(35, start_ts=2_000_000)
+    closed_trades.sync_closed_trades(TRADER, max_pages=2, path=api.path)
+    state = db.get_meta(f"closed_sync:{TRADER}", path=api.path)
+    assert state['head_ts'] == head  # budget ran out before the floor — must not advance
+    assert state['offset'] == 20
+
+    closed_trades.sync_closed_trades(TRADER, max_pages=2, path=api.path)
+    state = db.get_meta(f"closed_sync:{TRADER}", path=api.path)
+    assert settled_count(api.path) == 60
+    assert state['head_ts'] == 2_000_034
+    assert state['offset'] == 0
+
+
+def test_fill_settling_long_after_the_head_moved_is_counted(api):
+    api.add(5, start_ts=1_000_000)
+    api.add(1, start_ts=1_000_100, status='open', pnl=None, market='0xlate')
+    closed_trades.sync_closed_trades(TRADER, max_pages=None, path=api.path)
+    assert db.get_unsettled(TRADER, path=api.path) == ['0xlate']
+
+    # A day of newer trades — the head sync never reads back that far again
+    api.add(30, start_ts=1_086_400, step=60)
+    closed_trades.sync_closed_trades(TRADER, path=api.path)
+    assert settled_count(api.path) == 35
+
+    for row in api.rows:
+        if row['conditionId'] == '0xlate':
+            row.update(status='settled', pnl=-4.0)
+    closed_trades.sync_closed_trades(TRADER, path=api.path)
+    assert settled_count(api.path) == 36
+    assert db.get_unsettled(TRADER, path=api.path) == []
@@ -0,0 +1,70 @@
+import asyncio
+import random
+import threading
+import time
+
+import pytest
+
+import collector
+from benchmarks.stub_api import run_fills, serve
+from benchmarks.synthetic import generate, make_fill, traders
+from utils import activity, closed_trades, db
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    server = serve(generate(scale=1))
+    for module in (collector, activity, closed_trades):
+        monkeypatch.setattr(module, 'DATA_API', server.url)
+    monkeypatch.setattr(activity, '_cursors', {})  # process-wide high-water marks
+    yield server.stub_data()
+    server.shutdown()
+
+
+def stored(path, trader):
+    rows = db.get_conn(path).execute(
+        "SELECT tx_hash FROM trades WHERE trader_address = ?", (trader,)).fetchall()
+    return [r[0] for r in rows]
+
+
+def test_collector_stores_every_stub_fill_exactly_once(stub, tmp_path):
+    path = str(tmp_path / 'tracker.db')
+    watched = traders(3, seed=11)
+    for trader in watched:
+        db.add_trader(trader, path=path)
+    rnd, now = random.Random(3), int(time.time())
+
+    async def cycles():
+        c = collector.Collector(concurrency=4, db_path=path)  # its semaphore binds to this loop
+        try:
+            added = (await c.run_cycle())['trades']  # baseline page
+
+            # A burst bigger than one /activity page, all in one second, landing between cycles...
+            for i in range(450):
+                trader = watched[i % 3]
+                stub.add_fill(trader, make_fill(rnd, rnd.choice(stub.markets), trader, now))
+            added += (await c.run_cycle())['trades']
+
+            # ...then fills arriving while cycles page through /activity
+            stop = threading.Event()
+            filler = threading.Thread(target=run_fills, args=(stub, watched, 300, stop), daemon=True)
+            filler.start()
+            for _ in range(5):
+                added += (await c.run_cycle())['trades']
+            stop.set()
+            filler.join()
+            return added + (await c.run_cycle())['trades']
+        finally:
+            c.close()
+
+    added = asyncio.run(cycles())
+
+    base = {a['transactionHash'].lower() for a in stub.activity}
+    for trader in watched:
+        generated = base | {f['transactionHash'].lower() for f in stub._live[trader]}
+        rows = stored(path, trader)
+        assert len(rows) == len(set(rows))
+        assert set(rows) == generated
+    # Nothing was reported as new twice (the store's default trader is polled too)
+    assert added == db.get_conn(path).execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+    assert stub.stats['fills'] > 450
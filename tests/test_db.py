@@ -0,0 +1,99 @@
+import sqlite3
+
+from utils import db
+
+TRADER = '0x' + 'cd' * 20
+
+
+def fill(tx, outcome='Up', size=10.0, price=0.5, pnl=2.0):
+    return {'transactionHash': tx, 'timestamp': 1_700_000_000, 'conditionId': '0xc1', 'outcome': outcome,
+            'title': 'Bitcoin Up or Down - March 3, 6PM ET', 'size': size, 'price': price, 'pnl': pnl}
+
+
+def test_one_tx_filling_several_rows_keeps_each_row(tmp_path):
+    path = str(tmp_path / 'tracker.db')
+    rows = [fill('0xaa', 'Up'), fill('0xaa', 'Down'), fill('0xaa', 'Up', size=4.0, price=0.6)]
+    assert db.insert_settled_trades(TRADER, rows, path=path) == 3
+    assert db.insert_settled_trades(TRADER, rows, path=path) == 0  # re-read of the same page
+    assert db.get_settled_pnl(TRADER, path=path) == {'total': 6.0, 'crypto_count': 3}
+
+
+def test_old_store_is_migrated_to_the_per_fill_key(tmp_path):
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE settled_trades (
+            id INTEGER PRIMARY KEY, trader_address TEXT NOT NULL, tx_hash TEXT NOT NULL, timestamp INTEGER,
+            condition_id TEXT, title TEXT, outcome TEXT, size REAL, price REAL, pnl REAL,
+            is_crypto INTEGER NOT NULL DEFAULT 0,
+            UNIQUE (trader_address, tx_hash)
+        );
+        CREATE INDEX idx_settled_trader_ts ON settled_trades (trader_address, timestamp);
+        CREATE TABLE settled_pnl (trader_address TEXT PRIMARY KEY, total REAL NOT NULL DEFAULT 0,
+            crypto_count INTEGER NOT NULL DEFAULT 0, settled_count INTEGER NOT NULL DEFAULT 0);
+    """)
+    conn.execute("INSERT INTO settled_trades (trader_address, tx_hash, timestamp, condition_id, title, outcome, "
+                 "size, price, pnl, is_crypto) VALUES (?, '0xaa', 1700000000, '0xc1', 't', 'Up', 10.0, 0.5, 2.0, 1)",
+                 (TRADER,))
+    conn.execute("INSERT INTO settled_pnl VALUES (?, 2.0, 1, 1)", (TRADER,))
+    conn.commit()
+    conn.close()
+
+    assert db.get_settled_pnl(TRADER, path=path) == {'total': 2.0, 'crypto_count': 1}
+    # The row already stored is recognised; the tx's second fill is now kept
+    assert db.insert_settled_trades(TRADER, [fill('0xaa', 'Up'), fill('0xaa', 'Down')], path=path) == 1
+    assert db.get_settled_pnl(TRADER, path=path) == {'total': 4.0, 'crypto_count': 2}
+
+
+def activity(tx, ts, size=1.0):
+    return {'transactionHash': tx, 'timestamp': ts, 'type': 'TRADE', 'side': 'BUY', 'conditionId': '0xc1',
+            'asset': 'a1', 'title': 'Bitcoin Up or Down - March 3, 6PM ET', 'outcome': 'Up',
+            'size': size, 'price': 0.5, 'usdcSize': size / 2}
+
+
+def test_insert_trades_skips_repeats_within_and_across_batches(tmp_path):
+    path = str(tmp_path / 'tracker.db')
+    batch = [activity('0xAA', 100), activity('0xbb', 100), activity('0xaa', 100, size=9.0), activity('', 101)]
+    assert db.insert_trades(TRADER, batch, path=path) == 2  # case-folded repeat and the hashless row dropped
+    assert db.insert_trades(TRADER, [activity('0xbb', 105), activity('0xcc', 100)], path=path) == 1
+    assert db.insert_trades('0x' + 'ef' * 20, [activity('0xaa', 100)], path=path) == 1  # per trader
+    rows = db.get_trades_since(TRADER, 0, path=path)
+    assert sorted(r['transactionHash'] for r in rows) == ['0xaa', '0xbb', '0xcc']
+    assert next(r for r in rows if r['transactionHash'] == '0xaa')['size'] == 1.0  # first write wins
+
+
+def test_window_query_bounds_order_and_shape(tmp_path):
+    path = str(tmp_path / 'tracker.db')
+    db.insert_trades(TRADER, [activity(f"0x{ts:x}", ts) for ts in (99, 100, 150, 200)], path=path)
+    db.insert_trades('0x' + 'ef' * 20, [activity('0xother', 150)], path=path)
+
+    rows = db.get_trades_since(TRADER.upper(), 100, path=path)
+    assert [r['timestamp'] for r in rows] == [200, 150, 100]  # since is inclusive, newest first
+    assert db.get_trades_since(TRADER, 201, path=path) == []
+    assert [r['timestamp'] for r in db.get_trades_since(TRADER, 0, limit=2, path=path)] == [200, 150]
+    assert rows[0] == {**activity('0xc8', 200), 'slug': None, 'proxyWallet': TRADER}
+
+
+def test_old_rowid_trades_table_is_rebuilt_clustered(tmp_path):
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE trades (
+            id INTEGER PRIMARY KEY, trader_address TEXT NOT NULL, tx_hash TEXT NOT NULL,
+            timestamp INTEGER NOT NULL, type TEXT, side TEXT, condition_id TEXT, asset TEXT, slug TEXT,
+            title TEXT, outcome TEXT, size REAL, price REAL, usdc_size REAL,
+            UNIQUE (trader_address, tx_hash)
+        );
+        CREATE INDEX idx_trades_trader_ts ON trades (trader_address, timestamp);
+    """)
+    conn.execute("INSERT INTO trades (trader_address, tx_hash, timestamp, type) VALUES (?, '0xaa', 100, 'TRADE')",
+                 (TRADER,))
+    conn.commit()
+    conn.close()
+
+    assert [r['transactionHash'] for r in db.get_trades_since(TRADER, 0, path=path)] == ['0xaa']
+    assert db.insert_trades(TRADER, [activity('0xaa', 100), activity('0xbb', 101)], path=path) == 1
+    plan = db.get_conn(path).execute(
+        "EXPLAIN QUERY PLAN SELECT tx_hash FROM trades WHERE trader_address = ? AND timestamp >= ?",
+        (TRADER, 0)).fetchall()
+    assert 'PRIMARY KEY' in plan[0]['detail']
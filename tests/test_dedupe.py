@@ -0,0 +1,71 @@
+import tracemalloc
+
+from utils import dedupe
+from utils.dedupe import TxWindow
+
+
+def trade(i, ts):
+    return {'transactionHash': f"0x{i:064x}", 'timestamp': ts}
+
+
+def test_repoll_after_ttl_does_not_resignal(monkeypatch):
+    window = TxWindow(ttl_sec=60, max_items=1000)
+    monkeypatch.setattr(dedupe, 'tx_window', lambda trader: window)
+    page = [trade(1, 1_000), trade(2, 1_001)]
+
+    fresh, wm = dedupe.new_since('0xabc', page, 0)
+    assert len(fresh) == 2
+    window.observe([], now=10**10)  # everything expires
+    assert len(window) == 0
+
+    fresh, wm = dedupe.new_since('0xabc', page + [trade(3, 2_000)], wm)
+    assert [t['transactionHash'] for t in fresh] == [trade(3, 0)['transactionHash']]
+
+
+def test_cap_eviction_does_not_resignal():
+    window = TxWindow(ttl_sec=10**9, max_items=10)
+    txs = [f"0x{i:064x}" for i in range(50)]
+    first = window.observe(txs, now=0, trade_ts=range(50))
+    again = window.observe(txs[:40], now=1, trade_ts=range(40))
+    assert again == [0] * 40  # evicted by the cap — behind the horizon, not renumbered
+    assert max(first) == 50
+
+
+def test_distinct_hashes_never_share_a_sequence():
+    window = TxWindow()
+    seqs = window.observe([f"0x{i:064x}" for i in range(10_000)], now=0)
+    assert len(set(seqs)) == 10_000
+
+
+def test_never_seen_fill_behind_the_horizon_is_suppressed():
+    # The documented trade-off of a fixed-size window: a fill is "behind the horizon" once anything
+    # with a newer trade time was evicted, and it's treated as already seen even if it never was
+    window = TxWindow(ttl_sec=10**9, max_items=2)
+    window.observe(["0x01", "0x02", "0x03"], now=0, trade_ts=[100, 200, 300])
+    assert window.horizon_ts == 100
+    assert window.observe(["0x99", "0x98"], now=1, trade_ts=[100, 101]) == [0, 4]
+
+
+def test_memory_is_flat_across_growing_stream_sizes():
+    window = TxWindow(ttl_sec=3600, max_items=20_000)
+    fed = 0
+
+    def feed(n):
+        nonlocal fed
+        for b in range(fed, fed + n, 1000):
+            window.observe((f"0x{i:064x}" for i in range(b, b + 1000)), now=b / 1000,
+                           trade_ts=range(b, b + 1000))
+        fed += n
+
+    tracemalloc.start()
+    try:
+        feed(40_000)
+        full, _ = tracemalloc.get_traced_memory()
+        samples = []
+        for total in (80_000, 160_000, 320_000):  # 4x, 8x, 16x the window's cap
+            feed(total - fed)
+            samples.append(tracemalloc.get_traced_memory()[0])
+    finally:
+        tracemalloc.stop()
+    assert len(window) == 20_000
+    assert all(s < full * 1.1 for s in samples), (full, samples)
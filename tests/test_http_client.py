@@ -0,0 +1,43 @@
+import threading
+
+from utils import http_client
+
+
+def test_stats_survive_a_concurrent_host_reset_and_count_every_request(monkeypatch):
+    host = 'stats.invalid'
+    monkeypatch.setitem(http_client.HTTP_MAX_CONCURRENCY, host, 64)
+
+    class Ok:
+        status_code = 200
+
+    errors = []
+
+    def hammer():
+        try:
+            session, sem, stats = http_client._host_state(host)
+            monkeypatch.setattr(session, 'get', lambda *a, **k: Ok())
+            for _ in range(500):
+                http_client._get_with_retries(session, sem, stats, f"http://{host}/x", None, 1)
+                http_client.connection_stats()
+        except Exception as e:  # noqa: BLE001 — any race surfaces here
+            errors.append(e)
+
+    threads = [threading.Thread(target=hammer) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for _ in range(200):
+        http_client.set_host_concurrency(host, 64)  # drops the host's session + counters
+    for t in threads:
+        t.join()
+    assert errors == []
+
+    http_client.set_host_concurrency(host, 64)
+    session, sem, stats = http_client._host_state(host)
+    monkeypatch.setattr(session, 'get', lambda *a, **k: Ok())
+    workers = [threading.Thread(target=lambda: [http_client._get_with_retries(
+        session, sem, stats, f"http://{host}/x", None, 1) for _ in range(2000)]) for _ in range(8)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    assert http_client.connection_stats()[host]['requests'] == 16_000
@@ -0,0 +1,39 @@
+from utils.live_buffer import LiveBuffer
+
+
+def event(ts, wallet, asset='a1', title='Bitcoin Up or Down'):
+    return {'event_type': 'last_trade_price', 'asset_id': asset, 'size': 1.0, 'price': 0.5,
+            'timestamp': ts, 'title': title, 'proxyWallet': wallet}
+
+
+def test_filtered_reads_match_a_full_scan_across_compactions_and_late_rows():
+    buf = LiveBuffer(maxlen=40)
+    wallets = [f"0x{w:040x}" for w in range(3)]
+    for i in range(200):
+        buf.append(event(i, wallets[i % 3], asset=f"a{i % 4}"))
+    buf.append(event(175.5, wallets[0], asset='a0'))  # late row → rebuild + reindex
+
+    everything = buf.since(150)
+    for wallet in wallets:
+        assert buf.since(150, wallet=wallet) == [e for e in everything if e['proxyWallet'] == wallet]
+    assert buf.since(150, asset='a2') == [e for e in everything if e['asset_id'] == 'a2']
+    assert buf.since(150, wallet='0xunknown') == []
+
+
+def test_strings_no_live_row_uses_are_evicted():
+    buf = LiveBuffer(maxlen=10)
+    for i in range(1_000):
+        buf.append(event(i, f"0x{i:040x}", asset=f"a{i}", title=f"t{i}"))
+    # Bounded by the live rows plus one compaction's worth of slack, not by history
+    assert len(buf._interners['wallet'].values) <= buf._capacity
+    assert [e['proxyWallet'] for e in buf.since(-1)] == [f"0x{i:040x}" for i in range(990, 1_000)]
+    assert buf.since(-1, wallet=f"0x{995:040x}")[0]['title'] == 't995'
+
+
+def test_decode_lookup_is_cached_until_new_strings_arrive():
+    buf = LiveBuffer(maxlen=100)
+    buf.append(event(1, '0xa'))
+    interner = buf._interners['wallet']
+    assert interner.array() is interner.array()
+    buf.append(event(2, '0xb'))
+    assert list(interner.array()) == ['0xa', '0xb', '']
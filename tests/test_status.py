@@ -0,0 +1,47 @@
+from datetime import datetime
+
+import pandas as pd
+
+from utils.config import EST
+from utils.status import _title_expiry, format_display_time, status_labels
+
+
+def et(*args) -> int:
+    return int(EST.localize(datetime(*args)).timestamp())
+
+
+def label(title: str, now_ts: int) -> str:
+    return status_labels(_title_expiry(pd.Series([title]), now_ts)).iloc[0]
+
+
+def test_past_date_seven_months_ago_is_expired():
+    now = et(2026, 10, 18, 9, 5)
+    assert label("Bitcoin Up or Down - March 12, 6:00PM-6:05PM ET", now) == "⚫ EXPIRED"
+
+
+def test_date_just_after_new_year_rolls_forward():
+    # Read in late December: next year's calendar date, not this year's + 365 days
+    now = et(2026, 12, 30, 12, 0)
+    frame = _title_expiry(pd.Series(["Bitcoin Up or Down - January 2, 6:00PM-6:05PM ET"]), now)
+    assert frame['expiry_ts'].iloc[0] == et(2027, 1, 2, 18, 5)
+    assert frame['active'].iloc[0]
+
+
+def test_december_title_read_in_january_belongs_to_last_year():
+    now = et(2027, 1, 2, 12, 0)
+    assert label("Bitcoin Up or Down - December 30, 6:00PM-6:05PM ET", now) == "⚫ EXPIRED"
+
+
+def test_dated_event_shows_its_start_until_it_opens():
+    now = et(2026, 3, 12, 12, 0)
+    assert label("Will BTC hit 100k on March 12 6pm?", now) == "🟢 ACTIVE (til Mar 12 06:00 PM ET)"
+    now = et(2026, 3, 12, 18, 30)
+    assert label("Will BTC hit 100k on March 12 6pm?", now) == "🟢 ACTIVE (til Mar 12 07:00 PM ET)"
+
+
+def test_approximate_label_keeps_the_short_clock_format():
+    assert format_display_time(16.25) == "4:15 PM"
+    assert format_display_time(10 + 35 / 60) == "10:35 AM"
+    assert format_display_time(0) == "12 AM"
+    now = et(2026, 3, 12, 9, 0)
+    assert label("Bitcoin Up or Down - 4:15PM ET", now) == "🟢 ACTIVE (til ~4:15 PM)"
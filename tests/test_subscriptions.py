@@ -0,0 +1,16 @@
+from utils.subscriptions import SubscriptionManager
+
+
+def test_closed_shards_are_pruned_and_ids_never_reused():
+    desired = {f"a{i:03d}" for i in range(30)}
+    spawned = []
+    manager = SubscriptionManager(spawn=spawned.append, desired=lambda: desired, shard_size=10, max_shards=5)
+    for cycle in range(20):
+        desired = {f"a{i:03d}" for i in range(30)} if cycle % 2 == 0 else {"a000"}
+        manager.reconcile()
+        assert all(not s.closed for s in manager.shards)
+        assert len(manager.shards) <= 3
+
+    ids = [s.id for s in spawned]
+    assert len(ids) == len(set(ids))  # every reopened shard got a fresh id
+    assert manager.coverage()['subscribed'] == 1
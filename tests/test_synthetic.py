@@ -0,0 +1,13 @@
+from benchmarks.synthetic import generate
+
+
+def test_positions_point_at_the_leg_they_name():
+    data = generate(scale=3, now=1_760_000_000)
+    markets = {m['conditionId']: m for m in data['markets']}
+    down_legs = 0
+    for p in data['positions']:
+        m = markets[p['conditionId']]
+        assert m['outcomes'][p['outcomeIndex']] == p['outcome']
+        assert m['clobTokenIds'][p['outcomeIndex']] == p['asset']
+        down_legs += p['outcome'] == 'Down' and p['outcomeIndex'] == 1
+    assert down_legs  # 'Down' legs exist and sit at index 1
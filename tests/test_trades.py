@@ -0,0 +1,33 @@
+import time
+
+import pytest
+
+from utils import trades
+
+
+def fill(tx, age_sec, side='BUY'):
+    return {'transactionHash': tx, 'timestamp': int(time.time()) - age_sec, 'type': 'TRADE', 'side': side,
+            'conditionId': '', 'asset': 'a1', 'title': 'Bitcoin Up or Down - March 3, 6PM ET',
+            'outcome': 'Up', 'size': 10.0, 'price': 0.5}
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    monkeypatch.setattr(trades, 'compute_status_frame', lambda frame, now_ts: frame.assign(
+        expiry_ts=float(now_ts), active=True, label_ts=float(now_ts)))
+    monkeypatch.setattr(trades, 'status_labels', lambda status: status['title'].map(lambda _: 'ok'))
+
+
+def test_pushed_fill_is_merged_into_the_cached_table():
+    cached = trades.trades_frame([fill('0xold', 120)], 30, True, int(time.time()))
+    events = [fill('0xOLD', 120), fill('0xnew', 1), fill('0xnew', 1), fill('0xsell', 1, side='SELL'),
+              fill('0xstale', 3600)]
+
+    df, pending = trades.merge_pushed_trades(cached, events, 30, include_5m=True)
+    assert list(df['tx']) == ['0xnew', '0xold']  # newest first, each fill once
+    assert [e['transactionHash'] for e in pending] == ['0xnew']
+
+    # Once the cache has caught up the pending fill is dropped, not shown twice
+    refreshed = trades.trades_frame([fill('0xnew', 1), fill('0xold', 120)], 30, True, int(time.time()))
+    df, pending = trades.merge_pushed_trades(refreshed, pending, 30, include_5m=True)
+    assert list(df['tx']) == ['0xnew', '0xold'] and pending == []
@@ -0,0 +1,21 @@
+import json
+import time
+
+from utils import latency, websocket
+from utils.config import TRADER
+
+
+def frame(**extra):
+    return json.dumps({'event_type': 'last_trade_price', 'asset_id': 'a1', 'price': '0.5', 'size': '10',
+                       'timestamp': str(int(time.time() * 1000)), **extra})
+
+
+def test_only_the_tracked_wallets_trades_count_toward_fill_latency():
+    before = latency.histogram('ws', 'received').summary()['count']
+    for _ in range(5):
+        websocket.process_trade(frame())  # market-wide print, no wallet
+    websocket.process_trade(frame(maker_address='0x' + '12' * 20))
+    assert latency.histogram('ws', 'received').summary()['count'] == before
+
+    websocket.process_trade(frame(proxyWallet=TRADER.upper()))
+    assert latency.histogram('ws', 'received').summary()['count'] == before + 1
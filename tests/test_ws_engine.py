@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from benchmarks.stub_api import serve, serve_ws
+from benchmarks.synthetic import generate
+from utils import ws_engine
+from utils.subscriptions import SubscriptionManager
+
+pytestmark = pytest.mark.skipif(not ws_engine.available(), reason="websockets not installed")
+
+ASSETS = {f"{i:077d}" for i in range(25)}
+
+
+def wait_for(check, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if check():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def live(request):
+    """Stub market channel + a running engine over 3 shards of ASSETS; yields (stub, engine, manager, received)."""
+    rate = getattr(request, 'param', 200)
+    server = serve(generate(scale=1))
+    stub = server.stub_data()
+    url = serve_ws(stub, rate=rate) + '/ws/market'
+    received = []
+    box = {}
+    manager = SubscriptionManager(spawn=lambda shard: box['engine'].spawn(shard),
+                                  desired=lambda: ASSETS, shard_size=10, max_shards=5)
+    engine = box['engine'] = ws_engine.AsyncWSEngine(url, received.append, manager, resync_sec=60)
+    runner = threading.Thread(target=engine.run, daemon=True)
+    runner.start()
+    try:
+        assert wait_for(lambda: stub.ws_assets() == ASSETS and stub.stats['ws_clients'] == 3)
+        yield stub, engine, manager, received
+    finally:
+        engine.stop()
+        runner.join(timeout=5)
+        server.shutdown()
+    assert not runner.is_alive()
+
+
+def test_subscriptions_are_restored_after_the_server_drops_every_connection(live):
+    stub, engine, manager, received = live
+    stub.drop_ws()
+    assert wait_for(lambda: engine.stats()['reconnects'] >= 3)
+    # Every shard re-sent its whole set on reconnect — nothing relies on the 60 s resync
+    assert wait_for(lambda: stub.ws_assets() == ASSETS and stub.stats['ws_clients'] == 3)
+    assert manager.coverage() == {'desired': 25, 'subscribed': 25, 'uncovered': 0, 'shards': 3, 'connected': 3}
+    before = len(received)
+    assert wait_for(lambda: len(received) > before)  # frames flow again
+
+
+def test_failed_heartbeat_drops_the_connection_and_reconnects(live, monkeypatch):
+    stub, engine, manager, received = live
+    failures = []
+
+    async def failing_ping(ws):
+        await asyncio.sleep(0.1)
+        failures.append(ws)
+        raise ConnectionError("ping failed")
+
+    monkeypatch.setattr(engine, '_heartbeat', failing_ping)
+    stub.drop_ws()  # new connections pick up the failing heartbeat
+    assert wait_for(lambda: len(failures) > 3 and engine.stats()['reconnects'] > 3)
+    monkeypatch.undo()
+    assert wait_for(lambda: stub.ws_assets() == ASSETS and stub.stats['ws_clients'] == 3)
+
+
+@pytest.mark.parametrize('live', [3000], indirect=True)
+def test_scaled_down_soak_keeps_up(live):
+    # benchmarks/soak_ws_engine.py runs this at 10k msg/s for 30 s; here a few seconds at 3k
+    stub, engine, manager, received = live
+    start_frames, start_recv = stub.stats['frames'], len(received)
+    time.sleep(3)
+    sent = stub.stats['frames'] - start_frames
+    got = len(received) - start_recv
+    assert sent > 3000
+    assert got >= 0.9 * sent, (got, sent)
+    assert engine.stats()['errors'] == 0
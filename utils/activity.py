@@ -0,0 +1,191 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, List, NamedTuple, Tuple
+
+from .config import DATA_API, ACTIVITY_PUMP_SEC
+from .events import bus, trade_event, TOPIC_TRADER
+from .stream import stream_json
+from . import db, latency
+
+# /activity caps limit at 500; a burst bigger than one page is walked with offset
+PAGE_LIMIT = 500
+MAX_PAGES = 20              # 10k items per poll — past that, resync from the newest page
+BUFFER_SIZE = 1000          # recent items kept per trader for the UI readers
+
+# Fields the trades table, copy trader and store read — icons/bios/profile blobs are dropped
+ACTIVITY_FIELDS = (
+    'transactionHash', 'timestamp', 'type', 'side', 'conditionId', 'asset', 'slug', 'title',
+    'outcome', 'size', 'price', 'usdcSize', 'proxyWallet',
+)
+
+
+class Cursor(NamedTuple):
+    """High-water mark: newest timestamp seen + every tx hash at that timestamp."""
+    ts: int
+    txs: frozenset
+
+
+_cursors: Dict[str, Cursor] = {}
+_recent: Dict[str, deque] = {}
+_trader_locks: Dict[str, threading.Lock] = {}
+_lock = threading.Lock()
+
+
+def _key(item: dict) -> Tuple[int, str] | None:
+    try:
+        ts = int(float(item.get('timestamp')))
+    except (TypeError, ValueError):
+        return None
+    return ts, str(item.get('transactionHash') or '').lower()
+
+
+def _is_seen(key: Tuple[int, str], cursor: Cursor | None) -> bool:
+    if cursor is None:
+        return False
+    ts, tx = key
+    return ts < cursor.ts or (ts == cursor.ts and tx in cursor.txs)
+
+
+def _advance(cursor: Cursor | None, items: List[dict]) -> Cursor | None:
+    keys = [k for k in map(_key, items) if k is not None]
+    if not keys:
+        return cursor
+    top = max(ts for ts, _ in keys)
+    txs = {tx for ts, tx in keys if ts == top}
+    if cursor is not None and cursor.ts == top:
+        txs |= cursor.txs
+    return Cursor(top, frozenset(txs)) if cursor is None or top >= cursor.ts else cursor
+
+
+def fetch_activity_since(trader: str, cursor: Cursor | None, limit: int = PAGE_LIMIT,
+                         max_pages: int = MAX_PAGES) -> List[dict] | None:
+    """
+    Items newer than `cursor`, newest first. Pages backwards until it reaches
+    the cursor, so a burst larger than `limit` isn't dropped. No cursor → one
+    full page (baseline). None on a network failure — the caller keeps its cursor.
+    """
+    if cursor is None:
+        limit = PAGE_LIMIT
+    params = {'user': trader, 'limit': limit, 'sortBy': 'TIMESTAMP', 'sortDirection': 'DESC'}
+    if cursor is not None:
+        params['start'] = cursor.ts  # ✅ Server-side skip of everything older
+
+    new: List[dict] = []
+    taken = set()
+    offset = 0
+    for _ in range(max_pages):
+        page = stream_json(f"{DATA_API}/activity", params={**params, 'offset': offset},
+                           fields=ACTIVITY_FIELDS)
+        if page is None:
+            return None  # ✅ Partial walk is discarded — next poll retries from the same cursor
+
+        reached = False
+        for item in page.items:
+            key = _key(item)
+            if key is None:
+                continue
+            if _is_seen(key, cursor):
+                reached = True
+                continue
+            if key in taken:  # page boundaries shift when trades land mid-walk
+                continue
+            taken.add(key)
+            new.append(item)
+
+        if cursor is None or reached or page.seen < limit:
+            break
+        offset += limit
+    else:
+        print(f"⚠️ activity backlog > {max_pages * limit} items for {trader[:10]}… — resyncing from newest")
+
+    new.sort(key=lambda it: _key(it)[0], reverse=True)
+    return new
+
+
+def _trader_lock(trader: str) -> threading.Lock:
+    with _lock:
+        return _trader_locks.setdefault(trader, threading.Lock())
+
+
+def poll_new_activity(trader: str, limit: int = 100, persist: bool = False,
+                      path: str = db.DB_PATH) -> List[dict]:
+    """
+    Fetch only activity newer than this trader's high-water mark and advance it.
+    persist=True keeps the cursor in the store's meta table (collector restarts
+    resume where they left off); otherwise it lives for the process.
+    """
+    trader = trader.lower()
+    meta_key = f"activity_cursor:{trader}"
+
+    with _trader_lock(trader):  # ✅ One poll per trader at a time — no double-counted items
+        cursor = _cursors.get(trader)
+        if cursor is None and persist:
+            saved = db.get_meta(meta_key, path=path)
+            if saved:
+                cursor = Cursor(int(saved['ts']), frozenset(saved['txs']))
+
+        new = fetch_activity_since(trader, cursor, limit=min(max(limit, 1), PAGE_LIMIT))
+        if not new:
+            return []
+
+        baseline = cursor is None
+        cursor = _advance(cursor, new)
+        _cursors[trader] = cursor
+        if persist:
+            db.set_meta(meta_key, {'ts': cursor.ts, 'txs': sorted(cursor.txs)}, path=path)
+
+        if not persist:  # collector's record is the store, not this buffer
+            buf = _recent.setdefault(trader, deque(maxlen=BUFFER_SIZE))
+            buf.extendleft(reversed(new))  # newest stays at the left
+        if not baseline:  # the first page is history, not new fills
+            _publish(new, 'rest')
+        return new
+
+
+def recent_activity(trader: str, limit: int = 100) -> List[dict]:
+    """Newest `limit` activity items — polls incrementally, then reads the buffer."""
+    poll_new_activity(trader, limit=limit)
+    with _trader_lock(trader.lower()):
+        buf = _recent.get(trader.lower())
+        return list(buf)[:limit] if buf else []
+
+
+def _publish(items: List[dict], source: str) -> None:
+    for item in reversed(items):  # oldest first
+        if item.get('type') == 'TRADE':
+            event = trade_event(item, source)
+            latency.record(source, 'received', latency.fill_time(item.get('timestamp')), event['received_at'])
+            bus.publish(TOPIC_TRADER, event)
+
+
+def _pump_store(trader: str, cursor: Cursor | None) -> Cursor | None:
+    """Collector mode — publish trades the collector wrote since the last look."""
+    since = cursor.ts if cursor else int(time.time())
+    rows = [r for r in db.get_trades_since(trader, since)
+            if (k := _key(r)) is not None and not _is_seen(k, cursor)]
+    if rows and cursor is not None:
+        _publish(rows, 'store')
+    return _advance(cursor, rows) or Cursor(since, frozenset())
+
+
+def _pump(trader: str, interval: float) -> None:
+    store_cursor: Cursor | None = None
+    while True:
+        try:
+            if db.store_ready():
+                store_cursor = _pump_store(trader, store_cursor)
+            else:
+                poll_new_activity(trader, limit=PAGE_LIMIT)  # publishes whatever is new
+        except Exception as e:
+            print(f"⚠️ Activity pump error: {e}")
+        time.sleep(interval)
+
+
+def ensure_activity_pump(trader: str, interval: float = ACTIVITY_PUMP_SEC) -> None:
+    """One background poller per trader feeding the event bus (idempotent)."""
+    name = f"activity_pump:{trader.lower()}"
+    with _lock:
+        if any(t.name == name for t in threading.enumerate()):
+            return
+        threading.Thread(target=_pump, args=(trader.lower(), interval), name=name, daemon=True).start()
@@ -1,13 +1,13 @@
 # Thin gateway - re-export functions
 from .trades import track_0x8dxd, get_latest_bets
 from .profile import get_profile_name, get_trader_pnl
-from .positions import get_open_positions
+from .positions import get_open_positions, get_positions_snapshot
 from .closed_trades import get_closed_trades_pnl
 from .copy_trader import get_latest_trader_activity, detect_new_trades, build_copy_signal
 
 __all__ = [
     'track_0x8dxd', 'get_latest_bets',
     'get_profile_name', 'get_trader_pnl',
-    'get_open_positions', 'get_closed_trades_pnl',
+    'get_open_positions', 'get_positions_snapshot', 'get_closed_trades_pnl',
     'get_latest_trader_activity', 'detect_new_trades', 'build_copy_signal',
 ]
@@ -0,0 +1,271 @@
+import atexit
+import bisect
+import glob
+import gzip
+import heapq
+import json
+import os
+import queue
+import threading
+import time
+import zlib
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from .config import (
+    CAPTURE_DIR, CAPTURE_REPLAY, CAPTURE_REPLAY_SPEED,
+    CAPTURE_SEGMENT_MB, CAPTURE_SEGMENT_SEC, CAPTURE_QUEUE_SIZE,
+)
+
+# Segment = gzip'd JSON lines, one record per upstream response / WS frame:
+#   {"t": <receive epoch s>, "kind": "http", "key": "/activity?user=…", "status": 200, "body": "…"}
+#   {"t": <receive epoch s>, "kind": "ws", "frame": "…"}
+SEGMENT_GLOB = 'seg-*.jsonl.gz'
+FLUSH_SEC = 1.0
+
+
+def request_key(url: str, params: Any = None) -> str:
+    """Path + query exactly as sent — host-free, so a capture replays under any base URL."""
+    prepared = requests.Request('GET', url, params=params).prepare().url
+    parts = urlsplit(prepared)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+
+class CaptureWriter:
+    """
+    Append-only segment writer on its own thread. Callers only enqueue — a full
+    backlog drops the record (counted) so the WS loop never waits on disk.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = CAPTURE_SEGMENT_MB * 1024 * 1024,
+                 segment_sec: float = CAPTURE_SEGMENT_SEC, queue_size: int = CAPTURE_QUEUE_SIZE):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.segment_sec = segment_sec
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._file = None
+        self._opened = 0.0
+        self._written = 0
+        self._seq = 0
+        self.stats = {'records': 0, 'dropped': 0, 'segments': 0, 'bytes': 0}
+        self._stop = threading.Event()
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name='capture_writer', daemon=True)
+        self._thread.start()
+
+    def put(self, record: tuple) -> None:
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.stats['dropped'] += 1
+
+    def _open(self) -> None:
+        self._seq += 1
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        path = os.path.join(self.directory, f"seg-{stamp}-{os.getpid()}-{self._seq:04d}.jsonl.gz")
+        self._file = gzip.GzipFile(path, 'xb', compresslevel=5)  # ✅ 'x' — never reopen an old segment
+        self._opened, self._written = time.monotonic(), 0
+        self.stats['segments'] += 1
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, record: tuple) -> None:
+        kind, t, a, b, c = record
+        if kind == 'http':
+            row = {'t': t, 'kind': 'http', 'key': a, 'status': b,
+                   'body': c.decode('utf-8', 'replace') if isinstance(c, bytes) else c}
+        else:
+            row = {'t': t, 'kind': 'ws', 'frame': a.decode('utf-8', 'replace') if isinstance(a, bytes) else a}
+        line = (json.dumps(row, separators=(',', ':')) + '\n').encode()
+        if self._file is None or self._written >= self.segment_bytes \
+                or time.monotonic() - self._opened >= self.segment_sec:
+            self._close()
+            self._open()
+        self._file.write(line)
+        self._written += len(line)
+        self.stats['records'] += 1
+        self.stats['bytes'] += len(line)
+
+    def _run(self) -> None:
+        last_flush = time.monotonic()
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                self._write(self._queue.get(timeout=FLUSH_SEC))
+            except queue.Empty:
+                pass
+            except Exception as e:
+                print(f"⚠️ capture write error: {e}")
+            if self._file is not None and (self._queue.empty() or time.monotonic() - last_flush >= FLUSH_SEC):
+                self._file.flush(zlib.Z_SYNC_FLUSH)  # ✅ A crash loses at most the last second
+                last_flush = time.monotonic()
+        self._close()
+
+    def close(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._thread.join(timeout)
+
+
+def _read_segment(name: str) -> Iterator[dict]:
+    try:
+        with gzip.open(name, 'rt', encoding='utf-8') as fh:
+            for line in fh:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    return  # torn last line of a segment that was still being written
+    except (EOFError, OSError, zlib.error):
+        pass  # unterminated gzip member — everything before the tear is kept
+
+
+def read_segments(path: str) -> Iterator[dict]:
+    """Every record under `path` (a segment file or a capture dir), oldest first, read lazily."""
+    files = [path] if os.path.isfile(path) else sorted(glob.glob(os.path.join(path, SEGMENT_GLOB)))
+    # ✅ One writer thread per segment → each file is already in time order; several processes
+    # may share a dir, so k-way merge them — one open file and one record per segment in memory
+    return heapq.merge(*(_read_segment(name) for name in files), key=lambda r: r['t'])
+
+
+class Replay:
+    """
+    A capture served back in place of the network. At speed > 0 an HTTP key
+    answers with its newest record as of the replay clock (the state of the
+    world at that moment); at speed 0 each request takes the next record in
+    order. Exhausted keys keep returning their last record.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0):
+        self.speed = speed
+        self._by_key: Dict[str, List[dict]] = defaultdict(list)
+        self._by_path: Dict[str, List[dict]] = defaultdict(list)
+        self.frames: List[Tuple[float, str]] = []
+        self.t0 = None
+        for row in read_segments(path):
+            if self.t0 is None:
+                self.t0 = row['t']
+            row['offset'] = row['t'] - self.t0
+            if row['kind'] == 'http':
+                self._by_key[row['key']].append(row)
+                self._by_path[row['key'].split('?', 1)[0]].append(row)
+            elif row['kind'] == 'ws':
+                self.frames.append((row['offset'], row['frame']))
+        self._offsets = {k: [r['offset'] for r in rows] for k, rows in self._by_key.items()}
+        self._path_offsets = {k: [r['offset'] for r in rows] for k, rows in self._by_path.items()}
+        self._next: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.stats = {'http_records': sum(len(v) for v in self._by_key.values()), 'ws_frames': len(self.frames),
+                      'served': 0, 'misses': 0}
+
+    def clock(self) -> float:
+        """Capture-time offset the replay has reached."""
+        return (time.monotonic() - self.started) * self.speed
+
+    def response(self, url: str, params: Any = None) -> requests.Response | None:
+        """Captured response for this request (exact key, else same path); None = network error."""
+        key = request_key(url, params)
+        rows, offsets = self._by_key.get(key), self._offsets.get(key)
+        if not rows:
+            key = key.split('?', 1)[0]  # params carry a clock-derived value — fall back to the path
+            rows, offsets = self._by_path.get(key), self._path_offsets.get(key)
+        if not rows:
+            self.stats['misses'] += 1
+            return None
+        with self._lock:
+            if self.speed:
+                i = max(bisect.bisect_right(offsets, self.clock()) - 1, 0)
+            else:
+                i = min(self._next[key], len(rows) - 1)
+                self._next[key] = i + 1
+            self.stats['served'] += 1
+        row = rows[i]
+        resp = requests.Response()
+        resp.status_code = row['status']
+        resp._content = row['body'].encode()
+        resp._content_consumed = True  # iter_content() slices the body, stream or not
+        resp.url = url
+        resp.headers['Content-Type'] = 'application/json'
+        return resp
+
+    def play_ws(self, on_frame: Callable[[str], None], stop: threading.Event | None = None) -> int:
+        """Feed captured frames to `on_frame` on the capture's own timeline (scaled); returns the count."""
+        start = time.monotonic()
+        sent = 0
+        for offset, frame in self.frames:
+            if stop is not None and stop.is_set():
+                break
+            if self.speed:
+                wait = offset / self.speed - (time.monotonic() - start)
+                if wait > 0:
+                    time.sleep(wait)
+            on_frame(frame)
+            sent += 1
+        return sent
+
+
+_writer: CaptureWriter | None = None
+_replay: Replay | None = None
+
+
+def start_capture(directory: str) -> CaptureWriter:
+    global _writer
+    if _writer is None:
+        _writer = CaptureWriter(directory)
+        atexit.register(stop_capture)  # ✅ Drain the backlog and close the gzip member on exit
+        print(f"⏺️ Capturing upstream traffic to {directory}")
+    return _writer
+
+
+def stop_capture() -> None:
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
+
+
+def capturing() -> bool:
+    return _writer is not None
+
+
+def record_http(url: str, params: Any, status: int, body: bytes) -> None:
+    if _writer is not None:
+        _writer.put(('http', time.time(), request_key(url, params), status, body))
+
+
+def record_ws(frame) -> None:
+    if _writer is not None:
+        _writer.put(('ws', time.time(), frame, None, None))
+
+
+def start_replay(path: str, speed: float = 1.0) -> Replay:
+    global _replay
+    _replay = Replay(path, speed)
+    print(f"⏯️ Replaying {path} at {'max' if not speed else f'{speed:g}x'} speed "
+          f"({_replay.stats['http_records']} responses, {_replay.stats['ws_frames']} frames)")
+    return _replay
+
+
+def current_replay() -> Replay | None:
+    return _replay
+
+
+def capture_stats() -> Dict[str, Any]:
+    """Sidebar summary — whichever mode is active."""
+    if _writer is not None:
+        return {'mode': 'capture', 'dir': _writer.directory, **_writer.stats}
+    if _replay is not None:
+        return {'mode': 'replay', 'speed': _replay.speed, 'clock': _replay.clock(), **_replay.stats}
+    return {'mode': 'off'}
+
+
+# ✅ Env-driven, so the app and collector.py get it with no code changes; replay wins over capture
+if CAPTURE_REPLAY:
+    start_replay(CAPTURE_REPLAY, CAPTURE_REPLAY_SPEED)
+elif CAPTURE_DIR:
+    start_capture(CAPTURE_DIR)
@@ -0,0 +1,175 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List
+
+from .config import GAMMA_API, DATA_DIR, CATALOG_REFRESH_SEC
+from .filters import is_crypto
+from .http_client import get_json
+
+CATALOG_PATH = os.path.join(DATA_DIR, 'gamma_catalog.json')
+PAGE_SIZE = 500
+MAX_PAGES = 40
+KEEP_EXPIRED_SEC = 7 * 24 * 3600   # closed markets stay resolvable for a week of history
+
+# ✅ Indexes are swapped wholesale under the lock — readers never see a half-built map
+_by_token: Dict[str, dict] = {}
+_by_condition: Dict[str, dict] = {}
+_by_slug: Dict[str, dict] = {}
+_lock = threading.Lock()
+_loaded = False
+
+
+def _json_list(raw) -> list:
+    """Gamma ships clobTokenIds / outcomes as JSON-encoded strings."""
+    if isinstance(raw, list):
+        return raw
+    if isinstance(raw, str) and raw:
+        try:
+            parsed = json.loads(raw)
+            return parsed if isinstance(parsed, list) else []
+        except ValueError:
+            return []
+    return []
+
+
+def _compact(market: dict) -> dict | None:
+    condition_id = str(market.get('conditionId') or '').lower()
+    if not condition_id:
+        return None
+    tokens = [str(t) for t in _json_list(market.get('clobTokenIds'))]
+    if not tokens:
+        tokens = [
+            str(t.get('token_id') or t.get('id'))
+            for t in market.get('tokens') or []
+            if isinstance(t, dict) and (t.get('token_id') or t.get('id'))
+        ]
+    return {
+        'question':    str(market.get('question') or ''),
+        'conditionId': condition_id,
+        'slug':        str(market.get('slug') or ''),
+        'endDate':     market.get('endDateIso') or market.get('endDate') or '',
+        'tokens':      tokens,
+        'outcomes':    [str(o) for o in _json_list(market.get('outcomes'))],
+        'active':      bool(market.get('active', True)) and not market.get('closed', False),
+        'seen_at':     int(time.time()),
+    }
+
+
+def _index(records: List[dict]) -> None:
+    global _by_token, _by_condition, _by_slug, _loaded
+    by_token, by_condition, by_slug = {}, {}, {}
+    for rec in records:
+        by_condition[rec['conditionId']] = rec
+        if rec['slug']:
+            by_slug[rec['slug']] = rec
+        for token in rec['tokens']:
+            by_token[token] = rec
+    with _lock:
+        _by_token, _by_condition, _by_slug = by_token, by_condition, by_slug
+        _loaded = True
+
+
+def load_catalog() -> int:
+    """Warm the indexes from disk — no network, so a cold start is instant."""
+    try:
+        with open(CATALOG_PATH, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+    except (OSError, ValueError):
+        records = []
+    _index([r for r in records if isinstance(r, dict) and r.get('conditionId')])
+    return len(records)
+
+
+def _save(records: List[dict]) -> None:
+    os.makedirs(DATA_DIR, exist_ok=True)
+    tmp_path = f"{CATALOG_PATH}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, separators=(',', ':'))
+    os.replace(tmp_path, CATALOG_PATH)  # ✅ Atomic — a crash mid-write keeps the old file
+
+
+def sync_catalog() -> int:
+    """Page through active crypto markets, merge into the store, persist it."""
+    fetched: Dict[str, dict] = {}
+    for page in range(MAX_PAGES):
+        markets = get_json(f"{GAMMA_API}/markets", params={
+            'active': 'true', 'closed': 'false', 'category': 'crypto',
+            'limit': PAGE_SIZE, 'offset': page * PAGE_SIZE,
+        })
+        if not isinstance(markets, list):
+            return 0  # network trouble — keep serving what we have
+        for market in markets:
+            if not is_crypto(market):
+                continue
+            rec = _compact(market)
+            if rec:
+                fetched[rec['conditionId']] = rec
+        if len(markets) < PAGE_SIZE:
+            break
+
+    cutoff = time.time() - KEEP_EXPIRED_SEC
+    with _lock:
+        merged = {
+            cid: rec for cid, rec in _by_condition.items()
+            if rec.get('seen_at', 0) >= cutoff
+        }
+    for cid, rec in merged.items():
+        if cid not in fetched:
+            rec['active'] = False
+    merged.update(fetched)
+
+    records = list(merged.values())
+    _index(records)
+    try:
+        _save(records)
+    except OSError as e:
+        print(f"⚠️ catalog save failed: {e}")
+    return len(fetched)
+
+
+def _sync_loop():
+    while True:
+        try:
+            count = sync_catalog()
+            print(f"📚 Catalog sync: {count} active crypto markets")
+        except Exception as e:
+            print(f"⚠️ catalog sync error: {e}")
+        time.sleep(CATALOG_REFRESH_SEC)
+
+
+def ensure_catalog_sync():
+    """Load the on-disk catalog now, then keep it fresh from a daemon thread."""
+    if not _loaded:
+        load_catalog()
+    if not any(t.name == 'catalog_sync' for t in threading.enumerate()):
+        threading.Thread(target=_sync_loop, name='catalog_sync', daemon=True).start()
+
+
+def market_for_token(token_id: str) -> dict | None:
+    with _lock:
+        return _by_token.get(str(token_id))
+
+
+def market_for_condition(condition_id: str) -> dict | None:
+    with _lock:
+        return _by_condition.get(str(condition_id).lower())
+
+
+def market_for_slug(slug: str) -> dict | None:
+    with _lock:
+        return _by_slug.get(slug)
+
+
+def title_for_token(token_id: str) -> str:
+    rec = market_for_token(token_id)
+    return rec['question'] if rec else ''
+
+
+def active_token_ids(limit: int = 20) -> List[str]:
+    """First outcome token of each active catalog market — WS subscribe fallback."""
+    with _lock:
+        records = list(_by_condition.values())
+    tokens = [rec['tokens'][0] for rec in records if rec['active'] and rec['tokens']]
+    return tokens[:limit]
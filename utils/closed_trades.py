@@ -1,41 +1,137 @@
+import time
 import streamlit as st
-import requests
-from typing import Dict
-from .config import TICKERS, FULL_NAMES
+from typing import Dict, List, Set
+from .config import (
+    DATA_API, CLOSED_PAGE_SIZE, CLOSED_PAGES_PER_SYNC,
+    CLOSED_RECHECK_SEC, CLOSED_RECHECK_BATCH, CLOSED_UNSETTLED_MAX_AGE_SEC,
+)
+from . import db
+from .stream import stream_json
+from . import metrics
 
-@st.cache_data(ttl=10)
+
+# Columns settled_trades keeps — everything else in a /trades row is dropped while streaming
+SETTLED_FIELDS = (
+    'transactionHash', 'timestamp', 'conditionId', 'title', 'outcome', 'size', 'price', 'pnl',
+)
+
+
+def _settled_keep(stamps: List[int], unsettled: Set[str]):
+    """Stream predicate: keeps settled rows, records every row's timestamp and the markets still open."""
+    def keep(trade: Dict) -> bool:
+        try:
+            stamps.append(int(float(trade.get('timestamp'))))
+        except (TypeError, ValueError):
+            pass
+        if trade.get('status') == 'settled' and trade.get('pnl') is not None:
+            return True
+        if trade.get('conditionId'):
+            unsettled.add(trade['conditionId'])
+        return False
+    return keep
+
+
+def _recheck_unsettled(address: str, path: str) -> int:
+    """
+    Re-read /trades for markets that had unsettled fills, however old — the
+    head sync only reads back to the last high-water mark. Markets with no
+    unsettled row left are cleared.
+    """
+    pending = db.get_unsettled(address, CLOSED_UNSETTLED_MAX_AGE_SEC, path=path)
+    added = 0
+    for i in range(0, len(pending), CLOSED_RECHECK_BATCH):
+        batch = pending[i:i + CLOSED_RECHECK_BATCH]
+        still_open: Set[str] = set()
+        offset, complete = 0, False
+        while True:
+            page = stream_json(f"{DATA_API}/trades", params={
+                'user': address, 'market': ','.join(batch), 'limit': CLOSED_PAGE_SIZE, 'offset': offset,
+            }, keep=_settled_keep([], still_open), fields=SETTLED_FIELDS)
+            if page is None:
+                break  # ✅ Nothing cleared on a failed read — retried next time
+            added += db.insert_settled_trades(address, page.items, path=path)
+            offset += page.seen
+            if page.seen < CLOSED_PAGE_SIZE:
+                complete = True
+                break
+        if complete:
+            db.clear_unsettled(address, set(batch) - still_open, path=path)
+    return added
+
+
+def sync_closed_trades(address: str, max_pages: int | None = CLOSED_PAGES_PER_SYNC,
+                       path: str = db.DB_PATH) -> Dict:
+    """
+    📚 Page /trades into settled_trades with a checkpoint in the meta table.
+
+    Backfill: walks offset pages newest → oldest, saving the offset after every
+    page, so an interrupted run resumes where it stopped (new trades at the
+    head only cause re-reads, never skips). Once complete, later syncs read
+    from the head back to the last high-water mark; fills seen unsettled are
+    tracked per market and re-read until they settle. A catch-up cut short
+    by max_pages resumes from its saved offset, and the mark only moves once
+    a page reaches synced history.
+    max_pages=None → run to completion.
+    """
+    address = address.lower()
+    key = f"closed_sync:{address}"
+    state = db.get_meta(key, path=path) or {'offset': 0, 'done': False, 'head_ts': None}
+    head_floor = state['head_ts'] or 0
+    offset = state['offset']
+    # Incremental catch-ups keep their own high-water mark until they reach synced history
+    newest = state.get('pending_head') if state['done'] else state['head_ts']
+    pages = added = 0
+
+    while max_pages is None or pages < max_pages:
+        stamps: List[int] = []
+        unsettled: Set[str] = set()
+        page = stream_json(f"{DATA_API}/trades", params={
+            'user': address, 'limit': CLOSED_PAGE_SIZE, 'offset': offset,
+        }, keep=_settled_keep(stamps, unsettled), fields=SETTLED_FIELDS)
+        if page is None:
+            break  # ✅ Checkpoint already points at this page — next sync retries it
+        pages += 1
+        added += db.insert_settled_trades(address, page.items, path=path)
+        db.add_unsettled(address, unsettled, path=path)
+        if stamps:
+            newest = max(newest or 0, max(stamps))
+        offset += page.seen
+        short = page.seen < CLOSED_PAGE_SIZE
+
+        if state['done']:
+            if short or not stamps or min(stamps) < head_floor:
+                # ✅ Reached already-synced history — only now may the floor move up
+                state.update(offset=0, head_ts=max(newest or 0, state['head_ts'] or 0), pending_head=None)
+                db.set_meta(key, state, path=path)
+                break
+            # Page budget may run out first — resume here next sync, floor unchanged
+            state.update(offset=offset, pending_head=newest)
+            db.set_meta(key, state, path=path)
+        else:
+            state['offset'] = offset
+            state['head_ts'] = newest if state['head_ts'] is None else state['head_ts']
+            if short:
+                state.update(done=True, offset=0, head_ts=newest)
+                print(f"📚 Closed-trade backfill complete for {address[:10]}… ({offset} trades)")
+            db.set_meta(key, state, path=path)
+            if short:
+                break
+
+    if state['done'] and time.time() - state.get('rechecked_at', 0) >= CLOSED_RECHECK_SEC:
+        added += _recheck_unsettled(address, path)
+        state['rechecked_at'] = time.time()
+        db.set_meta(key, state, path=path)
+    return {'pages': pages, 'added': added, 'done': state['done'], 'offset': state['offset']}
+
+
+@metrics.cache_data(ttl=10)
 def get_closed_trades_pnl(address: str) -> dict:
     """Sum P&L from closed SETTLED crypto trades"""
     try:
-        trades = requests.get(
-            f"https://data-api.polymarket.com/trades?user={address}&limit=1000",
-            timeout=10
-        ).json()
-        
-        total_profit = 0
-        crypto_count = 0
-        settled_count = 0
-        
-        for trade in trades:
-            status = trade.get('status')
-            pnl_val = trade.get('pnl')
-            
-            if status == 'settled' and pnl_val is not None:
-                settled_count += 1
-                title = str(trade.get('title', '')).lower()
-                pnl = float(pnl_val)
-                
-                if pnl != 0 and any(ticker in title for ticker in TICKERS + FULL_NAMES):
-                    total_profit += pnl
-                    crypto_count += 1
-        
-        # 👈 DEBUG AFTER loop:
-        # st.write(f"🔍 trades={len(trades)} settled={settled_count} crypto={crypto_count} total=${total_profit}")
-        
-        return {
-            'total': total_profit,
-            'crypto_count': crypto_count
-        }
+        if not db.store_ready():
+            # ✅ Only new pages are fetched; the total comes from the running aggregate
+            sync_closed_trades(address)
+        return db.get_settled_pnl(address)
     except Exception as e:
         st.error(f"Closed trades error: {e}")
         return {'total': 0, 'crypto_count': 0}
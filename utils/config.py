@@ -1,5 +1,36 @@
+import os
 import pytz
 from typing import List
+from urllib.parse import urlsplit
+
+# Upstream API base URLs
+DATA_API = os.getenv('POLYMARKET_DATA_API', "https://data-api.polymarket.com").rstrip('/')
+GAMMA_API = os.getenv('POLYMARKET_GAMMA_API', "https://gamma-api.polymarket.com").rstrip('/')
+
+# Shared HTTP client — one keep-alive pool per host
+HTTP_TIMEOUT: float = 10.0          # seconds, applied to every upstream call
+HTTP_RETRIES: int = 2               # extra attempts on connection errors / 429 / 5xx
+HTTP_BACKOFF: float = 0.25          # base backoff seconds (full jitter, doubles per attempt)
+HTTP_POOL_SIZE: int = 16            # keep-alive connections kept per host
+HTTP_MAX_CONCURRENCY = {            # in-flight request cap per host — follows the base URLs above
+    urlsplit(DATA_API).hostname: 8,
+    urlsplit(GAMMA_API).hostname: 8,
+}
+
+# Local on-disk state — survives restarts
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+CATALOG_REFRESH_SEC: int = 300      # background gamma catalog sync interval
+DB_PATH = os.getenv('TRACKER_DB_PATH') or os.path.join(DATA_DIR, 'tracker.db')
+
+# Background collector (collector.py) — pages read its store when it's alive
+COLLECTOR_INTERVAL_SEC: float = float(os.getenv('COLLECTOR_INTERVAL_SEC', '5'))
+COLLECTOR_CLOSED_EVERY: int = 12    # closed trades polled every Nth cycle (~1 min)
+CLOSED_PAGE_SIZE: int = 500         # /trades page size for the closed-trade backfill
+CLOSED_PAGES_PER_SYNC: int = 4      # page budget per sync call — long backfills finish over several calls
+CLOSED_RECHECK_SEC: int = 60        # markets seen with unsettled fills are re-read at most this often
+CLOSED_RECHECK_BATCH: int = 50      # condition ids per /trades?market= re-read
+CLOSED_UNSETTLED_MAX_AGE_SEC: int = 30 * 86400  # give up on a market that never settles
+USE_LOCAL_STORE: bool = os.getenv('USE_LOCAL_STORE', '').lower() in ('1', 'true', 'yes')
 
 # Trader address
 TRADER = "0x63ce342161250d705dc0b16df89036c8e5f9ba9a".lower()
@@ -21,4 +52,41 @@ MONTHS_MAP = {
 # NEW: toggle for ultra-short-term crypto markets (5-minute windows etc.)
 ALLOW_5M_MARKETS: bool = False
 
-DISABLE_WS_LIVE: bool = False
\ No newline at end of file
+# ✅ Env override so headless scripts (benchmarks etc.) never open the WS
+DISABLE_WS_LIVE: bool = os.getenv('DISABLE_WS_LIVE', '').lower() in ('1', 'true', 'yes')
+
+# Live WS trade buffer — window reads are O(log n), so this can be large
+LIVE_BUFFER_SIZE: int = int(os.getenv('LIVE_BUFFER_SIZE', '100000'))
+
+# WS market channel — 'asyncio' runs every connection on one loop (needs `websockets`), 'thread' = websocket-client
+WS_BASE_URL = os.getenv('POLYMARKET_WS_URL', "wss://ws-subscriptions-clob.polymarket.com").rstrip('/')
+WS_ENGINE: str = os.getenv('WS_ENGINE', 'asyncio').lower()
+
+# WS market-channel subscriptions — sharded across connections, re-diffed every WS_RESYNC_SEC
+WS_SHARD_SIZE: int = 100
+WS_MAX_SHARDS: int = 5
+WS_RESYNC_SEC: int = 30
+WS_PING_INTERVAL: int = 10
+
+# Event bus — per-subscriber queue bound (oldest dropped) and the in-app activity poll cadence
+EVENT_QUEUE_SIZE: int = 500
+# REST fills reach the UI within this poll interval (not sub-second) — same /activity load as the
+# old 5 s refresh; a lower value is opt-in. Store mode is bounded by COLLECTOR_INTERVAL_SEC instead.
+ACTIVITY_PUMP_SEC: float = float(os.getenv('ACTIVITY_PUMP_SEC', '5'))
+UI_PUSH_REFRESH_SEC: float = 0.5   # st.fragment cadence for bus consumers (no full-script rerun)
+
+# Copy-signal dedupe — per-trader tx window shared by all sessions (expiry + hard cap)
+DEDUPE_TTL_SEC: int = 3600
+DEDUPE_MAX_ITEMS: int = 100_000
+
+# Prometheus text endpoint (localhost) for the call/cache metrics — 0 disables
+METRICS_PORT: int = int(os.getenv('METRICS_PORT', '9464'))
+
+# Capture / replay of upstream traffic (utils/capture.py) — CAPTURE_DIR records every REST
+# response + WS frame; CAPTURE_REPLAY serves a capture back instead of the network
+CAPTURE_DIR: str = os.getenv('CAPTURE_DIR', '')
+CAPTURE_REPLAY: str = os.getenv('CAPTURE_REPLAY', '')
+CAPTURE_REPLAY_SPEED: float = float(os.getenv('CAPTURE_REPLAY_SPEED', '1'))  # 0 = as fast as possible
+CAPTURE_SEGMENT_MB: int = 64        # uncompressed bytes per segment before rotating
+CAPTURE_SEGMENT_SEC: int = 900      # ...or segment age
+CAPTURE_QUEUE_SIZE: int = 50_000    # writer backlog bound — records past it are dropped, never block
@@ -1,39 +1,36 @@
 import streamlit as st
-import requests
 import time
 from .config import TRADER
+from .activity import recent_activity
+from . import db
 from .filters import is_crypto, get_up_down, is_5m_market
 from .shared import parse_usd
+from . import latency
+from .latency import fill_time
+from . import metrics
+from .dedupe import new_since
 
 
-@st.cache_data(ttl=5)
+@metrics.cache_data(ttl=5)
 def get_latest_trader_activity(address: str, limit: int = 25) -> list:
     """Poll for the trader's most recent BUY actions"""
     try:
-        resp = requests.get(
-            f"https://data-api.polymarket.com/activity?user={address}&limit={limit}",
-            timeout=5
-        )
+        if db.store_ready():
+            activity = db.get_trades_since(address, 0, limit=limit)
+        else:
+            activity = recent_activity(address, limit=limit)
         return [
-            t for t in resp.json()
+            t for t in activity or []
             if t.get('type') == 'TRADE' and t.get('side') == 'BUY'
         ]
     except Exception:
         return []
 
 
-def detect_new_trades(current_trades: list) -> list:
-    """Return only trades not seen in previous poll"""
-    seen_hashes = st.session_state.get('seen_tx_hashes', set())
-    new_trades = []
-
-    for trade in current_trades:
-        tx = str(trade.get('transactionHash', '')).lower()
-        if tx and tx not in seen_hashes:
-            new_trades.append(trade)
-            seen_hashes.add(tx)
-
-    st.session_state.seen_tx_hashes = seen_hashes
+def detect_new_trades(current_trades: list, trader: str = TRADER) -> list:
+    """Return only trades this session hasn't seen — shared bounded window + per-session watermark"""
+    new_trades, watermark = new_since(trader, current_trades, st.session_state.get('tx_watermark', 0))
+    st.session_state.tx_watermark = watermark
     return new_trades
 
 
@@ -54,6 +51,12 @@ def build_copy_signal(trade: dict, copy_ratio: float, include_5m: bool = False)
     your_cost = round(your_shares * price, 2)
     updown = get_up_down(trade)
 
+    # ✅ Keep the trader's fill time — signal age is measured from it, not from when we saw it
+    detected_at = time.time()
+    source = trade.get('source') or 'rest'
+    filled_at = fill_time(trade.get('timestamp'))
+    latency.record(source, 'signal', filled_at, detected_at)
+
     return {
         'market':        str(trade.get('title') or trade.get('question') or '')[:85],
         'asset_id':      trade.get('asset') or trade.get('assetId'),
@@ -64,6 +67,9 @@ def build_copy_signal(trade: dict, copy_ratio: float, include_5m: bool = False)
         'price':         price,
         'your_cost':     your_cost,
         'tx_hash':       trade.get('transactionHash'),
-        'detected_at':   time.time(),
+        'detected_at':   detected_at,
+        'filled_at':     filled_at,
+        'received_at':   trade.get('received_at') or detected_at,
+        'source':        source,
         'status':        'NEW',
     }
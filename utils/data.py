@@ -1,48 +1,26 @@
-import streamlit as st
-import requests
-import pandas as pd
-import json
-from datetime import datetime
 from typing import List, Dict, Any
-from .config import EST, TRADER
+from .config import EST
+from .filters import crypto_filter
+from .stream import stream_json
+from .markets import get_end_date
+from . import metrics
 
 
-@st.cache_data(ttl=2)
-def safe_fetch(url: str) -> List[Dict[str, Any]]:
-    try:
-        resp = requests.get(url, timeout=10)
-        if resp.status_code == 200:
-            data = resp.json()
-            if isinstance(data, list) and data:
-                return data[:500]
-    except json.JSONDecodeError:
-        pass
-    except Exception:
-        pass
-    return []
+@metrics.cache_data(ttl=2)
+def safe_fetch(url: str, crypto_only: bool = False, include_5m: bool = True) -> List[Dict[str, Any]]:
+    """First 500 items of a JSON array — streamed, so the rest is never downloaded or parsed."""
+    keep = crypto_filter(include_5m) if crypto_only else None
+    streamed = stream_json(url, keep=keep, limit=500)
+    return streamed.items if streamed else []
 
 
-@st.cache_data(ttl=60)
+@metrics.timed()
 def get_market_enddate(condition_id: str, slug: str = None) -> str:
-    """Get exact end time from Polymarket Gamma API."""
+    """Get exact end time from Polymarket Gamma API (batched, process-lifetime cache)."""
     try:
-        if condition_id:
-            url = f"https://gamma-api.polymarket.com/markets?conditionIds={condition_id}"
-        elif slug:
-            url = f"https://gamma-api.polymarket.com/markets?slug={slug}"
-        else:
-            return None
-            
-        resp = requests.get(url, timeout=5)
-        if resp.status_code == 200:
-            markets = resp.json()
-            if markets and isinstance(markets, list) and markets:
-                market = markets[0]
-                end_iso = market.get('endDateIso') or market.get('end_date_iso')
-                if end_iso:
-                    end_dt = pd.to_datetime(end_iso).tz_convert(EST)
-                    return end_dt.strftime('%I:%M %p ET')
-    except:
+        end_dt = get_end_date(condition_id or '', slug or '')
+        if end_dt is not None:
+            return end_dt.tz_convert(EST).strftime('%I:%M %p ET')
+    except Exception:
         pass
     return None
-
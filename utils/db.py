@@ -0,0 +1,475 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .config import DB_PATH, TRADER, USE_LOCAL_STORE, COLLECTOR_INTERVAL_SEC
+from .filters import is_crypto_title
+
+# settled_pnl rebuilt from settled_trades (existing stores, and after a settled_trades migration)
+_SEED_SETTLED_PNL = """
+INSERT OR IGNORE INTO settled_pnl (trader_address, total, crypto_count, settled_count)
+SELECT trader_address,
+       COALESCE(SUM(CASE WHEN is_crypto = 1 AND pnl != 0 THEN pnl END), 0),
+       COUNT(CASE WHEN is_crypto = 1 AND pnl IS NOT NULL AND pnl != 0 THEN 1 END),
+       COUNT(*)
+FROM settled_trades GROUP BY trader_address;
+"""
+
+# ✅ All tables keyed by trader_address — multi-trader from day one
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS traders (
+    address     TEXT PRIMARY KEY,
+    alias       TEXT,
+    added_at    INTEGER NOT NULL,
+    active      INTEGER NOT NULL DEFAULT 1
+);
+
+-- ✅ Clustered on (trader, ts): a minutes_back window is one contiguous range read, no row lookups
+CREATE TABLE IF NOT EXISTS trades (
+    trader_address  TEXT    NOT NULL,
+    tx_hash         TEXT    NOT NULL,
+    timestamp       INTEGER NOT NULL,
+    type            TEXT,
+    side            TEXT,
+    condition_id    TEXT,
+    asset           TEXT,
+    slug            TEXT,
+    title           TEXT,
+    outcome         TEXT,
+    size            REAL,
+    price           REAL,
+    usdc_size       REAL,
+    PRIMARY KEY (trader_address, timestamp, tx_hash)
+) WITHOUT ROWID;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_trades_tx ON trades (trader_address, tx_hash);
+
+CREATE TABLE IF NOT EXISTS position_snapshots (
+    id              INTEGER PRIMARY KEY,
+    trader_address  TEXT    NOT NULL,
+    snapshot_ts     INTEGER NOT NULL,
+    condition_id    TEXT,
+    asset           TEXT,
+    slug            TEXT,
+    title           TEXT,
+    outcome         TEXT,
+    size            REAL,
+    avg_price       REAL,
+    cur_price       REAL,
+    cash_pnl        REAL,
+    start_date      TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_trader_ts ON position_snapshots (trader_address, snapshot_ts);
+
+CREATE TABLE IF NOT EXISTS settled_trades (
+    id              INTEGER PRIMARY KEY,
+    trader_address  TEXT    NOT NULL,
+    tx_hash         TEXT    NOT NULL,
+    timestamp       INTEGER,
+    condition_id    TEXT,
+    title           TEXT,
+    outcome         TEXT,
+    size            REAL,
+    price           REAL,
+    pnl             REAL,
+    is_crypto       INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_settled_trader_ts ON settled_trades (trader_address, timestamp);
+-- One tx can fill several assets / orders → one /trades row each; market + outcome + fill identify the row
+CREATE UNIQUE INDEX IF NOT EXISTS uq_settled_fill ON settled_trades (
+    trader_address, tx_hash, IFNULL(condition_id, ''), IFNULL(outcome, ''), IFNULL(size, 0), IFNULL(price, 0)
+);
+
+-- Markets with fills /trades hasn't settled yet — re-read until they settle, whatever their age
+CREATE TABLE IF NOT EXISTS unsettled_markets (
+    trader_address  TEXT    NOT NULL,
+    condition_id    TEXT    NOT NULL,
+    first_seen      INTEGER NOT NULL,
+    PRIMARY KEY (trader_address, condition_id)
+);
+
+-- ✅ Running settled-P&L per trader, bumped by the trigger on each NEW row — reads are O(1)
+CREATE TABLE IF NOT EXISTS settled_pnl (
+    trader_address  TEXT PRIMARY KEY,
+    total           REAL    NOT NULL DEFAULT 0,
+    crypto_count    INTEGER NOT NULL DEFAULT 0,
+    settled_count   INTEGER NOT NULL DEFAULT 0
+);
+CREATE TRIGGER IF NOT EXISTS trg_settled_pnl AFTER INSERT ON settled_trades
+BEGIN
+    INSERT INTO settled_pnl (trader_address, total, crypto_count, settled_count)
+    VALUES (
+        NEW.trader_address,
+        CASE WHEN NEW.is_crypto = 1 AND NEW.pnl IS NOT NULL AND NEW.pnl != 0 THEN NEW.pnl ELSE 0 END,
+        CASE WHEN NEW.is_crypto = 1 AND NEW.pnl IS NOT NULL AND NEW.pnl != 0 THEN 1 ELSE 0 END,
+        1
+    )
+    ON CONFLICT(trader_address) DO UPDATE SET
+        total = total + excluded.total,
+        crypto_count = crypto_count + excluded.crypto_count,
+        settled_count = settled_count + 1;
+END;
+-- Stores created before the aggregate existed: seed it once from the rows already there
+""" + _SEED_SETTLED_PNL + """
+CREATE TABLE IF NOT EXISTS simulation_runs (
+    id              INTEGER PRIMARY KEY,
+    trader_address  TEXT    NOT NULL,
+    started_at      INTEGER NOT NULL,
+    ended_at        INTEGER,
+    config          TEXT,
+    results         TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sim_runs_trader ON simulation_runs (trader_address, started_at);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key     TEXT PRIMARY KEY,
+    value   TEXT
+);
+"""
+
+# API field → trades column (activity payload)
+_TRADE_FIELDS = (
+    ('tx_hash', 'transactionHash'), ('timestamp', 'timestamp'), ('type', 'type'),
+    ('side', 'side'), ('condition_id', 'conditionId'), ('asset', 'asset'),
+    ('slug', 'slug'), ('title', 'title'), ('outcome', 'outcome'),
+    ('size', 'size'), ('price', 'price'), ('usdc_size', 'usdcSize'),
+)
+_TRADE_COLUMNS = ', '.join(col for col, _ in _TRADE_FIELDS)
+_SNAPSHOT_FIELDS = (
+    ('condition_id', 'conditionId'), ('asset', 'asset'), ('slug', 'slug'),
+    ('title', 'title'), ('outcome', 'outcome'), ('size', 'size'),
+    ('avg_price', 'avgPrice'), ('cur_price', 'curPrice'), ('cash_pnl', 'cashPnl'),
+    ('start_date', 'startDate'),
+)
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized: set = set()
+
+
+def get_conn(path: str = DB_PATH) -> sqlite3.Connection:
+    """
+    One connection per thread (sqlite3 objects can't cross threads).
+    WAL lets the UI read while the collector writes.
+    """
+    conns = getattr(_local, 'conns', None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")    # ✅ Safe with WAL, far fewer fsyncs
+        conn.execute("PRAGMA busy_timeout=5000")
+        conns[path] = conn
+        _init_schema(conn, path)
+    return conn
+
+
+_SETTLED_COLUMNS = "trader_address, tx_hash, timestamp, condition_id, title, outcome, size, price, pnl, is_crypto"
+
+
+def _settled_needs_migration(conn: sqlite3.Connection) -> bool:
+    """Stores from before uq_settled_fill keyed settled_trades on (trader, tx) alone."""
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'settled_trades'").fetchone()
+    return bool(row) and 'UNIQUE (trader_address, tx_hash)' in row[0]
+
+
+def _trades_needs_migration(conn: sqlite3.Connection) -> bool:
+    """Stores from before the clustered layout kept trades in a rowid table + (trader, ts) index."""
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'trades'").fetchone()
+    return bool(row) and 'WITHOUT ROWID' not in row[0]
+
+
+def _init_schema(conn: sqlite3.Connection, path: str) -> None:
+    with _init_lock:
+        if path in _initialized and path != ':memory:':
+            return
+        if _settled_needs_migration(conn):
+            # ✅ One transaction: rebuild under the per-fill key, then re-seed the aggregate
+            conn.executescript(
+                "BEGIN;"
+                "DROP TRIGGER IF EXISTS trg_settled_pnl;"
+                "DROP INDEX IF EXISTS idx_settled_trader_ts;"
+                "ALTER TABLE settled_trades RENAME TO settled_trades_v1;"
+                + SCHEMA +
+                f"INSERT OR IGNORE INTO settled_trades ({_SETTLED_COLUMNS}) "
+                f"SELECT {_SETTLED_COLUMNS} FROM settled_trades_v1;"
+                "DROP TABLE settled_trades_v1;"
+                "DELETE FROM settled_pnl;"
+                + _SEED_SETTLED_PNL +
+                "COMMIT;"
+            )
+        if _trades_needs_migration(conn):
+            cols = f"trader_address, {_TRADE_COLUMNS}"
+            conn.executescript(
+                "BEGIN;"
+                "DROP INDEX IF EXISTS idx_trades_trader_ts;"
+                "ALTER TABLE trades RENAME TO trades_v1;"
+                + SCHEMA +
+                f"INSERT OR IGNORE INTO trades ({cols}) SELECT {cols} FROM trades_v1;"
+                "DROP TABLE trades_v1;"
+                "COMMIT;"
+            )
+        conn.executescript(SCHEMA)
+        conn.execute(
+            "INSERT OR IGNORE INTO traders (address, alias, added_at, active) VALUES (?, ?, ?, 1)",
+            (TRADER, None, int(time.time())),
+        )
+        conn.commit()
+        _initialized.add(path)
+
+
+def _num(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _ts(value: Any) -> int | None:
+    num = _num(value)
+    return int(num) if num is not None else None
+
+
+# ── meta ─────────────────────────────────────────────────────────────────
+
+def set_meta(key: str, value: Any, path: str = DB_PATH) -> None:
+    conn = get_conn(path)
+    with conn:
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value)),
+        )
+
+
+def get_meta(key: str, default: Any = None, path: str = DB_PATH) -> Any:
+    row = get_conn(path).execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return json.loads(row['value']) if row else default
+
+
+def store_ready(path: str = DB_PATH) -> bool:
+    """True when pages should read the collector's store instead of calling the API."""
+    if not USE_LOCAL_STORE:
+        return False
+    try:
+        heartbeat = float(get_meta('collector_heartbeat', 0, path) or 0)
+    except sqlite3.Error:
+        return False
+    return time.time() - heartbeat < 3 * COLLECTOR_INTERVAL_SEC  # ✅ Dead collector → back to API
+
+
+# ── traders ──────────────────────────────────────────────────────────────
+
+def add_trader(address: str, alias: str | None = None, path: str = DB_PATH) -> None:
+    conn = get_conn(path)
+    with conn:
+        conn.execute(
+            "INSERT INTO traders (address, alias, added_at, active) VALUES (?, ?, ?, 1) "
+            "ON CONFLICT(address) DO UPDATE SET active = 1, alias = COALESCE(excluded.alias, alias)",
+            (address.lower(), alias, int(time.time())),
+        )
+
+
+def set_trader_active(address: str, active: bool, path: str = DB_PATH) -> None:
+    conn = get_conn(path)
+    with conn:
+        conn.execute("UPDATE traders SET active = ? WHERE address = ?", (int(active), address.lower()))
+
+
+def get_active_traders(path: str = DB_PATH) -> List[str]:
+    rows = get_conn(path).execute("SELECT address FROM traders WHERE active = 1 ORDER BY added_at")
+    return [r['address'] for r in rows]
+
+
+# ── trades ───────────────────────────────────────────────────────────────
+
+def insert_trades(trader: str, items: Iterable[Dict], path: str = DB_PATH) -> int:
+    """Batched insert of activity items; duplicates (trader, tx_hash) are skipped. Returns rows added."""
+    trader = trader.lower()
+    rows = []
+    for item in items:
+        tx = str(item.get('transactionHash') or '').lower()
+        ts = _ts(item.get('timestamp'))
+        if not tx or ts is None:
+            continue
+        rows.append((
+            trader, tx, ts, item.get('type'), item.get('side'), item.get('conditionId'),
+            item.get('asset'), item.get('slug'), item.get('title'), item.get('outcome'),
+            _num(item.get('size')), _num(item.get('price')), _num(item.get('usdcSize')),
+        ))
+    if not rows:
+        return 0
+
+    conn = get_conn(path)
+    before = conn.total_changes
+    with conn:  # ✅ One transaction per batch
+        conn.executemany(
+            "INSERT OR IGNORE INTO trades (trader_address, tx_hash, timestamp, type, side, condition_id, "
+            "asset, slug, title, outcome, size, price, usdc_size) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    return conn.total_changes - before
+
+
+def get_trades_since(trader: str, since_ts: int, limit: int | None = None,
+                     path: str = DB_PATH) -> List[Dict]:
+    """Trades in [since_ts, now], newest first, shaped like /activity items."""
+    trader = trader.lower()
+    sql = (
+        f"SELECT {_TRADE_COLUMNS}, trader_address FROM trades "
+        "WHERE trader_address = ? AND timestamp >= ? "
+        "ORDER BY timestamp DESC"
+    )
+    params: Tuple = (trader, int(since_ts))
+    if limit:
+        sql += " LIMIT ?"
+        params += (int(limit),)
+    cur = get_conn(path).execute(sql, params)
+    cur.row_factory = None  # ✅ Plain tuples — zip straight into the API-shaped dicts
+    names = [api for _, api in _TRADE_FIELDS] + ['proxyWallet']
+    return [dict(zip(names, row)) for row in cur.fetchall()]
+
+
+# ── position snapshots ───────────────────────────────────────────────────
+
+def insert_position_snapshot(trader: str, positions: Iterable[Dict], snapshot_ts: int | None = None,
+                             path: str = DB_PATH) -> int:
+    trader = trader.lower()
+    snapshot_ts = int(snapshot_ts or time.time())
+    rows = [
+        (trader, snapshot_ts, *(
+            _num(pos.get(api)) if col in ('size', 'avg_price', 'cur_price', 'cash_pnl') else pos.get(api)
+            for col, api in _SNAPSHOT_FIELDS
+        ))
+        for pos in positions
+    ]
+    conn = get_conn(path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO position_snapshots (trader_address, snapshot_ts, condition_id, asset, slug, "
+            "title, outcome, size, avg_price, cur_price, cash_pnl, start_date) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    return len(rows)
+
+
+def get_latest_position_snapshot(trader: str, path: str = DB_PATH) -> Tuple[int | None, List[Dict]]:
+    """(snapshot_ts, positions shaped like /positions items) — (None, []) if never snapshotted."""
+    conn = get_conn(path)
+    trader = trader.lower()
+    row = conn.execute(
+        "SELECT MAX(snapshot_ts) AS ts FROM position_snapshots WHERE trader_address = ?", (trader,)
+    ).fetchone()
+    if row is None or row['ts'] is None:
+        return None, []
+    rows = conn.execute(
+        "SELECT * FROM position_snapshots WHERE trader_address = ? AND snapshot_ts = ?",
+        (trader, row['ts']),
+    ).fetchall()
+    return row['ts'], [{api: r[col] for col, api in _SNAPSHOT_FIELDS} for r in rows]
+
+
+def prune_position_snapshots(keep_sec: int, path: str = DB_PATH) -> int:
+    conn = get_conn(path)
+    with conn:
+        cur = conn.execute(
+            "DELETE FROM position_snapshots WHERE snapshot_ts < ?", (int(time.time()) - keep_sec,)
+        )
+    return cur.rowcount
+
+
+# ── settled trades ───────────────────────────────────────────────────────
+
+def insert_settled_trades(trader: str, items: Iterable[Dict], path: str = DB_PATH) -> int:
+    """Batched insert of settled /trades rows (with pnl); returns rows added. Re-reads of a fill are skipped."""
+    trader = trader.lower()
+    rows = []
+    for item in items:
+        tx = str(item.get('transactionHash') or '').lower()
+        if not tx:
+            continue
+        title = str(item.get('title') or '')
+        rows.append((
+            trader, tx, _ts(item.get('timestamp')), item.get('conditionId'), title,
+            item.get('outcome'), _num(item.get('size')), _num(item.get('price')),
+            _num(item.get('pnl')), int(is_crypto_title(title)),
+        ))
+    if not rows:
+        return 0
+
+    conn = get_conn(path)
+    count_sql = "SELECT COALESCE(MAX(settled_count), 0) FROM settled_pnl WHERE trader_address = ?"
+    before = conn.execute(count_sql, (trader,)).fetchone()[0]  # total_changes would count trigger writes too
+    with conn:
+        conn.executemany(
+            f"INSERT OR IGNORE INTO settled_trades ({_SETTLED_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    return conn.execute(count_sql, (trader,)).fetchone()[0] - before
+
+
+def add_unsettled(trader: str, condition_ids: Iterable[str], path: str = DB_PATH) -> None:
+    rows = [(trader.lower(), c, int(time.time())) for c in set(condition_ids) if c]
+    if not rows:
+        return
+    conn = get_conn(path)
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO unsettled_markets (trader_address, condition_id, first_seen) VALUES (?, ?, ?)",
+            rows,
+        )
+
+
+def get_unsettled(trader: str, max_age_sec: int | None = None, path: str = DB_PATH) -> List[str]:
+    """Condition ids still waiting to settle; entries older than max_age_sec are dropped."""
+    conn = get_conn(path)
+    trader = trader.lower()
+    if max_age_sec:
+        with conn:
+            conn.execute("DELETE FROM unsettled_markets WHERE trader_address = ? AND first_seen < ?",
+                         (trader, int(time.time()) - max_age_sec))
+    rows = conn.execute(
+        "SELECT condition_id FROM unsettled_markets WHERE trader_address = ? ORDER BY first_seen", (trader,)
+    )
+    return [r['condition_id'] for r in rows]
+
+
+def clear_unsettled(trader: str, condition_ids: Iterable[str], path: str = DB_PATH) -> None:
+    conn = get_conn(path)
+    with conn:
+        conn.executemany("DELETE FROM unsettled_markets WHERE trader_address = ? AND condition_id = ?",
+                         [(trader.lower(), c) for c in condition_ids])
+
+
+def get_settled_pnl(trader: str, path: str = DB_PATH) -> Dict:
+    """Crypto settled P&L — same shape as get_closed_trades_pnl(). Reads the trigger-kept aggregate."""
+    row = get_conn(path).execute(
+        "SELECT total, crypto_count FROM settled_pnl WHERE trader_address = ?", (trader.lower(),)
+    ).fetchone()
+    if row is None:
+        return {'total': 0, 'crypto_count': 0}
+    return {'total': row['total'], 'crypto_count': row['crypto_count']}
+
+
+# ── simulation runs ──────────────────────────────────────────────────────
+
+def record_simulation_run(trader: str, config: Dict, results: Dict, started_at: float,
+                          ended_at: float | None = None, path: str = DB_PATH) -> int:
+    conn = get_conn(path)
+    with conn:
+        cur = conn.execute(
+            "INSERT INTO simulation_runs (trader_address, started_at, ended_at, config, results) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (trader.lower(), int(started_at), int(ended_at or time.time()),
+             json.dumps(config, default=str), json.dumps(results, default=str)),
+        )
+    return cur.lastrowid
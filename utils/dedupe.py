@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
+
+from .config import DEDUPE_TTL_SEC, DEDUPE_MAX_ITEMS
+from .latency import fill_time
+
+
+def _tx_key(tx: str) -> bytes:
+    """Exact, compact identity: the 32 raw bytes of a 0x hash (the string itself otherwise)."""
+    try:
+        return bytes.fromhex(tx[2:] if tx.startswith('0x') else tx)
+    except ValueError:
+        return tx.encode()
+
+
+class TxWindow:
+    """
+    Ordered tx window: tx → sequence number of its first sighting, oldest
+    first. Entries expire after `ttl_sec` and the window never holds more than
+    `max_items`, so memory is fixed no matter how long the process runs.
+
+    Eviction raises a low-water mark — the newest trade timestamp ever evicted.
+    A tx missing from the window whose trade is at or below that mark was
+    already seen (a REST page overlapping old history), so it gets seq 0
+    instead of a fresh number and is never signalled twice.
+
+    The cost of fixed memory: a fill that was never seen but arrives late,
+    with a trade time at or below the mark, is suppressed too. With the
+    defaults the mark trails the newest fill by about the TTL (an hour) unless
+    the cap evicts first, so only fills that old are dropped — stale for copying.
+    """
+
+    def __init__(self, ttl_sec: float = DEDUPE_TTL_SEC, max_items: int = DEDUPE_MAX_ITEMS):
+        self.ttl_sec = ttl_sec
+        self.max_items = max_items
+        self._items: OrderedDict = OrderedDict()  # tx key → (seq, first_seen, trade_ts)
+        self._seq = 0
+        self.horizon_ts = float('-inf')
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _evict(self, now: float) -> None:
+        items, horizon = self._items, now - self.ttl_sec
+        while items and (len(items) > self.max_items or next(iter(items.values()))[1] < horizon):
+            _, (_, _, trade_ts) = items.popitem(last=False)
+            if trade_ts is not None and trade_ts > self.horizon_ts:
+                self.horizon_ts = trade_ts
+
+    def observe(self, txs: Iterable[str], now: float | None = None,
+                trade_ts: Iterable[float | None] | None = None) -> List[int]:
+        """
+        Sequence number per tx — existing for ones in the window, 0 for ones
+        behind the eviction horizon, fresh (increasing) otherwise.
+        """
+        now = time.time() if now is None else now
+        stamps = iter(trade_ts) if trade_ts is not None else None
+        out = []
+        with self._lock:
+            for tx in txs:
+                ts = next(stamps, None) if stamps is not None else None
+                key = _tx_key(tx)
+                entry = self._items.get(key)
+                if entry is None:
+                    if ts is not None and ts <= self.horizon_ts:
+                        out.append(0)  # ✅ Evicted earlier — don't reissue a number
+                        continue
+                    self._seq += 1
+                    entry = self._items[key] = (self._seq, now, ts)
+                out.append(entry[0])
+            self._evict(now)
+        return out
+
+
+_windows: Dict[str, TxWindow] = {}
+_lock = threading.Lock()
+
+
+def tx_window(trader: str) -> TxWindow:
+    """One window per trader, shared by every browser session."""
+    trader = trader.lower()
+    with _lock:
+        window = _windows.get(trader)
+        if window is None:
+            window = _windows[trader] = TxWindow()
+        return window
+
+
+def new_since(trader: str, trades: List[dict], watermark: int) -> Tuple[List[dict], int]:
+    """
+    Trades the caller hasn't consumed yet, and its advanced watermark.
+
+    Sessions read the same ordered stream, so a tx at or below a session's
+    watermark was already in one of its earlier batches. Per-session state is
+    that one int instead of a set of every hash.
+    """
+    txs = [str(t.get('transactionHash', '')).lower() for t in trades]
+    keep = [(t, tx) for t, tx in zip(trades, txs) if tx]
+    seqs = tx_window(trader).observe((tx for _, tx in keep), trade_ts=(fill_time(t.get('timestamp')) for t, _ in keep))
+    fresh, taken = [], set()
+    for (trade, _), seq in zip(keep, seqs):
+        if seq and seq > watermark and seq not in taken:
+            fresh.append(trade)
+            taken.add(seq)
+    return fresh, max([watermark, *seqs])
@@ -0,0 +1,104 @@
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Dict, List
+
+from .config import EVENT_QUEUE_SIZE
+
+TOPIC_TRADER = 'trader_trades'   # the tracked trader's fills (REST activity / store)
+TOPIC_LIVE = 'live_trades'       # market-channel trades from rtds_listener
+
+# Activity fields build_copy_signal and the trades table read
+_TRADE_FIELDS = ('transactionHash', 'timestamp', 'type', 'side', 'conditionId', 'asset', 'slug',
+                 'title', 'outcome', 'size', 'price', 'usdcSize', 'proxyWallet')
+
+
+class Subscription:
+    """A subscriber's bounded queue — when full, the oldest event is dropped, never the publisher blocked."""
+
+    def __init__(self, topic: str, maxlen: int):
+        self.topic = topic
+        self.dropped = 0
+        self._queue: deque = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    def _put(self, event: dict) -> None:
+        with self._lock:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(event)
+        self._ready.set()
+
+    def drain(self, limit: int | None = None) -> List[dict]:
+        """Pending events, oldest first (non-blocking)."""
+        with self._lock:
+            n = len(self._queue) if limit is None else min(limit, len(self._queue))
+            out = [self._queue.popleft() for _ in range(n)]
+            if not self._queue:
+                self._ready.clear()
+        return out
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+
+class EventBus:
+    """
+    In-process pub/sub. Subscribers are held weakly — a Subscription kept in a
+    browser session's state goes away with the session, no unsubscribe needed.
+    """
+
+    def __init__(self):
+        self._subs: Dict[str, weakref.WeakSet] = {}
+        self._published: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic: str, maxlen: int = EVENT_QUEUE_SIZE) -> Subscription:
+        sub = Subscription(topic, maxlen)
+        with self._lock:
+            self._subs.setdefault(topic, weakref.WeakSet()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._subs.get(sub.topic, weakref.WeakSet()).discard(sub)
+
+    def subscribed(self, topic: str) -> bool:
+        """Cheap check so hot publishers can skip building events nobody reads."""
+        return bool(self._subs.get(topic))
+
+    def publish(self, topic: str, event: dict) -> int:
+        with self._lock:
+            subs = list(self._subs.get(topic, ()))
+            self._published[topic] = self._published.get(topic, 0) + 1
+        for sub in subs:
+            sub._put(event)
+        return len(subs)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            topics = {t: list(s) for t, s in self._subs.items()}
+            published = dict(self._published)
+        return {
+            t: {'published': published.get(t, 0), 'subscribers': len(subs),
+                'queued': sum(len(s) for s in subs), 'dropped': sum(s.dropped for s in subs)}
+            for t, subs in topics.items()
+        }
+
+
+bus = EventBus()
+
+
+def trade_event(item: dict, source: str) -> dict:
+    """Activity / WS item → the normalized event every consumer reads."""
+    event = {k: item.get(k) for k in _TRADE_FIELDS if item.get(k) is not None}
+    event.setdefault('asset', item.get('asset_id') or item.get('assetId'))
+    event.setdefault('title', item.get('question') or '')
+    event['source'] = source
+    event['received_at'] = time.time()
+    return event
@@ -0,0 +1,148 @@
+import random
+import threading
+import time
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import capture, metrics
+from .config import (
+    HTTP_TIMEOUT, HTTP_RETRIES, HTTP_BACKOFF,
+    HTTP_POOL_SIZE, HTTP_MAX_CONCURRENCY,
+)
+
+# Statuses worth another attempt — everything else is returned to the caller as-is
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_DEFAULT_CONCURRENCY = 4
+
+_sessions: Dict[str, requests.Session] = {}
+_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_stats: Dict[str, Dict[str, int]] = {}
+_lock = threading.Lock()
+
+
+def _host_state(host: str):
+    """Lazily build the keep-alive session, concurrency cap and counters for a host."""
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            cap = HTTP_MAX_CONCURRENCY.get(host, _DEFAULT_CONCURRENCY)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(HTTP_POOL_SIZE, cap), max_retries=0)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _sessions[host] = session
+            _semaphores[host] = threading.BoundedSemaphore(cap)
+            _stats[host] = {'requests': 0, 'retries': 0, 'errors': 0}
+        return session, _semaphores[host], _stats[host]
+
+
+def _bump(stats: Dict[str, int], key: str) -> None:
+    with _lock:  # ✅ Pool threads share a host's counters — += isn't atomic
+        stats[key] += 1
+
+
+def set_host_concurrency(host: str, limit: int) -> None:
+    """Raise/lower a host's in-flight cap — call before the first request to that host."""
+    with _lock:
+        HTTP_MAX_CONCURRENCY[host] = limit
+        if host in _sessions:
+            _sessions.pop(host).close()
+            _semaphores.pop(host, None)
+            _stats.pop(host, None)
+
+
+def _backoff(attempt: int, retry_after: str | None = None) -> float:
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), 10.0)
+    return random.uniform(0, HTTP_BACKOFF * (2 ** attempt))  # ✅ Full jitter
+
+
+def http_get(url: str, params: Any = None,
+             timeout: float | None = None, **kwargs) -> requests.Response | None:
+    """
+    GET through the shared per-host pool. Retries connection errors, 429 and 5xx
+    with jittered backoff; returns the last response, or None if every attempt raised.
+    """
+    started = time.perf_counter()
+    replay = capture.current_replay()
+    if replay is not None:
+        resp = replay.response(url, params)  # ✅ Captured bytes, same callers and parsing
+    else:
+        host = urlsplit(url).hostname or ''
+        session, sem, stats = _host_state(host)
+        timeout = HTTP_TIMEOUT if timeout is None else timeout
+        resp = _get_with_retries(session, sem, stats, url, params, timeout, **kwargs)
+        if resp is not None and capture.capturing() and not kwargs.get('stream'):
+            capture.record_http(url, params, resp.status_code, resp.content)  # stream_json records its own
+    ok = resp is not None and resp.status_code < 400
+    # Streamed bodies aren't read yet — stream_json adds their bytes as it consumes them
+    nbytes = len(resp.content) if ok and not kwargs.get('stream') else 0
+    metrics.observe(metrics.endpoint(url), 'http', time.perf_counter() - started, error=not ok, nbytes=nbytes)
+    return resp
+
+
+def _get_with_retries(session: requests.Session, sem, stats: Dict[str, int], url: str, params: Any,
+                      timeout: float, **kwargs) -> requests.Response | None:
+    resp = None
+    for attempt in range(HTTP_RETRIES + 1):
+        if attempt:
+            _bump(stats, 'retries')
+        try:
+            with sem:  # ✅ Per-host cap — a burst can't open unbounded sockets
+                _bump(stats, 'requests')
+                resp = session.get(url, params=params, timeout=timeout, **kwargs)
+        except requests.RequestException:
+            _bump(stats, 'errors')
+            resp = None
+            if attempt < HTTP_RETRIES:
+                time.sleep(_backoff(attempt))
+            continue
+
+        if resp.status_code in _RETRY_STATUSES and attempt < HTTP_RETRIES:
+            delay = _backoff(attempt, resp.headers.get('Retry-After'))
+            resp.close()
+            time.sleep(delay)
+            continue
+        return resp
+    return resp
+
+
+def get_json(url: str, params: Any = None,
+             timeout: float | None = None) -> Any:
+    """GET + decode. None on network error, non-200 or invalid JSON."""
+    resp = http_get(url, params=params, timeout=timeout)
+    if resp is None or resp.status_code != 200:
+        return None
+    try:
+        return resp.json()
+    except ValueError:
+        return None
+
+
+def connection_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Per-host counters. `connections` is how many TCP+TLS handshakes urllib3 has done;
+    `reused` is requests served on an already-open keep-alive socket.
+    """
+    out = {}
+    with _lock:  # counters copied with their session — set_host_concurrency may drop a host meanwhile
+        hosts = [(host, session, dict(_stats.get(host, {}))) for host, session in _sessions.items()]
+    for host, session, counters in hosts:
+        opened = sent = 0
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                opened += pool.num_connections
+                sent += pool.num_requests
+        out[host] = {
+            **counters,
+            'connections': opened,
+            'reused': max(sent - opened, 0),
+        }
+    return out
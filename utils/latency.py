@@ -0,0 +1,87 @@
+import bisect
+import threading
+from typing import Dict, List, Tuple
+
+# Log-spaced bucket edges (ms), 0.1 ms → ~1 h at 1.25x — percentiles within one bucket (≤25%)
+BUCKETS_MS: List[float] = [0.1 * 1.25 ** i for i in range(79)]
+PERCENTILES = (0.5, 0.9, 0.99)
+
+# Copy-signal pipeline stages, all measured from the trader's own fill timestamp
+STAGES = ('received', 'signal', 'rendered')
+
+
+class Histogram:
+    """Fixed-bucket latency histogram — constant memory, cheap enough for the WS hot path."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, ms: float) -> None:
+        ms = max(ms, 0.0)
+        i = bisect.bisect_left(BUCKETS_MS, ms)
+        with self._lock:
+            self.counts[i] += 1
+            self.total += 1
+            self.sum_ms += ms
+            if ms > self.max_ms:
+                self.max_ms = ms
+
+    def percentile(self, q: float) -> float:
+        """Upper edge of the bucket holding the q-th sample (max for the overflow bucket)."""
+        with self._lock:
+            counts, total, top = list(self.counts), self.total, self.max_ms
+        if not total:
+            return 0.0
+        rank, seen = q * total, 0
+        for i, c in enumerate(counts):
+            seen += c
+            if seen >= rank:
+                return min(BUCKETS_MS[i], top) if i < len(BUCKETS_MS) else top
+        return top
+
+    def summary(self) -> Dict[str, float]:
+        out = {f"p{int(q * 100)}": self.percentile(q) for q in PERCENTILES}
+        out.update(count=self.total, mean=self.sum_ms / self.total if self.total else 0.0, max=self.max_ms)
+        return out
+
+
+_hists: Dict[Tuple[str, str], Histogram] = {}
+_lock = threading.Lock()
+
+
+def histogram(source: str, stage: str) -> Histogram:
+    key = (source, stage)
+    hist = _hists.get(key)
+    if hist is None:
+        with _lock:
+            hist = _hists.setdefault(key, Histogram())
+    return hist
+
+
+def fill_time(value) -> float | None:
+    """Trader fill timestamp (REST seconds or WS milliseconds) → epoch seconds."""
+    try:
+        ts = float(value)
+    except (TypeError, ValueError):
+        return None
+    if ts <= 0:
+        return None
+    return ts / 1000 if ts > 1e12 else ts
+
+
+def record(source: str, stage: str, filled_at: float | None, at: float) -> None:
+    """Fill → `stage` latency for one event; events without a fill time are skipped."""
+    if filled_at:
+        histogram(source, stage).record((at - filled_at) * 1000)
+
+
+def latency_report() -> List[Dict]:
+    """One row per (source, stage) with p50/p90/p99 in ms — for the signal feed panel."""
+    with _lock:
+        items = sorted(_hists.items(), key=lambda kv: (kv[0][0], STAGES.index(kv[0][1])
+                                                       if kv[0][1] in STAGES else len(STAGES)))
+    return [{'source': source, 'stage': stage, **hist.summary()} for (source, stage), hist in items]
@@ -0,0 +1,221 @@
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# ✅ 37 bytes per WS event across contiguous columns (+8 for the wallet/asset index) — strings live once in the interners
+COLUMNS = {
+    'ts': np.float64, 'size': np.float64, 'price': np.float64,
+    'asset': np.int32, 'title': np.int32, 'wallet': np.int32, 'event': np.int8,
+}
+SLACK = 0.25  # extra rows past maxlen — compaction copies once every maxlen*SLACK appends
+INDEXED = ('wallet', 'asset')  # fields with a code → row-position index for filtered reads
+
+
+class _Interner:
+    """str ↔ int code; each distinct title/asset/wallet is stored once."""
+
+    def __init__(self, values: List[str] | None = None):
+        self.values: List[str] = values or []
+        self.codes: Dict[str, int] = {value: code for code, value in enumerate(self.values)}
+        self._array: np.ndarray | None = None
+
+    def code(self, value: str | None) -> int:
+        if not value:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value: str) -> int | None:
+        return self.codes.get(value)
+
+    def array(self) -> np.ndarray:
+        """code → string lookup ('' at -1), rebuilt only when values were added (values only grow)."""
+        if self._array is None or len(self._array) != len(self.values) + 1:
+            self._array = np.array(self.values + [''], dtype=object)
+        return self._array
+
+    def retain(self, used: np.ndarray) -> Tuple['_Interner', np.ndarray]:
+        """New interner holding only `used` codes, plus old code → new code (-1 stays -1)."""
+        used = used[used >= 0]
+        remap = np.full(len(self.values) + 1, -1, dtype=np.int64)
+        remap[used] = np.arange(len(used))
+        return _Interner([self.values[code] for code in used.tolist()]), remap
+
+
+class LiveBuffer:
+    """
+    Bounded live-trade buffer stored as preallocated NumPy columns, ordered by
+    timestamp. Window reads bisect (searchsorted) to the cutoff.
+
+    Rows are only ever written past the live range; compaction and late
+    inserts move to fresh arrays. So the views columns() hands out are
+    zero-copy and stay valid — later appends never rewrite them.
+
+    Wallet/asset filtered reads go through a code → row-position index, so
+    they touch only the matching rows. Every rebuild drops interned strings
+    no live row references any more and re-indexes the new arrays.
+    """
+
+    def __init__(self, maxlen: int, title_for_asset: Callable[[str], str] | None = None):
+        self.maxlen = maxlen
+        self._capacity = maxlen + max(1, int(maxlen * SLACK))
+        self._title_for_asset = title_for_asset
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _alloc(self) -> Dict[str, np.ndarray]:
+        return {name: np.empty(self._capacity, dtype=dt) for name, dt in COLUMNS.items()}
+
+    def _reset(self) -> None:
+        self._cols = self._alloc()
+        self._start = self._end = 0
+        self._interners = {name: _Interner() for name in ('asset', 'title', 'wallet', 'event')}
+        self._index: Dict[str, Dict[int, array]] = {field: {} for field in INDEXED}
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    # ── writes ──────────────────────────────────────────────────────────
+
+    def _encode(self, event: dict) -> Dict[str, float | int]:
+        try:
+            ts = float(event.get('timestamp') or 0)
+        except (TypeError, ValueError):
+            ts = 0.0
+        codes = self._interners
+        return {
+            'ts': ts, 'size': float(event.get('size') or 0), 'price': float(event.get('price') or 0),
+            'asset': codes['asset'].code(event.get('asset_id')),
+            'title': codes['title'].code(event.get('title')),
+            'wallet': codes['wallet'].code(event.get('proxyWallet')),
+            'event': codes['event'].code(event.get('event_type')),
+        }
+
+    def _rebuild(self, row: Dict | None = None, at: int = 0) -> None:
+        """Live rows → front of NEW arrays (outstanding views keep the old ones), optionally inserting row at `at`."""
+        cols, n = self._alloc(), self._end - self._start
+        for name, old in self._cols.items():
+            live = old[self._start:self._end]
+            if row is None:
+                cols[name][:n] = live
+            else:
+                cols[name][:at] = live[:at]
+                cols[name][at] = row[name]
+                cols[name][at + 1:n + 1] = live[at:]
+        self._cols, self._start, self._end = cols, 0, n + (row is not None)
+        self._evict_codes()
+        self._reindex()
+
+    def _evict_codes(self) -> None:
+        """Fresh interners with only the codes live rows use; new arrays are recoded in place."""
+        n = self._end
+        for name, interner in list(self._interners.items()):
+            col = self._cols[name][:n]
+            used = np.unique(col)
+            if len(used[used >= 0]) == len(interner.values):
+                continue
+            self._interners[name], remap = interner.retain(used)
+            col[:] = remap[col]  # code -1 → remap's trailing -1
+
+    def _reindex(self) -> None:
+        for field in INDEXED:
+            col = self._cols[field][:self._end]
+            order = np.argsort(col, kind='stable')  # stable → positions stay ascending per code
+            codes = col[order]
+            bounds = np.flatnonzero(np.diff(codes)) + 1
+            self._index[field] = {
+                int(code): array('i', rows.tolist())
+                for code, rows in zip(codes[np.r_[0, bounds]].tolist() if len(codes) else [], np.split(order, bounds))
+                if code >= 0
+            }
+
+    def append(self, event: dict) -> None:
+        with self._lock:
+            if self._end == self._capacity:
+                self._rebuild()  # before encoding — the rebuild may renumber interned codes
+            row = self._encode(event)
+            ts_col = self._cols['ts']
+            if self._end == self._start or row['ts'] >= ts_col[self._end - 1]:
+                end = self._end
+                for name, col in self._cols.items():
+                    col[end] = row[name]
+                for field in INDEXED:
+                    if row[field] >= 0:
+                        self._index[field].setdefault(row[field], array('i')).append(end)
+                self._end = end + 1
+            else:  # late event — rare; rebuild so handed-out views aren't shifted under readers
+                at = int(np.searchsorted(ts_col[self._start:self._end], row['ts'], side='right'))
+                self._rebuild(row, at)
+            if self._end - self._start > self.maxlen:
+                self._start = self._end - self.maxlen  # ✅ Eviction is just moving the head
+
+    def extend(self, events: Iterable[dict]) -> None:
+        for event in events:
+            self.append(event)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    # ── reads ───────────────────────────────────────────────────────────
+
+    def columns(self, cutoff: float = -np.inf) -> Dict[str, np.ndarray]:
+        """Zero-copy column views of rows with ts > cutoff (oldest first); decode() them before the next compaction."""
+        with self._lock:
+            cols, start, end = self._cols, self._start, self._end
+        i = start + int(np.searchsorted(cols['ts'][start:end], cutoff, side='right'))
+        return {name: col[i:end] for name, col in cols.items()}
+
+    def decode(self, field: str, codes: np.ndarray) -> np.ndarray:
+        """Interned codes → strings for the 'asset' / 'title' / 'wallet' / 'event' columns ('' for none)."""
+        return self._interners[field].array()[codes]  # code -1 → the trailing ''
+
+    def _select(self, cutoff: float, field: str | None, key: str | None):
+        """Consistent (columns, interners) for rows past cutoff, narrowed through the index when filtered."""
+        with self._lock:
+            cols, start, end, interners = self._cols, self._start, self._end, dict(self._interners)
+            i = start + int(np.searchsorted(cols['ts'][start:end], cutoff, side='right'))
+            if field is None:
+                return {name: col[i:end] for name, col in cols.items()}, interners
+            code = interners[field].lookup(key)
+            positions = self._index[field].get(code) if code is not None else None
+            if not positions:
+                return None, interners
+            rows = np.array(positions[bisect_left(positions, i):], dtype=np.int64)  # copied under the lock
+        return {name: col[rows] for name, col in cols.items()}, interners
+
+    def since(self, cutoff: float, wallet: str | None = None, asset: str | None = None) -> List[dict]:
+        """Events with timestamp > cutoff as dicts (same shape process_trade builds)."""
+        field, key = ('wallet', wallet) if wallet is not None else ('asset', asset) if asset is not None else (None, None)
+        cols, interners = self._select(cutoff, field, key)
+        if cols is None:
+            return []
+
+        def decode(name: str) -> np.ndarray:
+            return interners[name].array()[cols[name]]
+
+        assets = decode('asset')
+        titles = decode('title')
+        missing = titles == ''
+        if missing.any():  # fill from the resolver — one lookup per asset
+            resolve = self._title_for_asset or (lambda _: '')
+            for code in np.unique(cols['asset'][missing]).tolist():
+                asset_id = interners['asset'].values[code] if code >= 0 else ''
+                title = resolve(asset_id) if asset_id else ''
+                titles[missing & (cols['asset'] == code)] = title or f"Asset {(asset_id or 'N/A')[:12]}..."
+
+        return [
+            {'event_type': kind or 'unknown', 'asset_id': asset_id or 'N/A', 'size': size,
+             'price': price, 'timestamp': ts, 'title': title, 'proxyWallet': who or None}
+            for kind, asset_id, size, price, ts, title, who in zip(
+                decode('event').tolist(), assets.tolist(),
+                cols['size'].tolist(), cols['price'].tolist(), cols['ts'].tolist(),
+                titles.tolist(), decode('wallet').tolist(),
+            )
+        ]
@@ -0,0 +1,153 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List
+
+import pandas as pd
+
+from .config import GAMMA_API
+from .http_client import get_json
+from . import metrics
+from .catalog import market_for_condition, market_for_token, market_for_slug
+
+# Gamma accepts repeated condition_ids — one request resolves a whole batch
+BATCH_SIZE = 50
+MAX_BATCH_WORKERS = 4
+NEGATIVE_TTL = 600          # seconds before an unknown ID is asked for again
+INFLIGHT_WAIT = 15          # seconds a caller waits on someone else's lookup
+
+# ✅ End dates never change once a market exists — cached for the process lifetime
+_end_dates: Dict[str, pd.Timestamp] = {}
+_slug_end_dates: Dict[str, pd.Timestamp] = {}
+_missing: Dict[str, float] = {}
+_inflight: Dict[str, threading.Event] = {}
+_lock = threading.Lock()
+
+
+def _parse_end(market: dict) -> pd.Timestamp | None:
+    end_iso = market.get('endDateIso') or market.get('end_date_iso') or market.get('endDate')
+    if not end_iso:
+        return None
+    try:
+        end_dt = pd.to_datetime(end_iso)
+    except (ValueError, TypeError):
+        return None
+    return end_dt.tz_localize('UTC') if end_dt.tzinfo is None else end_dt
+
+
+def _is_condition_id(value: str) -> bool:
+    # WS rows carry CLOB token IDs (long decimals) in this slot — never send those
+    return value.startswith('0x') and len(value) > 2
+
+
+def _fetch_batch(ids: List[str]) -> None:
+    params = [('condition_ids', cid) for cid in ids] + [('limit', len(ids))]
+    markets = get_json(f"{GAMMA_API}/markets", params=params)
+    failed = not isinstance(markets, list)  # network error ≠ "market unknown"
+    found = {}
+    for market in [] if failed else markets:
+        cid = str(market.get('conditionId') or '').lower()
+        end_dt = _parse_end(market)
+        if cid and end_dt is not None:
+            found[cid] = end_dt
+
+    now = time.time()
+    with _lock:
+        for cid in ids:
+            if cid in found:
+                _end_dates[cid] = found[cid]
+                _missing.pop(cid, None)
+            elif not failed:
+                _missing[cid] = now
+            event = _inflight.pop(cid, None)
+            if event is not None:
+                event.set()
+
+
+def prefetch_end_dates(condition_ids: Iterable[str]) -> Dict[str, pd.Timestamp | None]:
+    """
+    Resolve end dates for every ID at once. Unknown IDs go out in batches of
+    BATCH_SIZE; IDs another thread is already fetching are waited on, not refetched.
+    """
+    wanted = {str(cid).lower() for cid in condition_ids if cid}
+
+    to_fetch: List[str] = []
+    waiting: List[threading.Event] = []
+    now = time.time()
+    with _lock:
+        for cid in wanted:
+            if cid in _end_dates:
+                continue
+            # ✅ Local gamma catalog first — token IDs from WS rows resolve here too
+            rec = market_for_condition(cid) if _is_condition_id(cid) else market_for_token(cid)
+            end_dt = _parse_end(rec) if rec else None
+            if end_dt is not None:
+                _end_dates[cid] = end_dt
+                continue
+            if not _is_condition_id(cid):
+                continue
+            if now - _missing.get(cid, 0) < NEGATIVE_TTL:
+                continue
+            event = _inflight.get(cid)
+            if event is not None:
+                waiting.append(event)
+                continue
+            _inflight[cid] = threading.Event()  # ✅ Claim it — later callers share this lookup
+            to_fetch.append(cid)
+
+    if to_fetch:
+        batches = [to_fetch[i:i + BATCH_SIZE] for i in range(0, len(to_fetch), BATCH_SIZE)]
+        try:
+            if len(batches) == 1:
+                _fetch_batch(batches[0])
+            else:
+                with ThreadPoolExecutor(max_workers=MAX_BATCH_WORKERS) as pool:
+                    list(pool.map(_fetch_batch, batches))
+        finally:
+            # A failed batch must not leave waiters hanging
+            with _lock:
+                for cid in to_fetch:
+                    event = _inflight.pop(cid, None)
+                    if event is not None:
+                        event.set()
+
+    for event in waiting:
+        event.wait(INFLIGHT_WAIT)
+
+    with _lock:
+        return {cid: _end_dates.get(cid) for cid in wanted}
+
+
+def get_end_date(condition_id: str = '', slug: str = '') -> pd.Timestamp | None:
+    """Single-market lookup through the same cache (slug used only without an ID)."""
+    if condition_id:
+        cid = str(condition_id).lower()
+        with _lock:
+            hit = cid in _end_dates
+            end_dt = _end_dates.get(cid)
+        metrics.count_cache('get_end_date', hit)
+        if hit:
+            return end_dt
+        end_dt = prefetch_end_dates([cid]).get(cid)
+        if end_dt is not None or _is_condition_id(cid):
+            return end_dt
+    if not slug:
+        return None
+
+    with _lock:
+        if slug in _slug_end_dates:
+            return _slug_end_dates[slug]
+        rec = market_for_slug(slug)
+        if rec and _parse_end(rec) is not None:
+            _slug_end_dates[slug] = _parse_end(rec)
+            return _slug_end_dates[slug]
+        if time.time() - _missing.get(f"slug:{slug}", 0) < NEGATIVE_TTL:
+            return None
+    markets = get_json(f"{GAMMA_API}/markets", params={'slug': slug}, timeout=5)
+    end_dt = _parse_end(markets[0]) if isinstance(markets, list) and markets else None
+    with _lock:
+        if end_dt is not None:
+            _slug_end_dates[slug] = end_dt
+        else:
+            _missing[f"slug:{slug}"] = time.time()
+    return end_dt
@@ -0,0 +1,208 @@
+import functools
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+from urllib.parse import urlsplit
+
+import streamlit as st
+
+from .config import METRICS_PORT
+from .latency import Histogram, PERCENTILES
+
+
+class _Stat:
+    __slots__ = ('kind', 'calls', 'errors', 'hits', 'misses', 'bytes', 'hist')
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.calls = self.errors = self.hits = self.misses = self.bytes = 0
+        self.hist = Histogram()
+
+
+_stats: Dict[str, _Stat] = {}
+_lock = threading.Lock()
+_tls = threading.local()
+
+
+def _stat(name: str, kind: str) -> _Stat:
+    stat = _stats.get(name)
+    if stat is None:
+        with _lock:
+            stat = _stats.setdefault(name, _Stat(kind))
+    return stat
+
+
+def observe(name: str, kind: str, seconds: float, error: bool = False, nbytes: int = 0,
+            hit: bool | None = None) -> None:
+    stat = _stat(name, kind)
+    stat.hist.record(seconds * 1000)
+    with _lock:
+        stat.calls += 1
+        stat.errors += error
+        stat.bytes += nbytes
+        if hit is not None:
+            stat.hits += hit
+            stat.misses += not hit
+
+
+def add_bytes(name: str, nbytes: int) -> None:
+    """Streamed bodies — size is only known once they've been read."""
+    stat = _stat(name, 'http')
+    with _lock:
+        stat.bytes += nbytes
+
+
+def count_cache(name: str, hit: bool) -> None:
+    """Hit/miss for hand-rolled caches (no call timing)."""
+    stat = _stat(name, 'cache')
+    with _lock:
+        stat.hits += hit
+        stat.misses += not hit
+
+
+def endpoint(url: str) -> str:
+    """`host/first-path-segment` — one series per upstream endpoint, not per query."""
+    parts = urlsplit(url)
+    path = parts.path.strip('/').split('/', 1)[0]
+    return f"{parts.hostname or ''}/{path}"
+
+
+# ── decorators ──────────────────────────────────────────────────────────
+
+def timed(name: str | None = None) -> Callable:
+    """Count + latency for a plain function."""
+    def deco(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            error = False
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                error = True
+                raise
+            finally:
+                observe(label, 'call', time.perf_counter() - start, error=error)
+        return wrapper
+    return deco
+
+
+def cache_data(name: str | None = None, **cache_kwargs) -> Callable:
+    """
+    Drop-in for @st.cache_data(...) that also records calls, latency and
+    hit/miss. A miss is detected by the wrapped body actually running.
+    """
+    def deco(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            misses = getattr(_tls, 'misses', None)
+            if misses is None:
+                misses = _tls.misses = {}
+            misses[label] = misses.get(label, 0) + 1
+            return fn(*args, **kwargs)
+
+        cached = st.cache_data(**cache_kwargs)(body)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            misses = getattr(_tls, 'misses', None) or {}
+            before = misses.get(label, 0)
+            start = time.perf_counter()
+            error = False
+            try:
+                return cached(*args, **kwargs)
+            except Exception:
+                error = True
+                raise
+            finally:
+                after = (getattr(_tls, 'misses', None) or {}).get(label, 0)
+                observe(label, 'cache', time.perf_counter() - start, error=error, hit=after == before)
+
+        wrapper.clear = cached.clear
+        return wrapper
+    return deco
+
+
+# ── read side ───────────────────────────────────────────────────────────
+
+def snapshot() -> List[Dict]:
+    """One row per instrumented name, slowest p99 first — for the diagnostics panel."""
+    with _lock:
+        items = list(_stats.items())
+    rows = []
+    for name, s in items:
+        lookups = s.hits + s.misses
+        rows.append({
+            'name': name, 'kind': s.kind, 'calls': s.calls, 'errors': s.errors,
+            'hit_ratio': s.hits / lookups if lookups else None,
+            **{f"p{int(q * 100)}": s.hist.percentile(q) for q in PERCENTILES},
+            'bytes': s.bytes,
+        })
+    return sorted(rows, key=lambda r: r['p99'], reverse=True)
+
+
+_COUNTERS = (
+    ('tracker_calls_total', 'calls'), ('tracker_errors_total', 'errors'),
+    ('tracker_cache_hits_total', 'hits'), ('tracker_cache_misses_total', 'misses'),
+    ('tracker_payload_bytes_total', 'bytes'),
+)
+
+
+def render_prometheus() -> str:
+    """Prometheus text exposition (v0.0.4) — each family's samples grouped under its TYPE line."""
+    with _lock:
+        items = [(f'name="{name}",kind="{s.kind}"', s) for name, s in sorted(_stats.items())]
+    lines = []
+    for family, attr in _COUNTERS:
+        lines.append(f"# TYPE {family} counter")
+        lines += [f"{family}{{{labels}}} {getattr(s, attr)}" for labels, s in items]
+    lines.append("# TYPE tracker_latency_ms summary")
+    for labels, s in items:
+        lines += [f'tracker_latency_ms{{{labels},quantile="{q}"}} {s.hist.percentile(q):.3f}' for q in PERCENTILES]
+        lines += [f"tracker_latency_ms_sum{{{labels}}} {s.hist.sum_ms:.3f}",
+                  f"tracker_latency_ms_count{{{labels}}} {s.hist.total}"]
+    return "\n".join(lines) + "\n"
+
+
+_server: ThreadingHTTPServer | None = None
+_server_failed = False
+
+
+def start_metrics_server(port: int = METRICS_PORT) -> int | None:
+    """Serve /metrics on localhost once per process (port 0 = off). Returns the bound port."""
+    global _server, _server_failed
+    if not port or _server_failed:
+        return None
+    with _lock:
+        if _server is not None:
+            return _server.server_address[1]
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = render_prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        try:
+            _server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        except OSError as e:  # another app process already serves it
+            _server_failed = True
+            print(f"⚠️ Metrics endpoint not started: {e}")
+            return None
+        threading.Thread(target=_server.serve_forever, name='metrics_http', daemon=True).start()
+        print(f"📈 Metrics at http://127.0.0.1:{port}/metrics")
+        return port
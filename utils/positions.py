@@ -1,45 +1,71 @@
 import streamlit as st
 import pandas as pd
-import requests
 from datetime import datetime
 import time
 
-from .config import EST, TICKERS, FULL_NAMES
-from .status import get_status_hybrid
-
-
-def _is_crypto_position(title: str) -> bool:
-    """Reuse the same ticker/name list from config — single source of truth"""
-    t = title.lower()
-    return any(ticker in t for ticker in TICKERS + FULL_NAMES)
+from .config import EST, DATA_API
+from . import db
+from .filters import is_crypto_title, crypto_filter
+from .stream import stream_json
+from .status import compute_status_frame, status_labels
+from . import metrics
 
 
 def _truncate(title: str, max_len: int = 85) -> str:
     return (title[:max_len] + '...') if len(title) > max_len else title
 
 
-@st.cache_data(ttl=30)
-def get_open_positions(address: str) -> pd.DataFrame:
-    """📈 Trader's OPEN positions → true avgPrice per market/outcome"""
+# Everything the snapshot reads from a /positions item
+POSITION_FIELDS = (
+    'title', 'outcome', 'size', 'avgPrice', 'curPrice', 'cashPnl', 'conditionId', 'slug',
+    'startDate', 'createdAt', 'updatedAt',
+)
+
+_EMPTY_METRICS = {'total_pnl': 0, 'total_size': 0, 'crypto_count': 0, 'all_positions': 0}
+
+
+@metrics.cache_data(ttl=30)
+def get_positions_snapshot(address: str) -> dict:
+    """
+    📸 ONE /positions fetch per refresh cycle. Header metrics, the positions
+    table and the simulator all read from this, so they can't disagree.
+    """
+    snapshot = {'fetched_at': int(time.time()), 'df': pd.DataFrame(), 'metrics': dict(_EMPTY_METRICS)}
     try:
-        url = f"https://data-api.polymarket.com/positions?user={address}&sizeThreshold=0"
-        response = requests.get(url, timeout=10)
-        if response.status_code != 200:
-            return pd.DataFrame()
+        if db.store_ready():
+            # ✅ Collector already polled /positions — no upstream call per viewer
+            _, positions = db.get_latest_position_snapshot(address)
+            seen = len(positions)
+        else:
+            # ✅ Crypto filter + field projection while the body streams in
+            streamed = stream_json(
+                f"{DATA_API}/positions", params={'user': address, 'sizeThreshold': 0},
+                keep=crypto_filter(), fields=POSITION_FIELDS,
+            )
+            if streamed is None:
+                return snapshot
+            positions, seen = streamed
 
-        positions = response.json()
         df_data = []
-        now_ts = int(time.time())
+        status_src = []
+        now_ts = snapshot['fetched_at']
+        total_pnl = 0.0
+        total_size = 0.0
 
         for pos in positions:
             raw_title = str(pos.get('title') or '')
-            if not _is_crypto_position(raw_title):  # ✅ Full ticker list
+            if not is_crypto_title(raw_title):  # ✅ Shared compiled classifier
                 continue
 
             outcome = str(pos.get('outcome', '')).upper()
-            size = abs(float(pos.get('size', 0) or 0))
+            raw_size = float(pos.get('size', 0) or 0)
+            size = abs(raw_size)
             avg_price = float(pos.get('avgPrice') or 0.50)
             cur_price = float(pos.get('curPrice') or avg_price)
+            cash_pnl = float(pos.get('cashPnl') or 0.0)
+
+            total_pnl += cash_pnl
+            total_size += raw_size
 
             updown = "🟢 UP" if "UP" in outcome else "🔴 DOWN"
             updown_price = f"{updown} @ ${avg_price:.2f}"
@@ -61,9 +87,11 @@ def get_open_positions(address: str) -> pd.DataFrame:
 
             age_sec = now_ts - ts
             update_str = datetime.fromtimestamp(ts, EST).strftime('%I:%M:%S %p ET')
-            status_str = get_status_hybrid(pos, now_ts)
-
-            cash_pnl = float(pos.get('cashPnl') or 0.0)
+            status_src.append({
+                'title':       raw_title,
+                'conditionId': str(pos.get('conditionId') or ''),
+                'slug':        str(pos.get('slug') or ''),
+            })
 
             df_data.append({
                 'Market':    _truncate(raw_title),
@@ -73,16 +101,34 @@ def get_open_positions(address: str) -> pd.DataFrame:
                 'CurPrice':  round(cur_price, 4),      # ✅ Numeric
                 'Amount':    round(size * avg_price, 2),
                 'PnL':       round(cash_pnl, 2),       # ✅ Numeric, no "$"
-                'Status':    status_str,
                 'Updated':   update_str,
                 'age_sec':   age_sec,
             })
 
         df = pd.DataFrame(df_data)
         if not df.empty:
+            # ✅ Bulk status pass — expiry stays numeric so it can be sorted/filtered
+            status = compute_status_frame(pd.DataFrame(status_src), now_ts)
+            df.insert(df.columns.get_loc('Updated'), 'Status', status_labels(status).to_numpy())
+            df['expiry_ts'] = status['expiry_ts'].to_numpy()
+            df['active'] = status['active'].to_numpy()
             df = df.sort_values('age_sec').reset_index(drop=True)
-        return df
+
+        snapshot['df'] = df
+        snapshot['metrics'] = {
+            'total_pnl':     total_pnl,
+            'total_size':    total_size,
+            'crypto_count':  len(df_data),
+            'all_positions': seen,
+        }
+        return snapshot
 
     except Exception as e:
         st.error(f"positions fetch error: {e}")
-        return pd.DataFrame()
+        return snapshot
+
+
+@metrics.timed()
+def get_open_positions(address: str) -> pd.DataFrame:
+    """📈 Trader's OPEN positions → true avgPrice per market/outcome"""
+    return get_positions_snapshot(address)['df']
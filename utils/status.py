@@ -1,144 +1,189 @@
 import re
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, Any
-from .data import get_market_enddate
-from .config import EST, MONTHS_MAP
+from .markets import prefetch_end_dates, get_end_date
+from .titles import parse_market_title
+from .config import EST
 
 
-# Compiled once at module load — avoids recompiling per call
-_RANGE_RE = re.compile(r'(\d{1,2}:?\d{2}?[ap]m)\s*-\s*(\d{1,2}:?\d{2}?[ap]m)')
+_EPOCH = pd.Timestamp(0, tz='UTC')
+_HOUR = 3600.0
+_DAY = 86400.0
+ROLLOVER_DAYS = 45  # a title date this close across New Year belongs to the neighbouring year
 
-_DATE_TIME_RE = re.compile(
-    r'(?P<month>\b(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|'
-    r'jul(?:y)?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b)'
-    r'[^\d]*?(?P<day>\d{1,2})(?:st|nd|rd|th|\.|,)?[^\d]*?(?P<time>\d{1,2}(?::?\d{2})?[ap]m)'
-)
 
-# Implicit 1hr: has month + time but day is not required (kept separate for +1hr logic)
-_IMPLICIT_RE = re.compile(
-    r'(?P<month>\b(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|'
-    r'jul(?:y)?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b)'
-    r'[^\d]*?(?P<start_time>\d{1,2}(?::?\d{2})?[ap]m)'
-)
+def _epoch(ts: pd.Series) -> pd.Series:
+    return (ts - _EPOCH) / pd.Timedelta(seconds=1)
 
-_SINGLE_TIME_RE = re.compile(r'(\d{1,2}:?\d{2}?[ap]m)')
-_DURATION_RE = re.compile(r'(\d+)\s*(h|hr|m|min)')
 
+def _midnight_epoch(year: pd.Series, month: pd.Series, day: pd.Series) -> pd.Series:
+    """Local (ET) midnight of each Y/M/D as unix seconds; NaN where the date is invalid."""
+    dates = pd.to_datetime(
+        pd.DataFrame({'year': year, 'month': month, 'day': day}), errors='coerce'
+    )
+    local = dates.dt.tz_localize(EST.zone, ambiguous='NaT', nonexistent='shift_forward')
+    return _epoch(local.dt.tz_convert('UTC'))
 
-def get_status_hybrid(item: Dict[str, Any], now_ts: int) -> str:
-    if isinstance(item, str):
-        item = {'conditionId': item, 'marketId': item}
 
+def _title_expiry(titles: pd.Series, now_ts: int) -> pd.DataFrame:
+    """
+    Expiry per DISTINCT title, in the same precedence the old per-row
+    parser used: range → date+time → month+time → single time → duration → next hour.
+    """
     now_est = datetime.fromtimestamp(now_ts, EST)
-    now_decimal = now_est.hour + now_est.minute / 60.0
-
-    # 1. API enddate — most authoritative source
-    condition_id = str(item.get('conditionId') or item.get('marketId') or '')
-    end_str = get_market_enddate(condition_id, str(item.get('slug') or ''))
-    if end_str:
-        try:
-            end_dt = pd.to_datetime(end_str).tz_convert(EST)
-            if now_est < end_dt:
-                return f"🟢 ACTIVE (til {end_dt.strftime('%b %d %I:%M %p ET')})"
-            return "⚫ EXPIRED"
-        except Exception:
-            pass
-
-    title = str(item.get('title') or item.get('question') or '').lower()
-
-    # 2. Range: "6pm - 7pm"
-    range_match = _RANGE_RE.search(title)
-    if range_match:
-        start_h = parse_time_to_decimal(range_match.group(1))
-        end_h = parse_time_to_decimal(range_match.group(2))
-        if start_h is not None and end_h is not None:
-            if start_h <= now_decimal < end_h:
-                return f"🟢 ACTIVE (til ~{format_display_time(end_h)})"
-            return "⚫ EXPIRED"
-
-    # 3. Date + time: "Mar 12 6pm" — try FULL date match FIRST (has day group)
-    date_match = _DATE_TIME_RE.search(title)
-    if date_match:
-        mon = MONTHS_MAP.get(date_match.group('month').lower())
-        day_str = date_match.group('day')
-        time_str = date_match.group('time')
-    
-        if mon and day_str.isdigit():
-            day = int(day_str)
-            event_hour = parse_time_to_decimal(time_str)
-            if event_hour is not None:
-                year = now_est.year
-                try:
-                    event_dt = now_est.replace(
-                        year=year, month=mon, day=day,
-                        hour=int(event_hour),
-                        minute=int((event_hour % 1) * 60),
-                        second=0, microsecond=0
-                    )
-                    if (now_est - event_dt).days > 1:
-                        event_dt = event_dt.replace(year=year + 1)
-                except ValueError:
-                    pass
-                else:
-                    end_dt = event_dt + timedelta(hours=1)  # ✅ Always assume 1hr window
-    
-                    if now_est < event_dt:
-                        # Before window opens
-                        return f"🟢 ACTIVE (til {event_dt.strftime('%b %d %I:%M %p ET')})"
-                    elif now_est < end_dt:
-                        # Inside the 1-hour window ✅
-                        return f"🟢 ACTIVE (til {end_dt.strftime('%b %d %I:%M %p ET')})"
-                    else:
-                        return "⚫ EXPIRED"
-
-    # 4. Implicit 1hr: "Mar 6pm" (month + time, no day) — fallback after date_match
-    implicit_match = _IMPLICIT_RE.search(title)
-    if implicit_match:
-        start_h = parse_time_to_decimal(implicit_match.group('start_time'))
-        if start_h is not None:
-            end_h = start_h + 1.0
-            if start_h <= now_decimal < end_h:
-                return f"🟢 ACTIVE (til ~{format_display_time(end_h)})"
-            return "⚫ EXPIRED"
-
-    # Step 5. Single time → treat as 1-hour window from that time
-    time_match = _SINGLE_TIME_RE.search(title)
-    if time_match:
-        event_hour = parse_time_to_decimal(time_match.group(1))
-        if event_hour is not None:
-            today_event = now_est.replace(
-                hour=int(event_hour),
-                minute=int((event_hour % 1) * 60),
-                second=0, microsecond=0
-            )
-            end_event = today_event + timedelta(hours=1)  # ✅ 1-hour window
-
-            if now_est < today_event:
-                # Before the window starts
-                return f"🟢 ACTIVE (til {today_event.strftime('%b %d %I:%M %p')})"
-            elif now_est < end_event:
-                # Inside the 1-hour window
-                return f"🟢 ACTIVE (til {end_event.strftime('%b %d %I:%M %p')})"
-            else:
-                # Past the 1-hour window
-                return "⚫ EXPIRED"
-
-    # 6. Duration: "30min", "2hr"
-    dur_match = _DURATION_RE.search(title)
-    if dur_match:
-        val = int(dur_match.group(1))
-        unit = dur_match.group(2).lower()
-        expiry_h = now_decimal + (val if unit.startswith('h') else val / 60.0)
-        if now_decimal < expiry_h:
-            return f"🟢 ACTIVE (til ~{format_display_time(expiry_h)})"
-        return "⚫ EXPIRED"
-
-    # 7. Last resort fallback
-    next_hour = int(now_decimal) + 1
-    disp_h = int(next_hour % 12) or 12
-    ampm = 'PM' if next_hour >= 12 else 'AM'
-    return f"🟢 ACTIVE (til ~{disp_h} {ampm})"
+    today = EST.localize(datetime(now_est.year, now_est.month, now_est.day))
+    today_ts = today.timestamp()
+    n = len(titles)
+
+    expiry = np.full(n, np.nan)
+    shown = np.full(n, np.nan)  # time in the label: the window start until it opens, then expiry
+    active = np.zeros(n, dtype=bool)
+    approx = np.ones(n, dtype=bool)
+    todo = np.ones(n, dtype=bool)
+
+    # ✅ Parsed records (memoized per title for the process) → flat numeric arrays
+    recs = [parse_market_title(t) for t in titles]
+    nan = float('nan')
+    month = pd.Series([r.month for r in recs], index=titles.index, dtype=float)
+    day = pd.Series([r.day for r in recs], index=titles.index, dtype=float)
+    start_h = np.array([nan if r.start_h is None else r.start_h for r in recs])
+    end_h = np.array([nan if r.end_h is None else r.end_h for r in recs])
+    time_h = np.array([nan if r.time_h is None else r.time_h for r in recs])
+    dur_sec = np.array([nan if r.relative_sec is None else r.relative_sec for r in recs])
+    has_month = np.array([r.has_month for r in recs], dtype=bool)
+
+    has_date = (month.notna() & day.notna()).to_numpy()
+    year = pd.Series(now_est.year, index=titles.index)
+    date_midnight = _midnight_epoch(year, month, day).to_numpy()
+    # ✅ Only dates just across New Year change year: "Jan 2" read on Dec 30 is next year's,
+    # "Dec 30" read on Jan 2 last year's. Rebuilt per calendar (DST / leap days), never +365d.
+    next_year = _midnight_epoch(year + 1, month, day).to_numpy()
+    last_year = _midnight_epoch(year - 1, month, day).to_numpy()
+    with np.errstate(invalid='ignore'):
+        date_midnight = np.where(next_year - now_ts <= ROLLOVER_DAYS * _DAY, next_year, date_midnight)
+        date_midnight = np.where(now_ts - last_year <= ROLLOVER_DAYS * _DAY, last_year, date_midnight)
+    has_date = has_date & ~np.isnan(date_midnight)
+
+    # 2. Range: "6pm - 7pm" (anchored to the title's date when it has one)
+    is_range = ~np.isnan(start_h) & ~np.isnan(end_h)
+    base = np.where(has_date, date_midnight, today_ts)
+    start_ts = base + start_h * _HOUR
+    end_ts = base + end_h * _HOUR + np.where(end_h <= start_h, 24 * _HOUR, 0)
+    range_active = np.where(has_date, now_ts < end_ts, (start_ts <= now_ts) & (now_ts < end_ts))
+    sel = todo & is_range
+    expiry[sel], active[sel], approx[sel & has_date] = end_ts[sel], range_active[sel], False
+    todo &= ~sel
+
+    # 3. Date + time: "Mar 12 6pm" → 1hr window from the event
+    has_time = ~np.isnan(time_h)
+    event_start = date_midnight + time_h * _HOUR
+    event_end = event_start + _HOUR
+    sel = todo & has_date & has_time
+    expiry[sel], active[sel], approx[sel] = event_end[sel], now_ts < event_end[sel], False
+    shown[sel] = np.where(now_ts < event_start[sel], event_start[sel], event_end[sel])
+    todo &= ~sel
+
+    # 4. Implicit 1hr: "Mar 6pm" (month + time, no day) — today, inside the hour only
+    today_start = today_ts + time_h * _HOUR
+    sel = todo & has_month & has_time
+    expiry[sel] = today_start[sel] + _HOUR
+    active[sel] = (today_start[sel] <= now_ts) & (now_ts < today_start[sel] + _HOUR)
+    todo &= ~sel
+
+    # 5. Single time → 1-hour window from that time today
+    sel = todo & has_time
+    expiry[sel], active[sel] = today_start[sel] + _HOUR, now_ts < today_start[sel] + _HOUR
+    shown[sel] = np.where(now_ts < today_start[sel], today_start[sel], today_start[sel] + _HOUR)
+    todo &= ~sel
+
+    # 6. Duration: "30min", "2hr" — counted from now, so always still open
+    sel = todo & ~np.isnan(dur_sec)
+    expiry[sel], active[sel] = now_ts + dur_sec[sel], True
+    todo &= ~sel
+
+    # 7. Last resort: top of the next hour
+    next_hour = now_est.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    expiry[todo], active[todo] = next_hour.timestamp(), True
+
+    shown = np.where(np.isnan(shown), expiry, shown)
+    return pd.DataFrame(
+        {'expiry_ts': expiry, 'active': active, 'expiry_approx': approx, 'label_ts': shown},
+        index=titles.index,
+    )
+
+
+def compute_status_frame(df: pd.DataFrame, now_ts: int,
+                         title_col: str = 'title', id_col: str = 'conditionId',
+                         slug_col: str = 'slug') -> pd.DataFrame:
+    """
+    Classify a whole frame in bulk. Returns, aligned to df.index:
+      expiry_ts      unix seconds the market (window) ends
+      active         True while now < expiry (per-source rules above)
+      expiry_approx  True when expiry was inferred from the title, not gamma
+      label_ts       time shown in the label — a titled event's start until it opens, else expiry_ts
+    """
+    if df.empty:
+        return pd.DataFrame(
+            {'expiry_ts': pd.Series(dtype=float), 'active': pd.Series(dtype=bool),
+             'expiry_approx': pd.Series(dtype=bool), 'label_ts': pd.Series(dtype=float)}
+        )
+
+    blank = pd.Series('', index=df.index)
+    ids = (df[id_col] if id_col in df else blank).fillna('').astype(str).str.lower()
+    slugs = (df[slug_col] if slug_col in df else blank).fillna('').astype(str)
+    titles = (df[title_col] if title_col in df else blank).fillna('').astype(str)
+
+    # 1. API end date — most authoritative source, one batched lookup
+    end_dates = prefetch_end_dates(ids.unique())
+    for slug in slugs[(ids == '') & (slugs != '')].unique():
+        end_dates[f"slug:{slug}"] = get_end_date('', slug)
+    keys = ids.where(ids != '', 'slug:' + slugs)
+    api_end = keys.map({k: v.timestamp() for k, v in end_dates.items() if v is not None})
+    api_end = pd.to_numeric(api_end, errors='coerce')
+
+    # 2-7. Title rules — computed once per distinct title, then broadcast
+    uniq = pd.Series(titles.unique())
+    by_title = _title_expiry(uniq, now_ts).set_index(uniq)
+    out = by_title.reindex(titles.to_numpy()).set_index(df.index)
+
+    has_api = api_end.notna()
+    out.loc[has_api, 'expiry_ts'] = api_end[has_api]
+    out.loc[has_api, 'label_ts'] = api_end[has_api]
+    out.loc[has_api, 'active'] = api_end[has_api] > now_ts
+    out.loc[has_api, 'expiry_approx'] = False
+    out['active'] = out['active'].astype(bool)
+    out['expiry_approx'] = out['expiry_approx'].astype(bool)
+    return out
+
+
+def status_labels(status: pd.DataFrame) -> pd.Series:
+    """Display strings derived from compute_status_frame columns."""
+    if status.empty:
+        return pd.Series(dtype=str)
+    # ✅ strftime is the slow part — format each distinct expiry once, then map
+    shown = status['label_ts'] if 'label_ts' in status else status['expiry_ts']
+    uniq = pd.Series(shown.dropna().unique())
+    end_et = pd.to_datetime(uniq, unit='s', utc=True).dt.tz_convert(EST.zone)
+    exact = shown.map(dict(zip(uniq, end_et.dt.strftime('%b %d %I:%M %p ET'))))
+    approx = shown.map(dict(zip(uniq, (end_et.dt.hour + end_et.dt.minute / 60).map(format_display_time))))
+    labels = ("🟢 ACTIVE (til " + exact + ")").where(
+        ~status['expiry_approx'], "🟢 ACTIVE (til ~" + approx + ")"
+    )
+    return labels.where(status['active'], "⚫ EXPIRED")
+
+
+def get_status_hybrid(item: Dict[str, Any], now_ts: int) -> str:
+    """Single-item wrapper over compute_status_frame (kept for ad-hoc callers)."""
+    if isinstance(item, str):
+        item = {'conditionId': item}
+    row = pd.DataFrame([{
+        'title': str(item.get('title') or item.get('question') or ''),
+        'conditionId': str(item.get('conditionId') or item.get('marketId') or ''),
+        'slug': str(item.get('slug') or ''),
+    }])
+    return status_labels(compute_status_frame(row, now_ts)).iloc[0]
 
 
 def parse_time_to_decimal(time_str: str) -> float | None:
@@ -159,7 +204,7 @@ def parse_time_to_decimal(time_str: str) -> float | None:
 
 def format_display_time(decimal_h: float) -> str:
     """16.25 → '4:15 PM'"""
-    hour = int(decimal_h % 12) or 12
-    minute = int((decimal_h % 1) * 60)
-    ampm = 'PM' if decimal_h >= 12 else 'AM'
+    hour24, minute = divmod(int(round(decimal_h * 60)) % (24 * 60), 60)  # ✅ 10.5833 is 10:35, not 10:34
+    hour = hour24 % 12 or 12
+    ampm = 'PM' if hour24 >= 12 else 'AM'
     return f"{hour}:{minute:02d} {ampm}" if minute else f"{hour} {ampm}"
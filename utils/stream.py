@@ -0,0 +1,119 @@
+import codecs
+import json
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Sequence
+
+import requests
+
+from . import capture, metrics
+from .http_client import http_get
+
+CHUNK_SIZE = 64 * 1024
+_SKIP = ' \t\n\r,'
+
+
+class Streamed(NamedTuple):
+    items: List[dict]   # kept (and projected) items, in payload order
+    seen: int           # every item in the payload, kept or not
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array as the bytes arrive.
+    Only the undecoded tail is buffered — never the whole body.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    source = iter(chunks)
+    buf, pos, eof, started = '', 0, False, False
+
+    def more() -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = next(source, None)
+        if chunk is None:
+            eof = True
+            tail = utf8.decode(b'', final=True)
+        else:
+            tail = utf8.decode(chunk)
+        buf, pos = buf[pos:] + tail, 0  # ✅ Drop what's already decoded
+        return True
+
+    while True:
+        while pos < len(buf) and buf[pos] in _SKIP:
+            pos += 1
+        if pos >= len(buf):
+            if not more():
+                if started:
+                    raise ValueError("truncated JSON array")
+                return
+            continue
+        if not started:
+            if buf[pos] != '[':
+                raise ValueError("payload is not a JSON array")
+            started = True
+            pos += 1
+            continue
+        if buf[pos] == ']':
+            return
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if more():
+                continue
+            raise
+        if end == len(buf) and not eof and more():
+            continue  # a number/literal may continue in the next chunk — re-decode with it
+        pos = end
+        yield item
+
+
+def project(item: dict, fields: Sequence[str]) -> dict:
+    """Keep only the keys the app reads — drops icons, descriptions, nested blobs."""
+    return {f: item[f] for f in fields if f in item}
+
+
+def stream_json(url: str, params: Any = None, keep: Callable[[dict], bool] | None = None,
+                fields: Sequence[str] | None = None, limit: int | None = None,
+                timeout: float | None = None) -> Streamed | None:
+    """
+    GET a JSON array and filter/project it while it downloads. Peak memory is
+    one chunk + the kept rows instead of body + full list of dicts.
+    None on network error, non-200 or a malformed body.
+    """
+    resp = http_get(url, params=params, timeout=timeout, stream=True)
+    if resp is None:
+        return None
+    tee: List[bytes] | None = [] if capture.capturing() else None
+    with resp:
+        if resp.status_code != 200:
+            if tee is not None:
+                capture.record_http(url, params, resp.status_code, b'')
+            return None
+        items: List[dict] = []
+        seen = received = 0
+
+        def chunks():
+            nonlocal received
+            for chunk in resp.iter_content(CHUNK_SIZE):
+                received += len(chunk)
+                if tee is not None:
+                    tee.append(chunk)
+                yield chunk
+
+        try:
+            for item in iter_json_array(chunks()):
+                seen += 1
+                if not isinstance(item, dict) or (keep is not None and not keep(item)):
+                    continue
+                items.append(project(item, fields) if fields else item)
+                if limit and len(items) >= limit:
+                    break  # ✅ Rest of the body is never downloaded
+        except (ValueError, requests.RequestException):
+            return None
+        finally:
+            metrics.add_bytes(metrics.endpoint(url), received)
+            if tee is not None:
+                # Only what was downloaded — a replay with the same `limit` stops at the same item
+                capture.record_http(url, params, resp.status_code, b''.join(tee))
+    return Streamed(items, seen)
@@ -0,0 +1,185 @@
+import json
+import threading
+from typing import Callable, Dict, Iterable, List, Set
+
+from .config import TRADER, DATA_API, GAMMA_API, ALLOW_5M_MARKETS, WS_SHARD_SIZE, WS_MAX_SHARDS
+from .catalog import active_token_ids
+from .data import safe_fetch
+from .filters import crypto_filter
+from .stream import stream_json
+
+FALLBACK_ASSETS = 20  # nothing from the trader yet → watch this many active crypto markets
+
+
+class Shard:
+    """One market-channel connection and the assets it carries."""
+
+    def __init__(self, shard_id: int):
+        self.id = shard_id
+        self.assets: Set[str] = set()
+        self.closed = False
+        self._send: Callable[[str], None] | None = None
+        self._close: Callable[[], None] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._send is not None
+
+    def attach(self, send: Callable[[str], None], close: Callable[[], None] | None = None) -> None:
+        """Connection (re)opened — subscribe to everything this shard owns."""
+        with self._lock:
+            self._send, self._close = send, close
+            assets = sorted(self.assets)
+        if assets:
+            send(json.dumps({"type": "market", "assets_ids": assets}))
+            print(f"🚀 Shard {self.id}: subscribed to {len(assets)} assets")
+
+    def detach(self) -> None:
+        with self._lock:
+            self._send = self._close = None
+
+    def shutdown(self) -> None:
+        """No assets left — stop reconnecting and drop the connection."""
+        self.closed = True
+        with self._lock:
+            close = self._close
+        if close is not None:
+            close()
+
+    def _op(self, operation: str, assets: List[str]) -> None:
+        with self._lock:
+            send = self._send
+        if send is None or not assets:
+            return  # not connected — attach() sends the full set on open
+        try:
+            send(json.dumps({"assets_ids": assets, "operation": operation}))
+        except Exception as e:
+            print(f"⚠️ Shard {self.id} {operation} failed: {e}")
+
+    def add(self, assets: Iterable[str]) -> None:
+        assets = [a for a in assets if a not in self.assets]
+        self.assets.update(assets)
+        self._op('subscribe', assets)
+
+    def remove(self, assets: Iterable[str]) -> None:
+        assets = [a for a in assets if a in self.assets]
+        self.assets.difference_update(assets)
+        self._op('unsubscribe', assets)
+
+
+def trader_assets(address: str = TRADER) -> Set[str]:
+    """Asset IDs the trader holds or traded recently (crypto; 5m only if allowed)."""
+    keep = crypto_filter(ALLOW_5M_MARKETS)
+    assets: Set[str] = set()
+    positions = stream_json(f"{DATA_API}/positions", params={'user': address, 'sizeThreshold': 0},
+                            keep=keep, fields=('asset', 'title'))
+    if positions is None:
+        # Unknown ≠ empty — don't let an API blip unsubscribe everything
+        raise ConnectionError("positions unavailable")
+    assets.update(str(p['asset']) for p in positions.items if p.get('asset'))
+    recent = safe_fetch(f"{DATA_API}/trades?user={address}&limit=200",
+                        crypto_only=True, include_5m=ALLOW_5M_MARKETS)
+    assets.update(str(t['asset']) for t in recent if t.get('asset'))
+    return assets
+
+
+def _fallback_assets() -> Set[str]:
+    assets = active_token_ids(FALLBACK_ASSETS)  # ✅ Local catalog before the network
+    if not assets:
+        popular = safe_fetch(f"{GAMMA_API}/markets?active=true&category=crypto&limit={FALLBACK_ASSETS}")
+        assets = [
+            (m.get('tokens') or [{}])[0].get('id') or (m.get('tokens') or [{}])[0].get('token_id')
+            for m in popular if m.get('tokens')
+        ]
+    return {str(a) for a in assets if a}
+
+
+class SubscriptionManager:
+    """
+    Keeps the live WS subscriptions in line with the trader's asset set.
+    reconcile() diffs desired vs subscribed, sends incremental
+    subscribe/unsubscribe ops, and spreads assets across up to `max_shards`
+    connections of `shard_size` each. Whatever doesn't fit is reported as uncovered.
+    """
+
+    def __init__(self, spawn: Callable[[Shard], None], desired: Callable[[], Set[str]] = trader_assets,
+                 shard_size: int = WS_SHARD_SIZE, max_shards: int = WS_MAX_SHARDS):
+        self._spawn = spawn
+        self._desired = desired
+        self.shard_size = shard_size
+        self.max_shards = max_shards
+        self.shards: List[Shard] = []
+        self._next_id = 0  # monotonic — a retired shard's id is never reused
+        self._uncovered: Set[str] = set()
+        self._wanted = 0
+        self._lock = threading.Lock()
+
+    def _new_shard(self) -> Shard:
+        shard = Shard(self._next_id)
+        self._next_id += 1
+        self.shards.append(shard)
+        self._spawn(shard)
+        return shard
+
+    def reconcile(self) -> Dict[str, int]:
+        try:
+            desired = self._desired() or _fallback_assets()
+        except Exception as e:
+            print(f"⚠️ Subscription refresh failed: {e}")
+            return self.coverage()
+
+        with self._lock:
+            self.shards = live = [s for s in self.shards if not s.closed]  # ✅ Retired shards don't pile up
+            for shard in live:
+                stale = shard.assets - desired
+                if stale:
+                    shard.remove(stale)
+            subscribed = set().union(*(s.assets for s in live)) if live else set()
+            missing = sorted(desired - subscribed)
+
+            # ✅ Fill the least-loaded shard first, open a new connection only when all are full
+            added = 0
+            while missing:
+                open_shards = [s for s in self.shards if not s.closed and len(s.assets) < self.shard_size]
+                if open_shards:
+                    shard = min(open_shards, key=lambda s: len(s.assets))
+                elif len([s for s in self.shards if not s.closed]) < self.max_shards:
+                    shard = self._new_shard()
+                else:
+                    break
+                room = self.shard_size - len(shard.assets)
+                batch, missing = missing[:room], missing[room:]
+                shard.add(batch)
+                added += len(batch)
+
+            for shard in self.shards[1:]:
+                if not shard.assets and not shard.closed:
+                    shard.shutdown()
+            self.shards = [s for s in self.shards if not s.closed]
+            self._uncovered = set(missing)
+            self._wanted = len(desired)
+        if added or missing:
+            print(f"📡 Subscriptions: +{added} | {len(missing)} uncovered")
+        return self.coverage()
+
+    def reset(self) -> None:
+        """Drop every shard (engine stopped) — the next reconcile() starts from scratch."""
+        with self._lock:
+            for shard in self.shards:
+                shard.shutdown()
+            self.shards = []
+            self._uncovered = set()
+
+    def coverage(self) -> Dict[str, int]:
+        live = [s for s in self.shards if not s.closed]
+        return {
+            'desired': self._wanted,
+            'subscribed': sum(len(s.assets) for s in live),
+            'uncovered': len(self._uncovered),
+            'shards': len(live),
+            'connected': sum(s.connected for s in live),
+        }
+
+    def uncovered(self) -> List[str]:
+        return sorted(self._uncovered)
@@ -0,0 +1,138 @@
+import re
+from functools import lru_cache
+from typing import Dict, NamedTuple
+
+from .config import TICKERS, FULL_NAMES, MONTHS_MAP
+
+
+def _trie_pattern(words) -> str:
+    """['eth', 'ethereum'] → 'eth(?:ereum)?' — re tries one branch per prefix, not every word."""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: dict) -> str:
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ''
+        body = alts[0] if len(alts) == 1 else '(?:' + '|'.join(alts) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+# ✅ One compiled trie-regex instead of ~30 substring scans per title.
+# Word boundaries so 'eth' no longer matches 'method', 'sol' no longer 'solution'.
+CRYPTO_RE = re.compile(r'\b(' + _trie_pattern(set(TICKERS + FULL_NAMES)) + r')\b')
+
+# Full names → ticker, so "Bitcoin" and "BTC" land on the same asset
+_ASSET_ALIASES = {
+    'bitcoin': 'btc', 'ethereum': 'eth', 'solana': 'sol', 'ripple': 'xrp',
+    'cardano': 'ada', 'dogecoin': 'doge', 'shiba': 'shib', 'chainlink': 'link',
+    'avalanche': 'avax', 'polygon': 'matic', 'polkadot': 'dot', 'uniswap': 'uni',
+    'binance coin': 'bnb',
+}
+
+_TIME = r'(\d{1,2})(?::(\d{2}))?\s*([ap]m)'
+_MONTH = (
+    r'\b(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|'
+    r'jul(?:y)?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b'
+)
+_RANGE_RE = re.compile(_TIME + r'\s*[-–]\s*' + _TIME)
+# Day must not be the hour of a time ("mar 6pm" has no day)
+_DATE_RE = re.compile(_MONTH + r'\.?\s+(\d{1,2})(?:st|nd|rd|th)?\b(?!\s*(?::\d|[ap]m))')
+_MONTH_RE = re.compile(_MONTH)
+_SINGLE_TIME_RE = re.compile(_TIME)
+_DURATION_RE = re.compile(r'(\d+)\s*(h|hr|m|min)')
+
+_UP_WORDS_RE = re.compile(r'above|higher|rise|moon')
+_DOWN_WORDS_RE = re.compile(r'below|lower|drop|crash')
+_PRICE_RE = re.compile(r'\$|usd|price')
+_UP_RE = re.compile(r'\bup\b')
+_DOWN_RE = re.compile(r'\bdown\b')
+
+FIVE_MIN_CUTOFF = 5
+
+
+class MarketTitle(NamedTuple):
+    """Everything the app reads out of a market title, parsed once."""
+    asset: str | None            # canonical ticker ('btc'), None → not crypto
+    month: int | None
+    day: int | None
+    has_month: bool
+    start_h: float | None        # window start, decimal ET hour ("6:15pm" → 18.25)
+    end_h: float | None          # window end
+    time_h: float | None         # first time mentioned (single-time titles)
+    duration_min: int | None     # window length from the range, wrapping midnight
+    is_5m: bool
+    relative_sec: int | None     # "in 30min" style duration, seconds
+    direction: str | None        # 'UP'/'DOWN' from above/below/price words
+    updown_word: str | None      # weaker hint: standalone 'up'/'down'
+
+
+def _decimal_hour(h: str, m: str | None, ampm: str) -> float:
+    hour = int(h) % 12 + (12 if ampm == 'pm' else 0)
+    return hour + (int(m) if m else 0) / 60.0
+
+
+@lru_cache(maxsize=32768)
+def parse_market_title(title: str) -> MarketTitle:
+    """Parse a title into a compact record — memoized, so each title is parsed once."""
+    t = (title or '').lower()
+
+    asset_m = CRYPTO_RE.search(t)
+    asset = _ASSET_ALIASES.get(asset_m.group(1), asset_m.group(1)) if asset_m else None
+
+    month = day = None
+    date_m = _DATE_RE.search(t)
+    if date_m:
+        month = MONTHS_MAP.get(date_m.group(1)[:3])
+        day = int(date_m.group(2))
+
+    start_h = end_h = None
+    duration_min = None
+    range_m = _RANGE_RE.search(t)
+    if range_m:
+        start_h = _decimal_hour(*range_m.group(1, 2, 3))
+        end_h = _decimal_hour(*range_m.group(4, 5, 6))
+        duration_min = round((end_h - start_h) * 60) % (24 * 60)
+
+    time_m = _SINGLE_TIME_RE.search(t)
+    time_h = _decimal_hour(*time_m.groups()) if time_m else None
+
+    relative_sec = None
+    dur_m = _DURATION_RE.search(t)
+    if dur_m:
+        relative_sec = int(dur_m.group(1)) * (3600 if dur_m.group(2).startswith('h') else 60)
+
+    # Title directional words (checked FIRST — more specific), then price operators
+    direction = None
+    if _UP_WORDS_RE.search(t):
+        direction = 'UP'
+    elif _DOWN_WORDS_RE.search(t):
+        direction = 'DOWN'
+    elif _PRICE_RE.search(t):
+        if '>' in t:
+            direction = 'UP'
+        elif '<' in t:
+            direction = 'DOWN'
+
+    updown_word = 'UP' if _UP_RE.search(t) else 'DOWN' if _DOWN_RE.search(t) else None
+
+    return MarketTitle(
+        asset=asset,
+        month=month,
+        day=day,
+        has_month=bool(_MONTH_RE.search(t)),
+        start_h=start_h,
+        end_h=end_h,
+        time_h=time_h,
+        duration_min=duration_min,
+        is_5m=duration_min is not None and duration_min <= FIVE_MIN_CUTOFF,
+        relative_sec=relative_sec,
+        direction=direction,
+        updown_word=updown_word,
+    )
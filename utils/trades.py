@@ -1,16 +1,16 @@
-import streamlit as st
 import pandas as pd
-import requests
 import threading
 import time
 from datetime import datetime
-from typing import Any, List
+from typing import List, Tuple
 
 from .config import EST, TRADER, ALLOW_5M_MARKETS, DISABLE_WS_LIVE
+from .activity import recent_activity
+from . import db
 from .filters import is_crypto, get_up_down, is_5m_market
-from .data import safe_fetch
-from .status import get_status_hybrid
+from .status import compute_status_frame, status_labels
 from .shared import parse_usd
+from . import metrics
 
 try:
     from .websocket import rtds_listener, live_trades, get_recent_live_trades
@@ -32,28 +32,21 @@ def ensure_live_ws():
 
 ensure_live_ws()
 
-def normalize_trade_item(item: Any, now_ts: int) -> str:
-    if isinstance(item, str) or (isinstance(item, dict) and 'asset_id' in item):
-        asset = item if isinstance(item, str) else item.get('asset_id', '')
-        if asset:
-            item = {'conditionId': asset, 'marketId': asset, 'title': str(item.get('title', ''))}
-    return get_status_hybrid(item, now_ts)
-
-@st.cache_data(ttl=30)
+@metrics.cache_data(ttl=10)
 def get_latest_bets(address: str, limit: int = 200) -> List[dict]:
     try:
-        url = f"https://data-api.polymarket.com/activity?user={address}&limit={limit}"
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            activities = response.json()
-            buy_trades = [a for a in activities 
-                         if a.get("type") == "TRADE" and a.get("side") == "BUY"]
-            return buy_trades
-    except:
+        if db.store_ready():
+            # ✅ Read the collector's store — every viewer shares one upstream poll
+            activities = db.get_trades_since(address, 0, limit=limit)
+        else:
+            # ✅ Only items past the high-water mark are fetched; the rest come from the buffer
+            activities = recent_activity(address, limit=limit)
+        return [a for a in activities if a.get("type") == "TRADE" and a.get("side") == "BUY"]
+    except Exception:
         pass
     return []
 
-@st.cache_data(ttl=10)
+@metrics.cache_data(ttl=10)
 def track_0x8dxd(minutes_back: int, include_5m: bool | None = None, _cache_buster: int = 0) -> pd.DataFrame:
     if include_5m is None:
         include_5m = ALLOW_5M_MARKETS
@@ -63,14 +56,7 @@ def track_0x8dxd(minutes_back: int, include_5m: bool | None = None, _cache_buste
 
     # 🔍 DEBUG MODE - REST ONLY (no WS crashes)
     # st.sidebar.info("🔍 DEBUG: REST trades + 5m filter testing")
-
-    try:
-        from .websocket import live_trades, get_recent_live_trades
-        recent_live_trades = get_recent_live_trades(minutes_back)
-        ws_count = len(recent_live_trades)
-        st.sidebar.success(f"🚀 LIVE: {len(live_trades)} total | {ws_count} recent")
-    except:
-        st.sidebar.info("📊 REST trades (WS disabled)")
+    # ✅ No st.sidebar writes in here — it renders inside the trades fragment
 
     # 2. Activity endpoint (REST)
     latest_bets = get_latest_bets(TRADER, limit=500)
@@ -86,7 +72,7 @@ def track_0x8dxd(minutes_back: int, include_5m: bool | None = None, _cache_buste
 
     # 3. WS + REST (SAFE)
     try:
-        from .websocket import get_recent_live_trades, recent_live  # 👈 SAFE IMPORT
+        from .websocket import get_recent_live_trades  # 👈 SAFE IMPORT
         
         # Get recent WS trades
         recent_live_trades = get_recent_live_trades(minutes_back)
@@ -110,6 +96,11 @@ def track_0x8dxd(minutes_back: int, include_5m: bool | None = None, _cache_buste
         key=lambda x: x.get('timestamp', 0) or x.get('updatedAt', 0) or 0,
         reverse=True,
     )
+    return trades_frame(unique_combined, minutes_back, include_5m, now_ts)
+
+
+def trades_frame(items: List[dict], minutes_back: int, include_5m: bool, now_ts: int) -> pd.DataFrame:
+    """Newest-first activity / WS items → the trades table (crypto only, 5m per the toggle)."""
     max_items = max(200, minutes_back * 15)
 
     # 4. Filter: crypto + 5-minute toggle ★ DEBUG ACTIVE ★
@@ -117,7 +108,7 @@ def track_0x8dxd(minutes_back: int, include_5m: bool | None = None, _cache_buste
     five_min_count = 0
     total_crypto_count = 0
 
-    for item in unique_combined:
+    for item in items:
         if not is_crypto(item):
             continue
         total_crypto_count += 1
@@ -125,11 +116,12 @@ def track_0x8dxd(minutes_back: int, include_5m: bool | None = None, _cache_buste
         title_for_filter = str(item.get('title') or item.get('question') or '')
         
         # ULTRA DEBUG
-        if is_5m_market(title_for_filter):
+        is_5m = is_5m_market(title_for_filter)  # ✅ One parsed-record lookup per item
+        if is_5m:
             five_min_count += 1
             print(f"🚫 5M DETECTED #{five_min_count}: '{title_for_filter[:60]}...' | include_5m={include_5m}")
         
-        if not include_5m and is_5m_market(title_for_filter):
+        if not include_5m and is_5m:
             print(f"DEBUG: FILTERED OUT: {title_for_filter}")
             continue
 
@@ -145,6 +137,13 @@ def track_0x8dxd(minutes_back: int, include_5m: bool | None = None, _cache_buste
     if not filtered_data:
         return pd.DataFrame()
 
+    # ✅ Status for the whole batch at once — one gamma lookup, one parse per title
+    status = compute_status_frame(pd.DataFrame([{
+        'title':       str(item.get('title') or item.get('question') or ''),
+        'conditionId': str(item.get('conditionId') or item.get('asset_id') or ''),
+        'slug':        str(item.get('slug') or ''),
+    } for item in filtered_data]), now_ts)
+
     # 5. Build DataFrame
     df_data = []
     for item in filtered_data:
@@ -178,7 +177,6 @@ def track_0x8dxd(minutes_back: int, include_5m: bool | None = None, _cache_buste
             ts = now_ts
         update_str = datetime.fromtimestamp(ts, EST).strftime('%I:%M:%S %p ET')
 
-        status_str = normalize_trade_item(item, now_ts)
         age_sec = now_ts - ts
 
         df_data.append({
@@ -187,15 +185,18 @@ def track_0x8dxd(minutes_back: int, include_5m: bool | None = None, _cache_buste
             'Shares': round(size_val, 1),
             'Price': price_val,
             'Amount': f"${amount:.2f}",
-            'Status': status_str,
             'Updated': update_str,
             'age_sec': age_sec,
             'price_num': price_num,
+            'tx': str(item.get('transactionHash') or '').lower(),
         })
 
     df = pd.DataFrame(df_data)
     if df.empty:
         return df
+    df.insert(df.columns.get_loc('Updated'), 'Status', status_labels(status).to_numpy())
+    df['expiry_ts'] = status['expiry_ts'].to_numpy()
+    df['active'] = status['active'].to_numpy()
 
     # 🔍 FINAL DEBUG OUTPUT
     print(f"🔍 FINAL STATS: {len(filtered_data)} trades | {five_min_count} 5m detected | {total_crypto_count} total crypto | include_5m={include_5m}")
@@ -206,3 +207,38 @@ def track_0x8dxd(minutes_back: int, include_5m: bool | None = None, _cache_buste
 
     df = df.sort_values('age_sec')
     return df
+
+
+def merge_pushed_trades(df: pd.DataFrame, events: List[dict], minutes_back: int,
+                        include_5m: bool | None = None) -> Tuple[pd.DataFrame, List[dict]]:
+    """
+    Bus-pushed fills the cached table doesn't have yet → rows merged into it,
+    so a push shows up without clearing (and refetching) the shared caches.
+    Also returns the events still pending — the rest are in `df` now or aged out.
+    """
+    if include_5m is None:
+        include_5m = ALLOW_5M_MARKETS
+    now_ts = int(time.time())
+    ago_ts = now_ts - minutes_back * 60
+    have = set(df['tx']) if 'tx' in df else set()
+    pending, seen = [], set()
+    for event in events:
+        tx = str(event.get('transactionHash') or '').lower()
+        try:
+            ts = int(float(event.get('timestamp')))
+        except (TypeError, ValueError):
+            continue
+        if tx in have or tx in seen or ts < ago_ts:
+            continue
+        if event.get('type', 'TRADE') == 'TRADE' and event.get('side', 'BUY') == 'BUY':
+            seen.add(tx)
+            pending.append(event)
+    if not pending:
+        return df, []
+
+    fresh = sorted((dict(e) for e in pending), key=lambda e: -int(float(e['timestamp'])))
+    extra = trades_frame(fresh, minutes_back, include_5m, now_ts)
+    if extra.empty:
+        return df, pending
+    merged = extra if df.empty else pd.concat([df, extra], ignore_index=True)
+    return merged.sort_values('age_sec', ignore_index=True), pending
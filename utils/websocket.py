@@ -1,107 +1,224 @@
 import websocket
 import threading
+import queue
 import time
-import json
 from typing import List, Dict
-from collections import deque
-from .data import safe_fetch
-from .config import TRADER
+from .config import (
+    TRADER, GAMMA_API, LIVE_BUFFER_SIZE, WS_BASE_URL, WS_ENGINE, WS_PING_INTERVAL, WS_RESYNC_SEC,
+)
+from .catalog import ensure_catalog_sync, title_for_token
+from .http_client import get_json
+from .live_buffer import LiveBuffer
+from .ws_decode import FrameDecoder
+from .events import bus, trade_event, TOPIC_LIVE
+from . import latency
+from .subscriptions import Shard, SubscriptionManager
+from . import ws_engine
+from . import capture
 
-live_trades: deque = deque(maxlen=5000)
-_live_lock = threading.Lock()  # ✅ Thread-safe reads
+RESOLVER_WORKERS = 4
+RESOLVER_QUEUE_SIZE = 256
+TITLE_NEGATIVE_TTL = 600    # seconds before an unknown asset is asked for again
 
 
-def rtds_listener():
-    """Bulletproof WS listener with non-blocking title resolution"""
-    reconnect_delay = 1
-    ping_interval = 10
-    ws_base_url = "wss://ws-subscriptions-clob.polymarket.com"
+class TitleResolver:
+    """
+    Fixed pool resolving asset_id → market title off the WS thread.
+    Trades waiting on the same asset share one lookup; a full queue drops
+    the lookup (the trade keeps its placeholder title) instead of spawning threads.
+    """
 
-    # ✅ Title cache avoids repeated HTTP lookups per asset
-    _title_cache: Dict[str, str] = {}
+    def __init__(self, workers: int = RESOLVER_WORKERS, queue_size: int = RESOLVER_QUEUE_SIZE,
+                 negative_ttl: float = TITLE_NEGATIVE_TTL):
+        self.workers = workers
+        self.negative_ttl = negative_ttl
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._titles: Dict[str, str] = {}
+        self._missing: Dict[str, float] = {}
+        self._waiting: Dict[str, List[dict]] = {}   # asset → trades to patch when it resolves
+        self._lock = threading.Lock()
+        self._started = False
+        self._stats = {
+            'submitted': 0, 'coalesced': 0, 'negative_hits': 0, 'dropped': 0,
+            'resolved': 0, 'missing': 0, 'errors': 0,
+            'latency_ms_total': 0.0, 'latency_ms_max': 0.0,
+        }
 
-    def resolve_title_async(asset_id: str, trade_data: dict):
-        """Fetch title in background thread so WS message loop never blocks"""
-        def _fetch():
-            if asset_id in _title_cache:
-                trade_data['title'] = _title_cache[asset_id]
+    def _start(self) -> None:
+        with self._lock:
+            if self._started:
                 return
-            market_info = safe_fetch(
-                f"https://gamma-api.polymarket.com/markets?tokenIds={asset_id}"
-            )
-            if market_info:
-                title = market_info[0].get('question', '')
-                _title_cache[asset_id] = title
-                trade_data['title'] = title or trade_data['title']
-        threading.Thread(target=_fetch, daemon=True).start()
+            self._started = True
+        for i in range(self.workers):
+            threading.Thread(target=self._work, name=f'title_resolver_{i}', daemon=True).start()
 
-    def process_trade(raw_data):
-        try:
-            if isinstance(raw_data, str) and raw_data.strip() == "ping":
+    def cached(self, asset_id: str) -> str:
+        return self._titles.get(asset_id, '')
+
+    def submit(self, asset_id: str, trade_data: dict | None = None) -> None:
+        """Resolve asset_id in the background (patching trade_data['title'] if given). Never blocks."""
+        self._start()
+        with self._lock:
+            title = self._titles.get(asset_id)
+            if title:
+                if trade_data is not None:
+                    trade_data['title'] = title
                 return
-            data = json.loads(raw_data) if isinstance(raw_data, str) else raw_data
-            if not isinstance(data, dict):
+            missed = self._missing.get(asset_id)
+            if missed and time.time() - missed < self.negative_ttl:
+                self._stats['negative_hits'] += 1
                 return
-            event_type = data.get('event_type', 'unknown')
-            if event_type not in ('trade', 'last_trade_price'):
+            waiters = self._waiting.get(asset_id)
+            if waiters is not None:  # ✅ Single-flight — ride the lookup already queued
+                if trade_data is not None:
+                    waiters.append(trade_data)
+                self._stats['coalesced'] += 1
                 return
+            self._waiting[asset_id] = [trade_data] if trade_data is not None else []
+            self._stats['submitted'] += 1
+        try:
+            self._queue.put_nowait((asset_id, time.monotonic()))
+        except queue.Full:
+            with self._lock:
+                self._waiting.pop(asset_id, None)
+                self._stats['dropped'] += 1
 
-            size = float(data.get('size') or data.get('amount') or 0)
-            price = float(data.get('price') or 0)
-            asset_id = str(
-                data.get('asset_id') or data.get('asset') or data.get('assetId') or 'N/A'
-            )
-            title = data.get('question') or _title_cache.get(asset_id, '')
+    def _lookup(self, asset_id: str) -> str | None:
+        """Title, '' if Gamma doesn't know the asset, None on a network error."""
+        title = title_for_token(asset_id)  # ✅ Catalog may have caught up since the trade arrived
+        if title:
+            return title
+        markets = get_json(f"{GAMMA_API}/markets", params={'tokenIds': asset_id})
+        if not isinstance(markets, list):
+            return None
+        return str(markets[0].get('question') or '') if markets else ''
+
+    def _work(self) -> None:
+        while True:
+            asset_id, queued_at = self._queue.get()
+            try:
+                title = self._lookup(asset_id)
+            except Exception as e:
+                print(f"⚠️ title resolve error: {e}")
+                title = None
+            latency_ms = (time.monotonic() - queued_at) * 1000
+            with self._lock:
+                waiters = self._waiting.pop(asset_id, [])
+                if title:
+                    self._titles[asset_id] = title
+                    self._missing.pop(asset_id, None)
+                    for trade_data in waiters:
+                        trade_data['title'] = title
+                    self._stats['resolved'] += 1
+                elif title == '':
+                    self._missing[asset_id] = time.time()
+                    self._stats['missing'] += 1
+                else:
+                    self._stats['errors'] += 1  # not negative-cached — next trade retries
+                self._stats['latency_ms_total'] += latency_ms
+                self._stats['latency_ms_max'] = max(self._stats['latency_ms_max'], latency_ms)
+            self._queue.task_done()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            out = dict(self._stats)
+            out['in_flight'] = len(self._waiting)
+            out['cached'] = len(self._titles)
+            out['negative_cached'] = len(self._missing)
+        done = out['resolved'] + out['missing'] + out['errors']
+        out['queue_depth'] = self._queue.qsize()
+        out['latency_ms_avg'] = out['latency_ms_total'] / done if done else 0.0
+        return out
+
+
+_resolver = TitleResolver()
+_decoder = FrameDecoder()
 
-            trade_data = {
-                'event_type': event_type,
-                'asset_id': asset_id,
-                'size': size,
-                'price': price,
-                'timestamp': time.time(),
-                'title': title or f"Asset {asset_id[:12]}...",
-                'proxyWallet': TRADER,
-            }
+# ✅ Columnar, time-ordered — window reads bisect; titles fill in from the resolver at read time
+live_trades = LiveBuffer(
+    maxlen=LIVE_BUFFER_SIZE,
+    title_for_asset=lambda asset_id: _resolver.cached(asset_id) or title_for_token(asset_id),
+)
 
-            # ✅ Resolve title without blocking message loop
-            if not title and asset_id != 'N/A':
-                resolve_title_async(asset_id, trade_data)
 
-            with _live_lock:
-                live_trades.append(trade_data)
+def resolver_stats() -> Dict[str, float]:
+    """Queue depth, dropped/coalesced lookups and resolution latency for the sidebar."""
+    return _resolver.stats()
 
+
+def decode_stats() -> Dict[str, float]:
+    """Frames/s, decode µs/frame and how many frames the prefilter skipped unparsed."""
+    return _decoder.stats()
+
+
+def process_trade(raw_data):
+    capture.record_ws(raw_data)  # no-op unless CAPTURE_DIR is set
+    try:
+        events = _decoder.decode(raw_data)  # ✅ Irrelevant frames never reach a JSON parse
+    except Exception as e:
+        print(f"⚠️ process_trade error: {e} | input: {str(raw_data)[:50]}")
+        return
+    for data in events:
+        try:
+            _record_trade(data)
         except Exception as e:
-            print(f"⚠️ process_trade error: {e} | input: {str(raw_data)[:50]}")
+            print(f"⚠️ process_trade error: {e} | input: {str(data)[:50]}")
+
+
+def _is_tracked(data: dict) -> bool:
+    """True when the frame names the tracked wallet as a party (market-channel prints usually name none)."""
+    tracked = TRADER.lower()
+    return any(str(data.get(key) or '').lower() == tracked
+               for key in ('proxyWallet', 'maker_address', 'taker_address', 'owner', 'trade_owner'))
+
+
+def _record_trade(data: dict):
+    event_type = data.get('event_type', 'unknown')
+    size = float(data.get('size') or data.get('amount') or 0)
+    price = float(data.get('price') or 0)
+    asset_id = str(
+        data.get('asset_id') or data.get('asset') or data.get('assetId') or 'N/A'
+    )
+    title = (
+        data.get('question')
+        or _resolver.cached(asset_id)
+        or title_for_token(asset_id)  # ✅ In-process catalog hit, no HTTP
+    )
+
+    now = time.time()
+    if _is_tracked(data):  # ✅ Market-wide prints aren't the trader's fills — keep them out of fill latency
+        latency.record('ws', 'received', latency.fill_time(data.get('timestamp')), now)
+
+    trade_data = {
+        'event_type': event_type,
+        'asset_id': asset_id,
+        'size': size,
+        'price': price,
+        'timestamp': now,
+        'title': title,           # '' → buffer reads the resolved title later
+        'proxyWallet': TRADER,
+    }
+
+    # ✅ Resolve title on the bounded pool without blocking the message loop
+    if not title and asset_id != 'N/A':
+        _resolver.submit(asset_id)
+
+    live_trades.append(trade_data)
+    if bus.subscribed(TOPIC_LIVE):
+        bus.publish(TOPIC_LIVE, trade_event(trade_data, 'ws'))
+
+
+def _shard_loop(shard: Shard):
+    """One market-channel connection; reconnects until the manager retires the shard."""
+    reconnect_delay = 1
 
     def on_message(ws, msg):
         process_trade(msg)
 
     def on_open(ws):
-        def send_subscribe():
-            recent_trades = safe_fetch(
-                f"https://data-api.polymarket.com/trades?user={TRADER}&limit=200"
-            )
-            assets = list({
-                item.get('asset') for item in recent_trades if item.get('asset')
-            })[:20]
-
-            if not assets:
-                popular = safe_fetch(
-                    "https://gamma-api.polymarket.com/markets?active=true&category=crypto&limit=20"
-                )
-                assets = [
-                    (m.get('tokens') or [{}])[0].get('id') or
-                    (m.get('tokens') or [{}])[0].get('token_id')
-                    for m in (popular or [])
-                    if m.get('tokens')
-                ][:20]
-                assets = [a for a in assets if a]  # drop None
-
-            if assets:
-                ws.send(json.dumps({"type": "market", "assets_ids": assets}))
-                print(f"🚀 Subscribed to {len(assets)} assets")
-
-        send_subscribe()
+        nonlocal reconnect_delay
+        reconnect_delay = 1
+        shard.attach(ws.send, ws.close)
 
         def ping_loop():
             while ws.sock and ws.sock.connected:
@@ -109,23 +226,24 @@ def rtds_listener():
                     ws.send("ping")
                 except Exception:
                     break
-                time.sleep(ping_interval)
+                time.sleep(WS_PING_INTERVAL)
 
         threading.Thread(target=ping_loop, daemon=True).start()
 
     def on_error(ws, error):
         nonlocal reconnect_delay
-        print(f"❌ WS error: {error} (retry in {reconnect_delay}s)")
+        print(f"❌ WS[{shard.id}] error: {error} (retry in {reconnect_delay}s)")
         time.sleep(reconnect_delay)
         reconnect_delay = min(reconnect_delay * 2, 60)
 
     def on_close(ws, code, reason):
-        print(f"🔌 WS closed: {code} - {reason}")
+        shard.detach()
+        print(f"🔌 WS[{shard.id}] closed: {code} - {reason}")
 
-    while True:
+    while not shard.closed:
         try:
             ws = websocket.WebSocketApp(
-                f"{ws_base_url}/ws/market",
+                f"{WS_BASE_URL}/ws/market",
                 on_message=on_message,
                 on_open=on_open,
                 on_error=on_error,
@@ -139,25 +257,63 @@ def rtds_listener():
             time.sleep(reconnect_delay)
 
 
+def _spawn_shard(shard: Shard) -> None:
+    engine = ws_engine.current()
+    if engine is not None and engine.running:
+        engine.spawn(shard)  # ✅ A task on the shared loop, not a thread
+        return
+    threading.Thread(target=_shard_loop, args=(shard,), name=f'rtds_shard_{shard.id}', daemon=True).start()
+
+
+subscriptions = SubscriptionManager(spawn=_spawn_shard)
+_replay_stop = threading.Event()
+
+
+def subscription_coverage() -> Dict[str, int]:
+    """Desired vs subscribed assets, uncovered count and open connections for the sidebar."""
+    return subscriptions.coverage()
+
+
+def rtds_listener():
+    """Bulletproof WS listener — keeps sharded subscriptions following the trader's assets"""
+    ensure_catalog_sync()
+    replay = capture.current_replay()
+    if replay is not None:
+        # ✅ Captured frames through the same decode/record path, on the capture's timeline
+        _replay_stop.clear()
+        sent = replay.play_ws(process_trade, _replay_stop)
+        print(f"⏹️ WS replay finished — {sent} frames")
+        _replay_stop.wait()  # stay "alive" so the pages don't restart the replay
+        return
+    if WS_ENGINE == 'asyncio' and ws_engine.available():
+        # ✅ All shards, heartbeats and backoff on one event loop in this thread
+        ws_engine.run_engine(
+            f"{WS_BASE_URL}/ws/market", process_trade, subscriptions,
+            ping_interval=WS_PING_INTERVAL, resync_sec=WS_RESYNC_SEC,
+        )
+        return
+    while True:
+        subscriptions.reconcile()  # ✅ Diff desired vs subscribed; incremental (un)subscribe
+        time.sleep(WS_RESYNC_SEC)
+
+
+def stop_live_ws() -> None:
+    """Cancel the asyncio engine's connections (the thread fallback stops at process exit)."""
+    _replay_stop.set()
+    ws_engine.stop_engine()
+
+
 def get_recent_live_trades(minutes: int = 30) -> List[Dict]:
-    cutoff = time.time() - minutes * 60
-    with _live_lock:  # ✅ Thread-safe snapshot
-        return [t for t in live_trades if t.get('timestamp', 0) > cutoff]
+    return live_trades.since(time.time() - minutes * 60)
 
 
 def get_live_trades_count() -> int:
-    with _live_lock:
-        return len(live_trades)
+    return len(live_trades)
 
 
 def get_recent_trader_trades(seconds: int = 300) -> list:
     """Legacy compatibility for simulator.py"""
-    cutoff = time.time() - seconds
-    with _live_lock:
-        return [
-            t for t in live_trades
-            if t.get('proxyWallet') == TRADER and t.get('timestamp', 0) > cutoff
-        ]
+    return live_trades.since(time.time() - seconds, wallet=TRADER)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,77 @@
+import json
+import threading
+import time
+from typing import Dict, List
+
+try:  # ✅ Optional — ~3x faster parse; stdlib json otherwise
+    import orjson
+    _loads = orjson.loads
+    BACKEND = 'orjson'
+except ImportError:
+    _loads = json.loads
+    BACKEND = 'json'
+
+WANTED_EVENTS = ('trade', 'last_trade_price')
+# Quoted, so "trade" doesn't match inside other values; a frame with neither is never parsed
+_MARKERS = tuple(f'"{e}"' for e in WANTED_EVENTS)
+_MARKERS_B = tuple(m.encode() for m in _MARKERS)
+
+
+class FrameDecoder:
+    """
+    WS frame → list of trade events. Book / price_change frames (the bulk of a
+    busy feed) are dropped by a substring check before any JSON parse; list
+    frames are unpacked and filtered per item.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {'frames': 0, 'events': 0, 'skipped': 0, 'parsed': 0, 'errors': 0, 'decode_ns': 0}
+        self._mark = (time.monotonic(), 0)
+        self._rate = 0.0
+
+    def decode(self, raw) -> List[dict]:
+        start = time.perf_counter_ns()
+        out: List[dict] = []
+        parsed = skipped = errors = 0
+        if isinstance(raw, (dict, list)):
+            data = raw
+        else:
+            markers = _MARKERS_B if isinstance(raw, (bytes, bytearray)) else _MARKERS
+            if not any(m in raw for m in markers):  # PONG, book, price_change, tick_size_change…
+                data, skipped = None, 1
+            else:
+                try:
+                    data, parsed = _loads(raw), 1
+                except ValueError:
+                    data, errors = None, 1
+        if isinstance(data, dict):
+            data = (data,)
+        if data:
+            out = [e for e in data if isinstance(e, dict) and e.get('event_type') in WANTED_EVENTS]
+
+        elapsed = time.perf_counter_ns() - start
+        with self._lock:
+            s = self._stats
+            s['frames'] += 1
+            s['events'] += len(out)
+            s['skipped'] += skipped
+            s['parsed'] += parsed
+            s['errors'] += errors
+            s['decode_ns'] += elapsed
+        return out
+
+    def stats(self) -> Dict[str, float]:
+        """Frames/s since the last ≥1 s sample, mean decode cost and the skip ratio."""
+        with self._lock:
+            out = dict(self._stats)
+        now = time.monotonic()
+        since, frames = self._mark
+        if now - since >= 1:
+            self._rate = (out['frames'] - frames) / (now - since)
+            self._mark = (now, out['frames'])
+        out['frames_per_sec'] = self._rate
+        out['decode_us_avg'] = out['decode_ns'] / out['frames'] / 1000 if out['frames'] else 0.0
+        out['skip_ratio'] = out['skipped'] / out['frames'] if out['frames'] else 0.0
+        out['backend'] = BACKEND
+        return out
@@ -0,0 +1,176 @@
+import asyncio
+import random
+import threading
+from typing import Callable, Dict, Set
+
+try:  # ✅ Optional — rtds_listener falls back to thread-per-shard websocket-client
+    from websockets.asyncio.client import connect as ws_connect
+except ImportError:
+    try:
+        from websockets import connect as ws_connect
+    except ImportError:
+        ws_connect = None
+
+from .subscriptions import Shard, SubscriptionManager
+
+
+def available() -> bool:
+    return ws_connect is not None
+
+
+class AsyncWSEngine:
+    """
+    Every market connection, heartbeat, reconnect backoff and the subscription
+    resync on ONE asyncio loop in one thread. Backoff is an await, never a
+    blocking sleep; stop() cancels everything and closes the sockets.
+    """
+
+    def __init__(self, url: str, on_message: Callable[[str], None], manager: SubscriptionManager,
+                 ping_interval: float = 10, resync_sec: float = 30, max_backoff: float = 60):
+        self.url = url
+        self.on_message = on_message
+        self.manager = manager
+        self.ping_interval = ping_interval
+        self.resync_sec = resync_sec
+        self.max_backoff = max_backoff
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopping: asyncio.Event | None = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._active = False
+        self._stats = {'messages': 0, 'connects': 0, 'reconnects': 0, 'errors': 0}
+
+    # ── lifecycle ───────────────────────────────────────────────────────
+
+    def run(self) -> None:
+        """Blocks the calling thread until stop()."""
+        self._active = True
+        try:
+            asyncio.run(self._main())
+        finally:
+            self._active = False
+
+    def stop(self) -> None:
+        loop, stopping = self._loop, self._stopping
+        if loop is not None and stopping is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(stopping.set)
+
+    @property
+    def running(self) -> bool:
+        return self._active
+
+    def spawn(self, shard: Shard) -> None:
+        """SubscriptionManager hook — safe to call from any thread."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._start, self._shard(shard), f"shard_{shard.id}")
+
+    def _start(self, coro, name: str) -> None:
+        task = asyncio.get_running_loop().create_task(coro, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _main(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        self._start(self._resync(), 'resync')
+        try:
+            await self._stopping.wait()
+        finally:
+            tasks = list(self._tasks)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)  # ✅ Sockets closed by their context managers
+            self.manager.reset()  # ✅ A restarted engine re-subscribes from scratch
+            self._loop = None
+            print("🛑 WS engine stopped")
+
+    # ── tasks ───────────────────────────────────────────────────────────
+
+    async def _resync(self) -> None:
+        while True:
+            # reconcile() does blocking HTTP — keep it off the loop
+            await asyncio.to_thread(self.manager.reconcile)
+            await asyncio.sleep(self.resync_sec)
+
+    async def _heartbeat(self, ws) -> None:
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await ws.send("ping")
+
+    def _heartbeat_done(self, task: asyncio.Task, ws, shard_id: int) -> None:
+        """A failed ping means a dead socket — drop it so the shard's read loop ends and reconnects."""
+        if task.cancelled() or task.exception() is None:
+            return
+        self._stats['errors'] += 1
+        print(f"❌ WS[{shard_id}] heartbeat failed: {task.exception()} — reconnecting")
+        ws.transport.abort()
+
+    async def _shard(self, shard: Shard) -> None:
+        loop = asyncio.get_running_loop()
+        backoff = 1.0
+        first = True
+        while not shard.closed:
+            if not first:
+                self._stats['reconnects'] += 1
+            first = False
+            try:
+                async with ws_connect(self.url, ping_interval=None, open_timeout=10, max_size=2 ** 22) as ws:
+                    self._stats['connects'] += 1
+                    backoff = 1.0
+                    shard.attach(
+                        lambda msg: asyncio.run_coroutine_threadsafe(ws.send(msg), loop),
+                        lambda: asyncio.run_coroutine_threadsafe(ws.close(), loop),
+                    )
+                    heartbeat = asyncio.create_task(self._heartbeat(ws))
+                    heartbeat.add_done_callback(lambda task, ws=ws, sid=shard.id: self._heartbeat_done(task, ws, sid))
+                    try:
+                        async for msg in ws:
+                            self._stats['messages'] += 1
+                            self.on_message(msg)
+                    except asyncio.CancelledError:
+                        # Engine stopping — a close handshake can stall behind unread frames under load
+                        ws.transport.abort()
+                        raise
+                    finally:
+                        heartbeat.cancel()
+                        shard.detach()
+                print(f"🔌 WS[{shard.id}] closed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats['errors'] += 1
+                print(f"❌ WS[{shard.id}] error: {e} (retry in {backoff:.0f}s)")
+            if shard.closed:
+                break
+            await asyncio.sleep(backoff * random.uniform(0.5, 1.0))  # ✅ Jittered, non-blocking
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def stats(self) -> Dict[str, int]:
+        out = dict(self._stats)
+        out['tasks'] = len(self._tasks)
+        return out
+
+
+_engine: AsyncWSEngine | None = None
+_engine_lock = threading.Lock()
+
+
+def current() -> AsyncWSEngine | None:
+    return _engine
+
+
+def run_engine(url: str, on_message: Callable[[str], None], manager: SubscriptionManager,
+               **kwargs) -> None:
+    """Build the process-wide engine and run it on this thread (blocks until stop_engine())."""
+    global _engine
+    with _engine_lock:
+        if _engine is not None and _engine.running:
+            return
+        _engine = engine = AsyncWSEngine(url, on_message, manager, **kwargs)
+        engine._active = True  # claimed before the loop starts — no second engine
+    engine.run()
+
+
+def stop_engine() -> None:
+    engine = _engine
+    if engine is not None:
+        engine.stop()